@@ -26,5 +26,11 @@ else:
 echo "Migrating legacy resource URLs to CourseResource objects..."
 python manage.py migrate_legacy_resources
 
+echo "Rebuilding the materialized course tree..."
+python manage.py rebuild_course_tree
+
+echo "Rebuilding the site search index..."
+python manage.py rebuild_search_index
+
 echo "Build complete!"
 
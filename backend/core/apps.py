@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from . import fulltext, renditions
+
+        renditions.connect()
+        # Typo tolerance for full-text search (core/fulltext.py), on every new session.
+        connection_created.connect(fulltext.configure_connection, dispatch_uid='fulltext-typo-threshold')
@@ -0,0 +1,129 @@
+"""
+Conditional GET support for read-only public API views.
+
+ConditionalGetMixin derives a cheap validator for a list endpoint — the newest
+modification timestamp plus row counts, fetched in a single aggregate query —
+and answers If-None-Match / If-Modified-Since with 304 Not Modified before the
+queryset is evaluated or serialized. Full responses carry ETag, Last-Modified
+and Cache-Control headers so browsers and a CDN can revalidate cheaply.
+
+Usage:
+    class StaffMemberListView(ConditionalGetMixin, generics.ListAPIView):
+        validator_timestamp_fields = ('updated_at',)
+
+Views whose freshness is tracked elsewhere (e.g. a cache version) can override
+get_validator() and skip the database entirely.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class NotModified(Exception):
+    """Raised from initial() to short-circuit the handler with a 304."""
+
+
+class ConditionalGetMixin:
+    # Timestamp fields (may span relations) whose maximum marks the newest change.
+    validator_timestamp_fields = ('updated_at',)
+    # Fields counted (distinct) so that deletions also change the validator.
+    validator_count_fields = ('pk',)
+    # Actions that get conditional handling. Plain APIViews have no
+    # ``action`` attribute and are treated as 'list'.
+    conditional_actions = ('list',)
+    cache_max_age = None
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_validator(self):
+        """
+        Return ``(token, last_modified)`` describing the current state of the
+        resource. ``last_modified`` may be None when no timestamp is available.
+        """
+        aggregates = {
+            f'max_{i}': Max(field)
+            for i, field in enumerate(self.validator_timestamp_fields)
+        }
+        aggregates.update({
+            f'count_{i}': Count(field, distinct=True)
+            for i, field in enumerate(self.validator_count_fields)
+        })
+        result = self.get_validator_queryset().order_by().aggregate(**aggregates)
+
+        timestamps = [
+            result[f'max_{i}'] for i in range(len(self.validator_timestamp_fields))
+            if result[f'max_{i}'] is not None
+        ]
+        last_modified = max(timestamps) if timestamps else None
+        counts = [str(result[f'count_{i}']) for i in range(len(self.validator_count_fields))]
+        token = '{}:{}'.format(last_modified.isoformat() if last_modified else '-', '/'.join(counts))
+        return token, last_modified
+
+    def _conditional_enabled(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and getattr(self, 'action', None) in self.conditional_actions + (None,)
+        )
+
+    def _make_etag(self, request, token):
+        # The rendered body also depends on host (absolute media URLs), query
+        # string and renderer, so they are folded into the entity tag.
+        fingerprint = '|'.join([
+            type(self).__name__,
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            token,
+        ])
+        return quote_etag(hashlib.md5(fingerprint.encode('utf-8')).hexdigest())
+
+    def _is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # Weak comparison: proxies may weaken tags when compressing.
+            etags = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match)]
+            return '*' in etags or etag in etags
+
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since and last_modified is not None:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and int(last_modified.timestamp()) <= since
+
+        return False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional = None
+        if not self._conditional_enabled(request):
+            return
+
+        token, last_modified = self.get_validator()
+        etag = self._make_etag(request, token)
+        self._conditional = (etag, last_modified)
+        if self._is_not_modified(request, etag, last_modified):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        conditional = getattr(self, '_conditional', None)
+        if conditional and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            etag, last_modified = conditional
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            max_age = self.cache_max_age
+            if max_age is None:
+                max_age = settings.PUBLIC_API_CACHE_MAX_AGE
+            patch_cache_control(response, public=True, max_age=max_age)
+        return response
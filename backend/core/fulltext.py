@@ -0,0 +1,83 @@
+"""
+Full-text matching shared by the marketplace search
+(student_businesses/search.py) and the site search (search/query.py).
+
+Both keep denormalised columns on the searched rows: ``search_vector``, a
+weighted tsvector (PostgreSQL only), and ``search_text``, the same text
+lowercased, behind a trigram GIN index on PostgreSQL.
+
+On PostgreSQL every term matches as a prefix (``hood`` finds "Hoodie") or,
+for typos, by trigram word similarity to search_text (``hoddie`` finds
+"Hoodie"), ordered by ts_rank plus similarity. The similarity threshold,
+SEARCH_TYPO_THRESHOLD, is set on every new PostgreSQL session by
+configure_connection(), connected in core/apps.py. Elsewhere (SQLite in
+development and tests) every term must be a substring of search_text and
+rows whose title starts with the first term rank first; there is no typo
+tolerance.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, When
+
+CONFIG = 'english'
+MAX_TERMS = 8
+
+_TERM = re.compile(r'\w+')
+
+
+def is_postgres(conn=None):
+    return (conn or connection).vendor == 'postgresql'
+
+
+def terms(query):
+    """Lowercased words of ``query``; everything else is dropped."""
+    return _TERM.findall((query or '').lower())[:MAX_TERMS]
+
+
+def rank(queryset, words, title_field, annotation):
+    """
+    Filter ``queryset`` to rows matching every one of ``words``, best first,
+    with the score annotated as ``annotation``.
+    """
+    if is_postgres():
+        return _rank_postgres(queryset, words, annotation)
+    return _rank_fallback(queryset, words, title_field, annotation)
+
+
+def _rank_postgres(queryset, words, annotation):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+
+    # Terms are \w+ only, so the raw tsquery cannot be malformed.
+    tsquery = SearchQuery(' & '.join(f"{word}:*" for word in words), search_type='raw', config=CONFIG)
+    text = ' '.join(words)
+    return queryset.annotate(**{
+        annotation: SearchRank(F('search_vector'), tsquery) + TrigramWordSimilarity(text, 'search_text'),
+    }).filter(
+        Q(search_vector=tsquery) | Q(search_text__trigram_word_similar=text)
+    ).order_by(f"-{annotation}", 'id')
+
+
+def _rank_fallback(queryset, words, title_field, annotation):
+    condition = Q()
+    for word in words:
+        condition &= Q(search_text__contains=word)
+    return queryset.filter(condition).annotate(**{
+        annotation: Case(
+            When(**{f"{title_field}__istartswith": words[0]}, then=2),
+            When(**{f"{title_field}__icontains": words[0]}, then=1),
+            default=0,
+            output_field=IntegerField(),
+        ),
+    }).order_by(f"-{annotation}", 'id')
+
+
+def configure_connection(sender, connection, **kwargs):
+    """connection_created receiver: apply the typo threshold to new PostgreSQL sessions."""
+    if is_postgres(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)",
+                [str(settings.SEARCH_TYPO_THRESHOLD)],
+            )
@@ -0,0 +1,95 @@
+"""
+Compares DRF's history-list AnonRateThrottle with the sliding-window
+throttle (core/throttling.py) against the configured default cache.
+
+Each throttle checks N requests from a pool of client IPs; the report shows
+time per check and cache round trips per check. Each run uses a fresh key
+scope, and its keys expire on their own within two minutes.
+
+Usage:
+    python manage.py benchmark_throttles                       # 5000 checks, 20 clients
+    python manage.py benchmark_throttles --requests 20000 --clients 500
+"""
+import time
+import uuid
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework.throttling import AnonRateThrottle
+
+from core import throttling
+from core.throttling import SlidingWindowAnonRateThrottle
+
+CACHE_METHODS = ('get', 'set', 'add', 'incr', 'get_many', 'delete')
+
+
+class _HistoryThrottle(AnonRateThrottle):
+    rate = '100/min'
+    scope = 'benchmark'
+
+
+class _SlidingThrottle(SlidingWindowAnonRateThrottle):
+    rate = '100/min'
+    scope = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark DRF history throttling against the sliding-window throttle'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help='Throttle checks per implementation (default: 5000)')
+        parser.add_argument('--clients', type=int, default=20, help='Distinct client IPs (default: 20)')
+
+    def handle(self, *args, **options):
+        cache = caches['default']
+        self.stdout.write(f"Default cache: {type(cache).__name__}")
+        factory = RequestFactory()
+        requests = [
+            Request(factory.get('/', REMOTE_ADDR=f"10.0.{i // 256}.{i % 256}"))
+            for i in range(options['clients'])
+        ]
+        for label, throttle_class in (('drf history', _HistoryThrottle), ('sliding', _SlidingThrottle)):
+            self._run(label, throttle_class, cache, requests, options['requests'])
+
+    def _run(self, label, throttle_class, cache, requests, total):
+        calls = {'n': 0}
+        patches = [self._counting(cache, name, calls) for name in CACHE_METHODS]
+        script_patch = mock.patch.object(throttling, '_redis_hit', side_effect=self._counted(throttling._redis_hit, calls))
+        # DRF reads the cache from the class attribute.
+        throttle_class.cache = cache
+        throttle_class.scope = f"benchmark-{uuid.uuid4().hex[:8]}"
+        try:
+            for patch in patches + [script_patch]:
+                patch.start()
+            allowed = 0
+            started = time.perf_counter()
+            for i in range(total):
+                allowed += throttle_class().allow_request(requests[i % len(requests)], None)
+            elapsed = time.perf_counter() - started
+        finally:
+            for patch in patches + [script_patch]:
+                patch.stop()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>12}: {elapsed * 1e6 / total:8.1f} µs/check | "
+            f"{calls['n'] / total:4.2f} cache round trip(s)/check | {allowed} allowed"
+        ))
+
+    def _counted(self, func, calls):
+        # Count only outermost calls (LocMemCache.get_many calls get()).
+        def wrapper(*args, **kwargs):
+            if calls.get('depth'):
+                return func(*args, **kwargs)
+            calls['n'] += 1
+            calls['depth'] = 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                calls['depth'] = 0
+        return wrapper
+
+    def _counting(self, cache, name, calls):
+        return mock.patch.object(cache, name, side_effect=self._counted(getattr(cache, name), calls))
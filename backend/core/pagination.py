@@ -0,0 +1,133 @@
+"""
+Keyset (cursor) pagination for public list endpoints.
+
+Pages are fetched with ``WHERE (ordering columns) < (cursor values) ... LIMIT n``
+— a row-value comparison over every ordering column, so PostgreSQL walks the
+index straight to the page, the cost of a page does not grow with its
+position, and rows inserted meanwhile never shift or duplicate results (even
+ones that tie on the leading column, like two events on the same day). The
+cursor carries the last row's value for each column. Every ordering ends
+with the primary key so it is strictly stable; all its columns must sort in
+the same direction and be non-null.
+
+DRF's CursorPagination, which this reuses for page sizes and links, only
+filters on the first ordering column and steps over ties with an OFFSET.
+
+Responses look like ``{"next": url|null, "previous": url|null, "results": [...]}``;
+clients follow ``next``. ``?page_size=`` is honoured up to max_page_size.
+
+Usage:
+    class EventPagination(KeysetPagination):
+        ordering = ('-date', '-time', '-id')   # backed by an index on these columns
+"""
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.db.models.fields.tuple_lookups import Tuple, TupleGreaterThan, TupleLessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+def _reverse(ordering):
+    return tuple(order[1:] if order.startswith('-') else f"-{order}" for order in ordering)
+
+
+class KeysetPagination(CursorPagination):
+    page_size = 24
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        descending = self.ordering[0].startswith('-')
+        assert all(order.startswith('-') == descending for order in self.ordering), (
+            'Keyset pagination needs every ordering column sorted in the same direction.'
+        )
+        self.fields = [self._field(queryset.model, order.lstrip('-')) for order in self.ordering]
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self.cursor.position if self.cursor else None
+
+        queryset = queryset.order_by(*(_reverse(self.ordering) if reverse else self.ordering))
+        if position is not None:
+            columns = Tuple(*(F(order.lstrip('-')) for order in self.ordering))
+            lookup = TupleLessThan if descending != reverse else TupleGreaterThan
+            queryset = queryset.filter(lookup(columns, position))
+
+        # One extra row tells whether another page follows.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            values = json.loads(tokens['p'][0])
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError('cursor does not match the ordering')
+            position = tuple(
+                field.to_python(value) if field is not None else value
+                for field, value in zip(self.fields, values)
+            )
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': json.dumps(cursor.position, cls=DjangoJSONEncoder, separators=(',', ':'))}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        encoded = b64encode(parse.urlencode(tokens).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _field(self, model, name):
+        try:
+            return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None  # an annotation: its values go through the cursor as-is
+
+    def _position(self, instance):
+        position = []
+        for order, field in zip(self.ordering, self.fields):
+            name = field.attname if field is not None else order.lstrip('-')
+            position.append(instance[name] if isinstance(instance, dict) else getattr(instance, name))
+        return tuple(position)
@@ -0,0 +1,22 @@
+"""
+Shared Redis client.
+
+One connection pool per process, built from settings.REDIS_URL with the same
+TLS relaxation as the Celery broker (see the Celery section of settings).
+"""
+import ssl
+
+import redis
+from django.conf import settings
+
+_client = None
+
+
+def get_redis_client():
+    global _client
+    if _client is None:
+        kwargs = {}
+        if settings.REDIS_URL.startswith('rediss://'):
+            kwargs['ssl_cert_reqs'] = ssl.CERT_NONE
+        _client = redis.Redis.from_url(settings.REDIS_URL, **kwargs)
+    return _client
@@ -0,0 +1,248 @@
+"""
+Responsive renditions of public images.
+
+Every image field listed in FIELDS gets thumb/medium/large copies (320, 768
+and 1600 px wide, never upscaled) as WebP, plus AVIF when Pillow has an
+AVIF encoder. They are stored next to the original in the field's storage:
+
+    events/workshop.jpg -> events/workshop.thumb.webp, events/workshop.medium.avif, ...
+
+What was generated is recorded on the row in ``<field>_renditions``:
+
+    {"source": "events/workshop.jpg",
+     "sizes": {"thumb": {"width": 320, "height": 180, "webp": "events/workshop.thumb.webp", ...}, ...}}
+
+Saving a row whose image no longer matches ``source`` queues
+``core.generate_renditions`` after commit (inline when IMAGE_PROCESSING_ASYNC
+is off or the broker is unreachable). Rows whose upload is still being
+optimised (``image_status='pending'``, student_businesses/images.py) wait
+for the optimised file. The generate_renditions command backfills
+existing media.
+
+Serializers expose the map with RenditionsField; clients fall back to the
+plain image URL while it is empty.
+"""
+import logging
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save
+from PIL import Image as PILImage, ImageOps, features
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+SIZES = (('thumb', 320), ('medium', 768), ('large', 1600))
+QUALITY = {'webp': 80, 'avif': 55}
+
+# (model, image field) pairs with renditions. Private uploads (payment
+# receipts, nominee photos) are deliberately absent.
+FIELDS = [
+    ('shop.Product', 'image'),
+    ('shop.ProductImage', 'image'),
+    ('event.Event', 'image'),
+    ('executives.AcademicYear', 'hero_banner'),
+    ('executives.AcademicYear', 'group_photo'),
+    ('executives.Executive', 'image'),
+    ('staff.StaffMember', 'image'),
+    ('scholarship.Scholarship', 'image'),
+    ('student_businesses.Business', 'logo'),
+    ('student_businesses.Business', 'banner'),
+    ('student_businesses.Product', 'image'),
+    ('student_businesses.ProductImage', 'image'),
+]
+
+
+def formats():
+    return ['webp', 'avif'] if features.check('avif') else ['webp']
+
+
+def metadata_field(name):
+    return f"{name}_renditions"
+
+
+def is_current(instance, name):
+    field_file = getattr(instance, name)
+    data = getattr(instance, metadata_field(name)) or {}
+    return data.get('source', '') == (field_file.name if field_file else '')
+
+
+def fields_of(model):
+    label = model._meta.label
+    return [name for model_label, name in FIELDS if model_label == label]
+
+
+# =============================================================================
+# Rendering
+# =============================================================================
+
+def _open(field_file):
+    with field_file.open('rb') as f:
+        img = PILImage.open(f)
+        img.load()
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ('P', 'LA'):
+        img = img.convert('RGBA')
+    elif img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGB')
+    return img
+
+
+def render(field_file):
+    """
+    Write the renditions of ``field_file`` to its storage and return the
+    ``sizes`` map. Sizes wider than the original collapse into one.
+    """
+    img = _open(field_file)
+    storage = field_file.storage
+    stem = field_file.name.rsplit('.', 1)[0]
+    sizes, widths = {}, set()
+    for label, width in SIZES:
+        target = min(width, img.width)
+        if target in widths:
+            break
+        widths.add(target)
+        resized = img if target == img.width else img.resize(
+            (target, max(round(img.height * target / img.width), 1)), PILImage.LANCZOS,
+        )
+        entry = {'width': resized.width, 'height': resized.height}
+        for fmt in formats():
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=QUALITY[fmt])
+            entry[fmt] = storage.save(f"{stem}.{label}.{fmt}", ContentFile(buffer.getvalue()))
+        sizes[label] = entry
+    return sizes
+
+
+def _paths(data):
+    return [
+        path for entry in (data or {}).get('sizes', {}).values()
+        for key, path in entry.items() if key not in ('width', 'height')
+    ]
+
+
+def _delete(storage, paths):
+    for path in paths:
+        try:
+            storage.delete(path)
+        except Exception as e:
+            logger.warning(f"RENDITIONS: Could not delete {path}: {e}")
+
+
+def generate(label, pk, name, force=False):
+    """Bring ``<name>_renditions`` of row ``pk`` up to date. Returns the metadata."""
+    model = apps.get_model(label)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return None
+    if is_current(instance, name) and not force:
+        return getattr(instance, metadata_field(name))
+
+    field_file = getattr(instance, name)
+    storage = model._meta.get_field(name).storage
+    data = {}
+    if field_file:
+        try:
+            data = {'source': field_file.name, 'sizes': render(field_file)}
+        except Exception as e:
+            logger.error(f"RENDITIONS: {label} {pk} {name} failed: {e}", exc_info=True)
+            data = {'source': field_file.name, 'sizes': {}}
+
+    with transaction.atomic():
+        current = model._default_manager.select_for_update().filter(pk=pk).first()
+        current_file = getattr(current, name) if current else None
+        if current is None or (current_file.name if current_file else '') != data.get('source', ''):
+            # Deleted or re-uploaded meanwhile: the newer save queues its own run.
+            _delete(storage, _paths(data))
+            return None
+        old = getattr(current, metadata_field(name))
+        setattr(current, metadata_field(name), data)
+        update_fields = [metadata_field(name)]
+        if any(f.name == 'updated_at' for f in model._meta.concrete_fields):
+            update_fields.append('updated_at')  # refreshes conditional GET validators
+        current.save(update_fields=update_fields)
+
+    stale = set(_paths(old)) - set(_paths(data))
+    _delete(storage, stale)
+    logger.info(f"RENDITIONS: {label} {pk} {name}: {len(data.get('sizes', {}))} size(s)")
+    return data
+
+
+# =============================================================================
+# Scheduling
+# =============================================================================
+
+def schedule(instance, name):
+    label, pk = instance._meta.label, instance.pk
+
+    def _enqueue():
+        if settings.IMAGE_PROCESSING_ASYNC:
+            from .tasks import generate_renditions
+            try:
+                generate_renditions.delay(label, pk, name)
+                return
+            except Exception as e:
+                logger.error(f"RENDITIONS: Could not enqueue {label} {pk}, rendering inline: {e}")
+        generate(label, pk, name)
+
+    transaction.on_commit(_enqueue)
+
+
+def _on_save(sender, instance, **kwargs):
+    if getattr(instance, 'image_status', None) == 'pending':
+        return
+    for name in fields_of(sender):
+        if not is_current(instance, name):
+            schedule(instance, name)
+
+
+def connect():
+    """Queue renditions whenever a registered image changes. Called from CoreConfig.ready()."""
+    for label in {model_label for model_label, _ in FIELDS}:
+        post_save.connect(_on_save, sender=apps.get_model(label), dispatch_uid=f"renditions-{label}")
+
+
+# =============================================================================
+# Serialization
+# =============================================================================
+
+def urls(instance, name, request=None):
+    """
+    The rendition map of ``instance.<name>`` with URLs, plus a ready-made
+    ``srcset`` string per format. Empty while renditions are outdated.
+    """
+    if not is_current(instance, name):
+        return {}
+    storage = instance._meta.get_field(name).storage
+    sizes = getattr(instance, metadata_field(name)).get('sizes', {})
+
+    def _url(path):
+        url = storage.url(path)
+        return request.build_absolute_uri(url) if request else url
+
+    result = {
+        label: {key: (value if key in ('width', 'height') else _url(value)) for key, value in entry.items()}
+        for label, entry in sizes.items()
+    }
+    if result:
+        result['srcset'] = {
+            fmt: ', '.join(f"{entry[fmt]} {entry['width']}w" for entry in result.values() if fmt in entry)
+            for fmt in QUALITY if any(fmt in entry for entry in result.values())
+        }
+    return result
+
+
+class RenditionsField(serializers.Field):
+    """Read-only rendition map of one image field: ``image_renditions = RenditionsField('image')``."""
+
+    def __init__(self, image_field='image', **kwargs):
+        self.image_field = image_field
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        return urls(instance, self.image_field, self.context.get('request'))
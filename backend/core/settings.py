@@ -29,8 +29,10 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # search fields and lookups (student_businesses/search.py)
 
     # Local Apps
+    'core.apps.CoreConfig',  # shared plumbing: cache, throttles, benchmarks
     'users.apps.UsersConfig',
     'scholarship.apps.ScholarshipConfig',
     'event.apps.EventConfig',
@@ -41,6 +43,7 @@ INSTALLED_APPS = [
     'payment_logs.apps.PaymentLogsConfig',  # Webhook audit trail
     'student_businesses.apps.StudentBusinessesConfig',
     'nominations.apps.NominationsConfig',
+    'search.apps.SearchConfig',  # site-wide /api/search/
 
     # Celery Beat — scheduled tasks (auto-expire pending orders, etc.)
     'django_celery_beat',
@@ -231,8 +234,8 @@ REST_FRAMEWORK = {
     ],
     # Rate Limiting — prevents brute-force on login, coupon guessing, order spam
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'core.throttling.SlidingWindowAnonRateThrottle',
+        'core.throttling.SlidingWindowUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '30/minute',     # Anonymous users: 30 requests/min
@@ -240,6 +243,10 @@ REST_FRAMEWORK = {
     },
 }
 
+# Cache-Control max-age (seconds) sent with public read-only list responses
+# (core/conditional.py). Clients and CDNs revalidate with ETag after this.
+PUBLIC_API_CACHE_MAX_AGE = int(os.environ.get('PUBLIC_API_CACHE_MAX_AGE', 60))
+
 CORS_ALLOWED_ORIGINS = [origin.strip() for origin in os.environ.get('CORS_ALLOWED_ORIGINS', 'http://localhost:3000').split(',')]
 CORS_ALLOW_ALL_ORIGINS = os.environ.get('CORS_ALLOW_ALL_ORIGINS', 'False') == 'True' or not DEBUG  # Allow all in production for public API
 CSRF_TRUSTED_ORIGINS = [origin.strip() for origin in os.environ.get('CSRF_TRUSTED_ORIGINS', 'http://localhost:3000').split(',')]
@@ -257,6 +264,26 @@ SIMPLE_JWT = {
 PAYSTACK_PUBLIC_KEY = os.environ.get('PAYSTACK_PUBLIC_KEY')
 PAYSTACK_SECRET_KEY = os.environ.get('PAYSTACK_SECRET_KEY')
 
+# Paystack API client (shop/paystack.py): base URL (point it at a local fake
+# in tests), connect/read timeouts in seconds, and the circuit breaker —
+# consecutive failures before failing fast, and seconds before a trial call.
+PAYSTACK_BASE_URL = os.environ.get('PAYSTACK_BASE_URL', 'https://api.paystack.co').rstrip('/')
+PAYSTACK_CONNECT_TIMEOUT = float(os.environ.get('PAYSTACK_CONNECT_TIMEOUT', 3.05))
+PAYSTACK_READ_TIMEOUT = float(os.environ.get('PAYSTACK_READ_TIMEOUT', 8))
+PAYSTACK_BREAKER_THRESHOLD = int(os.environ.get('PAYSTACK_BREAKER_THRESHOLD', 5))
+PAYSTACK_BREAKER_COOLDOWN = int(os.environ.get('PAYSTACK_BREAKER_COOLDOWN', 30))
+
+# How far back the reconciliation task (shop/reconcile.py) looks for paid
+# transactions. Keep it above the 24-hour PENDING expiry.
+PAYSTACK_RECONCILE_WINDOW_HOURS = int(os.environ.get('PAYSTACK_RECONCILE_WINDOW_HOURS', 26))
+
+# Verified charge.success webhooks are acknowledged immediately and applied
+# by a Celery worker (shop/webhooks.py). Off in development, where no worker
+# usually runs, so webhooks are processed inline.
+PAYSTACK_WEBHOOK_ASYNC = os.environ.get(
+    'PAYSTACK_WEBHOOK_ASYNC', 'False' if DEBUG else 'True'
+).strip().lower() == 'true'
+
 # Email Configuration (SMTP)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 # EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend' # Debug Mode: Print to console
@@ -268,6 +295,21 @@ EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', EMAIL_HOST_USER) # Default to host user if undefined
 
+# Order email outbox (shop/outbox.py): emails per SMTP connection, delivery
+# attempts before an email is marked FAILED, and the first retry delay in
+# seconds (doubled on each further attempt, capped at an hour).
+ORDER_EMAIL_BATCH_SIZE = int(os.environ.get('ORDER_EMAIL_BATCH_SIZE', 50))
+ORDER_EMAIL_MAX_ATTEMPTS = int(os.environ.get('ORDER_EMAIL_MAX_ATTEMPTS', 5))
+ORDER_EMAIL_RETRY_BASE = int(os.environ.get('ORDER_EMAIL_RETRY_BASE', 60))
+
+# How long an unpaid order holds its stock (shop/inventory.py), per payment
+# method. MoMo payments are confirmed by hand, so they hold until the
+# 24-hour PENDING expiry.
+STOCK_HOLD_MINUTES = {
+    'PAYSTACK': int(os.environ.get('STOCK_HOLD_MINUTES_PAYSTACK', 30)),
+    'MOMO': int(os.environ.get('STOCK_HOLD_MINUTES_MOMO', 24 * 60)),
+}
+
 # =============================================================================
 # Logging Configuration — persistent error logs
 # =============================================================================
@@ -344,6 +386,112 @@ if REDIS_URL.startswith('rediss://'):
     CELERY_BROKER_USE_SSL = {'ssl_cert_reqs': _ssl.CERT_NONE}
     CELERY_REDIS_BACKEND_USE_SSL = {'ssl_cert_reqs': _ssl.CERT_NONE}
 
+# =============================================================================
+# Cache Configuration
+# 'default' backs rate throttles (core/throttling.py), the course tree and
+# other shared state. The 'catalog' alias holds pre-rendered product catalog
+# JSON (shop/cache.py), and 'singletons' the SiteSettings/NominationSettings
+# rows (core/singletons.py). All three follow CACHE_BACKEND: redis (the
+# default outside DEBUG) shares them across gunicorn workers, Celery and
+# admin processes, so catalog version bumps and singleton invalidations reach
+# every worker; 'locmem' is per-process and meant for development.
+# CATALOG_CACHE_BACKEND and SINGLETON_CACHE_BACKEND override it per alias.
+# =============================================================================
+def _cache_backends(debug, environ):
+    default = environ.get('CACHE_BACKEND', 'locmem' if debug else 'redis').strip().lower()
+    return {
+        'default': default,
+        'catalog': environ.get('CATALOG_CACHE_BACKEND', default).strip().lower(),
+        'singletons': environ.get('SINGLETON_CACHE_BACKEND', default).strip().lower(),
+    }
+
+
+CACHE_BACKENDS = _cache_backends(DEBUG, os.environ)
+CACHE_BACKEND = CACHE_BACKENDS['default']
+CATALOG_CACHE_BACKEND = CACHE_BACKENDS['catalog']
+SINGLETON_CACHE_BACKEND = CACHE_BACKENDS['singletons']
+
+
+def _shared_cache(backend, name):
+    if backend == 'redis':
+        config = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'aces' if name == 'catalog' else f'aces-{name}',
+        }
+        if REDIS_URL.startswith('rediss://'):
+            config['OPTIONS'] = {'ssl_cert_reqs': _ssl.CERT_NONE}
+        return config
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': f'aces-{name}',
+    }
+
+
+CACHES = {alias: _shared_cache(backend, alias) for alias, backend in CACHE_BACKENDS.items()}
+
+# Shared copies of singleton rows are dropped on save; the timeout is a
+# backstop. Each process also keeps its own copy for SINGLETON_LOCAL_TTL
+# seconds, which bounds how long a toggle takes to reach every worker.
+SINGLETON_CACHE_TIMEOUT = int(os.environ.get('SINGLETON_CACHE_TIMEOUT', 60 * 60))
+SINGLETON_LOCAL_TTL = float(os.environ.get('SINGLETON_LOCAL_TTL', 1))
+
+# Rendered catalog entries are keyed by version, so this only bounds how long
+# superseded entries linger before being evicted.
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# The rendered course tree (courses/tree.py) is kept in the default cache and
+# refreshed on every write; the timeout only bounds drift between processes
+# when the default cache is process-local. The DB snapshot is the source of truth.
+COURSE_TREE_CACHE_TIMEOUT = int(os.environ.get('COURSE_TREE_CACHE_TIMEOUT', 300))
+
+# =============================================================================
+# Download Counters
+# Resource download clicks are buffered (courses/counters.py) and flushed to
+# the database in one bulk UPDATE per interval by Celery Beat.
+# 'redis'  — shared HINCRBY hash; survives web and worker restarts (production).
+# 'memory' — per-process buffer flushed from the request path (development).
+# =============================================================================
+DOWNLOAD_COUNTER_BACKEND = os.environ.get(
+    'DOWNLOAD_COUNTER_BACKEND', 'memory' if DEBUG else 'redis'
+).strip().lower()
+DOWNLOAD_COUNTER_FLUSH_INTERVAL = int(os.environ.get('DOWNLOAD_COUNTER_FLUSH_INTERVAL', 60))
+
+# Resource downloads (courses/downloads.py) redirect instead of streaming.
+# Presigned storage URLs live this many seconds; 0 redirects to the public URL.
+COURSE_DOWNLOAD_URL_TTL = int(os.environ.get('COURSE_DOWNLOAD_URL_TTL', 300))
+# Local storage behind nginx: internal location serving MEDIA_ROOT (e.g. /protected-media/).
+COURSE_DOWNLOAD_ACCEL_PREFIX = os.environ.get('COURSE_DOWNLOAD_ACCEL_PREFIX', '')
+# Course/semester ZIP bundles (courses/bundles.py), content-addressing of
+# stored resource files (courses/blobs.py) and their previews
+# (courses/previews.py) run on a Celery worker; off in development, where
+# they run inline after commit. COURSE_BUNDLES_ASYNC, the name this had when
+# it covered bundles only, is still read as a fallback.
+COURSE_FILES_ASYNC = os.environ.get(
+    'COURSE_FILES_ASYNC', os.environ.get('COURSE_BUNDLES_ASYNC', 'False' if DEBUG else 'True')
+).strip().lower() == 'true'
+
+# =============================================================================
+# Image processing (student_businesses/images.py, core/renditions.py)
+# =============================================================================
+# Vendor uploads are resized to WebP, and responsive renditions of public
+# images generated, by a Celery worker so requests never decode images.
+# Off in development, where no worker usually runs: the same work then runs
+# inline after commit.
+IMAGE_PROCESSING_ASYNC = os.environ.get(
+    'IMAGE_PROCESSING_ASYNC', 'False' if DEBUG else 'True'
+).strip().lower() == 'true'
+
+# =============================================================================
+# Full-text search (core/fulltext.py): marketplace and site search
+# =============================================================================
+# Minimum pg_trgm word similarity for a typo to still match on PostgreSQL
+# (0-1, pg_trgm's default is 0.6). "hoddie" -> "hoodie" scores about 0.57.
+# MARKETPLACE_SEARCH_TYPO_THRESHOLD is the former name, still honoured.
+SEARCH_TYPO_THRESHOLD = float(os.environ.get(
+    'SEARCH_TYPO_THRESHOLD', os.environ.get('MARKETPLACE_SEARCH_TYPO_THRESHOLD', 0.45)
+))
+
 # =============================================================================
 # Celery Beat Schedule — Periodic Tasks
 # NOTE: Uses timedelta (already imported at top) instead of crontab to avoid
@@ -358,6 +506,31 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'shop.expire_pending_orders',
         'schedule': timedelta(hours=1),
     },
+    # Send order emails whose dispatch was lost or whose retry is due.
+    'sweep-order-emails': {
+        'task': 'shop.sweep_order_emails',
+        'schedule': timedelta(minutes=1),
+    },
+    # Complete paid Paystack orders whose callback and webhook were lost.
+    'reconcile-paystack-payments': {
+        'task': 'shop.reconcile_paystack_payments',
+        'schedule': timedelta(minutes=15),
+    },
+    # Apply Paystack webhooks whose processing task was lost.
+    'sweep-paystack-webhooks': {
+        'task': 'shop.sweep_paystack_webhooks',
+        'schedule': timedelta(minutes=1),
+    },
+    # Apply buffered resource download counts (courses/counters.py).
+    'flush-download-counters': {
+        'task': 'courses.flush_download_counters',
+        'schedule': timedelta(seconds=DOWNLOAD_COUNTER_FLUSH_INTERVAL),
+    },
+    # Re-rank marketplace products for the day's shuffle; a no-op once done.
+    'reshuffle-marketplace': {
+        'task': 'student_businesses.reshuffle_marketplace',
+        'schedule': timedelta(hours=1),
+    },
 }
 
 # =============================================================================
@@ -0,0 +1,72 @@
+"""
+Cached access to singleton settings rows (SiteSettings, NominationSettings).
+
+Kill-switch checks run on every checkout and status request, so the row is
+read through two cache levels instead of the database:
+
+1. a per-process copy that lives for SINGLETON_LOCAL_TTL seconds (1 s), so
+   hot paths cost neither a query nor a cache round trip;
+2. the shared 'singletons' cache (Redis outside DEBUG), so a cold process
+   still avoids the database.
+
+Saving or deleting the row drops both levels right away and again after
+commit (signals wired by register()), so an admin "close shop" toggle
+reaches every worker within the local TTL. That needs the shared level to
+be shared: with SINGLETON_CACHE_BACKEND=locmem only the saving process
+sees the change before SINGLETON_CACHE_TIMEOUT.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _key(model):
+    return f"singleton:{model._meta.label_lower}"
+
+
+def _shared():
+    return caches['singletons']
+
+
+def get(model):
+    """Return the pk=1 row of ``model``, creating it with defaults if absent."""
+    key = _key(model)
+    now = time.monotonic()
+    entry = _local.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    obj = _shared().get(key)
+    if obj is None:
+        obj, _ = model.objects.get_or_create(pk=1)
+        _shared().set(key, obj, settings.SINGLETON_CACHE_TIMEOUT)
+    with _local_lock:
+        _local[key] = (now + settings.SINGLETON_LOCAL_TTL, obj)
+    return obj
+
+
+def invalidate(model):
+    key = _key(model)
+    with _local_lock:
+        _local.pop(key, None)
+    _shared().delete(key)
+
+
+def register(model):
+    """Invalidate ``model``'s cached row whenever it is saved or deleted."""
+    def _invalidate(sender, **kwargs):
+        invalidate(sender)
+        # Again after commit: a concurrent reader may have cached the old row
+        # between our delete and the commit.
+        transaction.on_commit(lambda: invalidate(sender))
+
+    uid = f"singleton-invalidate-{_key(model)}"
+    post_save.connect(_invalidate, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(_invalidate, sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,27 @@
+"""
+Core Celery tasks.
+"""
+
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    name='core.generate_renditions',
+    bind=True,
+    max_retries=0,       # A later save or the backfill command re-queues it
+    ignore_result=True,
+)
+def generate_renditions(self, label, pk, field):
+    """
+    Render thumb/medium/large copies of one image field (core/renditions.py).
+    Queued after a save changes the image.
+    """
+    try:
+        from core.renditions import generate
+
+        generate(label, pk, field)
+    except Exception as e:
+        logger.error('RENDITIONS: %s %s %s failed: %s', label, pk, field, e, exc_info=True)
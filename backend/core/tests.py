@@ -0,0 +1,145 @@
+import shutil
+import tempfile
+from datetime import date, time
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from event.models import Event
+from event.serializers import EventSerializer
+
+from . import renditions, settings as project_settings, throttling
+from .throttling import hit
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SlidingWindowThrottleTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_limit_within_a_window(self):
+        for _ in range(3):
+            self.assertEqual(hit('client', 3, 60, 600.0), (True, None))
+        allowed, wait = hit('client', 3, 60, 610.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 50.0)
+        # Other clients are unaffected.
+        self.assertTrue(hit('other', 3, 60, 610.0)[0])
+
+    def test_previous_window_decays(self):
+        for _ in range(4):
+            hit('client', 4, 60, 630.0)
+        # At the boundary all of the last window still counts.
+        self.assertFalse(hit('client', 4, 60, 660.0)[0])
+        # About halfway through, about half of it does: room for two more.
+        self.assertTrue(hit('client', 4, 60, 689.0)[0])
+        self.assertTrue(hit('client', 4, 60, 689.0)[0])
+        allowed, wait = hit('client', 4, 60, 689.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 1.0)
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': 'redis://cache.invalid:6379/0',
+    'KEY_PREFIX': 'aces-default',
+    'OPTIONS': {'ssl_cert_reqs': None},
+}})
+class RedisThrottleTests(SimpleTestCase):
+
+    def test_script_runs_on_the_configured_redis(self):
+        client = mock.Mock()
+        client.register_script.return_value = script = mock.Mock(return_value=[1, 1, 0])
+        with mock.patch.object(throttling, '_script', None), mock.patch.object(throttling, '_clients', {}), \
+                mock.patch.object(throttling.redis.Redis, 'from_url', return_value=client) as from_url:
+            self.assertEqual(hit('client', 3, 60, 600.0), (True, None))
+
+        from_url.assert_called_once_with('redis://cache.invalid:6379/0', ssl_cert_reqs=None)
+        self.assertIs(script.call_args.kwargs['client'], client)
+        self.assertEqual(
+            script.call_args.kwargs['keys'],
+            [cache.make_key('aces:throttle:client:10'), cache.make_key('aces:throttle:client:9')],
+        )
+
+
+class CacheSettingsTests(SimpleTestCase):
+
+    def test_shared_caches_use_redis_outside_debug(self):
+        backends = project_settings._cache_backends(debug=False, environ={})
+        self.assertEqual(backends, {'default': 'redis', 'catalog': 'redis', 'singletons': 'redis'})
+        self.assertEqual(
+            project_settings._shared_cache(backends['singletons'], 'singletons')['BACKEND'],
+            'django.core.cache.backends.redis.RedisCache',
+        )
+
+    def test_overrides_and_development_default(self):
+        self.assertEqual(
+            project_settings._cache_backends(debug=True, environ={'SINGLETON_CACHE_BACKEND': 'Redis'}),
+            {'default': 'locmem', 'catalog': 'locmem', 'singletons': 'redis'},
+        )
+
+
+def _png(width, height, name='photo.png'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), (30, 90, 200)).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(IMAGE_PROCESSING_ASYNC=False)
+class RenditionTests(TestCase):
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        self.media = override_settings(MEDIA_ROOT=media)
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+    def _event(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.create(
+                name="Workshop", date=date(2026, 5, 1), time=time(10), location="Hall", image=image,
+            )
+        event.refresh_from_db()
+        return event
+
+    def test_upload_gets_sized_renditions_and_srcset(self):
+        event = self._event(_png(2000, 1000))
+        sizes = event.image_renditions['sizes']
+        self.assertEqual([(s['width'], s['height']) for s in sizes.values()], [(320, 160), (768, 384), (1600, 800)])
+        for fmt in renditions.formats():
+            self.assertTrue(event.image.storage.exists(sizes['medium'][fmt]))
+
+        data = EventSerializer(event).data['image_renditions']
+        self.assertTrue(data['srcset']['webp'].endswith('.large.webp 1600w'))
+        self.assertIn('.thumb.webp 320w, ', data['srcset']['webp'])
+
+    def test_small_images_are_not_upscaled(self):
+        sizes = self._event(_png(500, 500)).image_renditions['sizes']
+        self.assertEqual({label: s['width'] for label, s in sizes.items()}, {'thumb': 320, 'medium': 500})
+
+    def test_new_upload_replaces_old_renditions(self):
+        event = self._event(_png(1000, 500))
+        old = event.image_renditions['sizes']['thumb']['webp']
+        with self.captureOnCommitCallbacks(execute=True):
+            event.image = _png(1000, 500, name='other.png')
+            event.save()
+        event.refresh_from_db()
+        self.assertIn('other', event.image_renditions['source'])
+        self.assertFalse(event.image.storage.exists(old))
+
+    def test_backfill_renders_outdated_images(self):
+        event = self._event(_png(400, 200))
+        Event.objects.filter(pk=event.pk).update(image_renditions={})
+        self.assertEqual(EventSerializer(Event.objects.get(pk=event.pk)).data['image_renditions'], {})
+
+        call_command('generate_renditions', '--model', 'event.Event', '--workers', '1', stdout=StringIO())
+        event.refresh_from_db()
+        self.assertEqual(event.image_renditions['sizes']['thumb']['width'], 320)
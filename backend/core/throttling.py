@@ -0,0 +1,141 @@
+"""
+Sliding-window rate throttles.
+
+DRF's SimpleRateThrottle keeps a list of request timestamps per client in
+the cache and rewrites it on every request (get, trim, set): two round trips
+and a race between workers that can let bursts through. These throttles
+keep two counters per client instead — the current and previous fixed
+window — and estimate the rolling count as
+
+    previous * (1 - elapsed / duration) + current
+
+With the Redis cache backend the check-and-increment is one Lua script, run
+on the Redis server that cache is configured with (its LOCATION and OPTIONS),
+so each request costs a single atomic round trip. Other backends (local
+memory in development) use the cache API.
+
+If the cache is unreachable the request is allowed and the error logged:
+throttling must never take the site down.
+"""
+import logging
+
+import redis
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'aces:throttle:'
+
+# KEYS: current window, previous window. ARGV: limit, previous-window
+# weight, TTL. Returns {allowed, current, previous}.
+_HIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[2]) + current >= tonumber(ARGV[1]) then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return {1, current, previous}
+"""
+_script = None
+_clients = {}
+
+# RedisCache OPTIONS that configure Django's client, not the connection.
+_CACHE_ONLY_OPTIONS = ('parser_class', 'pool_class', 'serializer')
+
+
+def _redis_client(alias):
+    """A client for the Redis server of cache ``alias``, one pool per process."""
+    client = _clients.get(alias)
+    if client is None:
+        config = settings.CACHES[alias]
+        location = config['LOCATION']
+        if isinstance(location, str):
+            location = location.replace(';', ',').split(',')
+        options = {k: v for k, v in config.get('OPTIONS', {}).items() if k not in _CACHE_ONLY_OPTIONS}
+        # The first server is the one RedisCache writes to.
+        client = _clients[alias] = redis.Redis.from_url(location[0], **options)
+    return client
+
+
+def _redis_hit(client, keys, limit, weight, ttl):
+    global _script
+    if _script is None:
+        _script = client.register_script(_HIT_SCRIPT)
+    allowed, current, previous = _script(keys=keys, args=[limit, weight, ttl], client=client)
+    return bool(allowed), int(current), int(previous)
+
+
+def _cache_hit(cache, keys, limit, weight, ttl):
+    counts = cache.get_many(keys)
+    current, previous = counts.get(keys[0], 0), counts.get(keys[1], 0)
+    if previous * weight + current >= limit:
+        return False, current, previous
+    if not current and cache.add(keys[0], 1, ttl):
+        return True, 1, previous
+    try:
+        return True, cache.incr(keys[0]), previous
+    except ValueError:  # expired between get_many and incr
+        cache.add(keys[0], 1, ttl)
+        return True, 1, previous
+
+
+def hit(key, limit, duration, now, alias='default'):
+    """
+    Count one request for ``key`` if it fits in ``limit`` per ``duration``
+    seconds, in cache ``alias``. Returns ``(allowed, wait)`` — seconds until
+    a request would fit.
+    """
+    cache = caches[alias]
+    window = int(now // duration)
+    elapsed = now - window * duration
+    weight = 1 - elapsed / duration
+    keys = [f"{KEY_PREFIX}{key}:{window}", f"{KEY_PREFIX}{key}:{window - 1}"]
+    ttl = int(duration * 2) + 1
+
+    if isinstance(cache, RedisCache):
+        keys = [cache.make_key(k) for k in keys]  # the same keys the cache API uses
+        allowed, current, previous = _redis_hit(_redis_client(alias), keys, limit, weight, ttl)
+    else:
+        allowed, current, previous = _cache_hit(cache, keys, limit, weight, ttl)
+
+    if allowed:
+        return True, None
+    if current >= limit or not previous:
+        return False, duration - elapsed
+    # The previous window's share decays linearly; wait until it leaves room.
+    return False, max(duration * (1 - (limit - current) / previous) - elapsed, 0)
+
+
+class SlidingWindowThrottleMixin:
+    """Replaces SimpleRateThrottle's history list with hit()."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        try:
+            allowed, self._wait = hit(self.key, self.num_requests, self.duration, self.timer())
+        except Exception as e:
+            logger.warning(f"THROTTLE: Cache unavailable, allowing request: {e}")
+            return True
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
@@ -1,6 +1,12 @@
+import json
+
+from django import forms
 from django.contrib import admin, messages
+from django.http import JsonResponse
+from django.urls import reverse
 from django.utils.html import format_html
-from .models import AcademicYear, Semester, Course, CourseResource
+from . import uploads
+from .models import AcademicYear, Semester, Course, CourseResource, ResourceBundle
 
 
 class WarningAdminMixin:
@@ -25,15 +31,63 @@ class WarningAdminMixin:
         return super().delete_view(request, object_id, extra_context)
 
 
+# =============================================================================
+# Direct uploads — large files go from the browser straight to storage
+# =============================================================================
+
+class DirectUploadWidget(forms.HiddenInput):
+    """File picker that uploads via courses/uploads.py and submits the resulting token."""
+    template_name = 'courses/widgets/direct_upload.html'
+
+    class Media:
+        js = ('admin/js/direct_upload.js',)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['available'] = uploads.is_available()
+        if context['widget']['available']:
+            context['widget']['begin_url'] = reverse('admin:courses-direct-upload-begin')
+            context['widget']['complete_url'] = reverse('admin:courses-direct-upload-complete')
+        return context
+
+
+class CourseResourceAdminForm(forms.ModelForm):
+    direct_upload = forms.CharField(
+        required=False, widget=DirectUploadWidget, label="Large file",
+        help_text="Uploads straight to storage — use this for big slide decks and ZIPs.",
+    )
+
+    class Meta:
+        model = CourseResource
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        token = cleaned_data.get('direct_upload')
+        if token:
+            try:
+                upload = uploads.read_token(token)
+            except uploads.DirectUploadError as e:
+                self.add_error('direct_upload', str(e))
+                return cleaned_data
+            # Point the file field at the stored object; metadata comes from the HEAD.
+            cleaned_data['file'] = upload['key']
+            for field, value in (('file_size', upload['size']), ('file_extension', upload['extension'])):
+                cleaned_data[field] = value
+                setattr(self.instance, field, value)
+        return cleaned_data
+
+
 # =============================================================================
 # Course Resource Inline — shown inside the Course edit page
 # =============================================================================
 
 class CourseResourceInline(admin.TabularInline):
     model = CourseResource
+    form = CourseResourceAdminForm
     extra = 1
     fields = [
-        'title', 'resource_type', 'file', 'external_url',
+        'title', 'resource_type', 'file', 'direct_upload', 'external_url',
         'file_size_display', 'download_count', 'is_active', 'sort_order'
     ]
     readonly_fields = ['file_size_display', 'download_count']
@@ -153,6 +207,7 @@ class CourseAdmin(WarningAdminMixin, admin.ModelAdmin):
 
 @admin.register(CourseResource)
 class CourseResourceAdmin(WarningAdminMixin, admin.ModelAdmin):
+    form = CourseResourceAdminForm
     list_display = [
         'title', 'course_display', 'resource_type',
         'file_type_badge', 'file_size_display',
@@ -195,3 +250,50 @@ class CourseResourceAdmin(WarningAdminMixin, admin.ModelAdmin):
         return f"{kb:.0f} KB"
     file_size_display.short_description = "Size"
 
+    def get_urls(self):
+        from django.urls import path
+        urls = super().get_urls()
+        custom_urls = [
+            path('direct-upload/', self.admin_site.admin_view(self.direct_upload_begin), name='courses-direct-upload-begin'),
+            path('direct-upload/complete/', self.admin_site.admin_view(self.direct_upload_complete), name='courses-direct-upload-complete'),
+        ]
+        return custom_urls + urls
+
+    def _direct_upload(self, request, action):
+        if request.method != 'POST':
+            return JsonResponse({'error': 'POST required.'}, status=405)
+        if not (self.has_add_permission(request) or self.has_change_permission(request)):
+            return JsonResponse({'error': 'Permission denied.'}, status=403)
+        try:
+            return JsonResponse(action(json.loads(request.body or b'{}')))
+        except (ValueError, TypeError) as e:
+            return JsonResponse({'error': f'Invalid request: {e}'}, status=400)
+        except uploads.DirectUploadError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    def direct_upload_begin(self, request):
+        """AJAX endpoint: presigned URL(s) for uploading one file."""
+        return self._direct_upload(request, lambda data: uploads.begin(
+            str(data.get('filename', '')), int(data.get('size', 0)), str(data.get('content_type', '')),
+        ))
+
+    def direct_upload_complete(self, request):
+        """AJAX endpoint: finish an upload and return the token for the form."""
+        return self._direct_upload(request, lambda data: {'token': uploads.complete(
+            str(data.get('key', '')), str(data.get('upload_id') or ''), list(data.get('parts') or []),
+        )})
+
+
+# =============================================================================
+# Resource Bundles — ZIPs built on demand by courses/bundles.py
+# =============================================================================
+
+@admin.register(ResourceBundle)
+class ResourceBundleAdmin(admin.ModelAdmin):
+    """Build status of course/semester ZIPs. Rows are created by download requests, never by hand."""
+    list_display = ['__str__', 'status', 'member_count', 'file_size', 'created_at', 'updated_at']
+    list_filter = ['status']
+    readonly_fields = [f.name for f in ResourceBundle._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
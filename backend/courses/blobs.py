@@ -0,0 +1,273 @@
+"""
+Content-addressed storage for course resource files.
+
+The same past-exam PDF is often attached to several courses. Every file is
+stored once, named by nothing but the SHA-256 of its bytes:
+
+    courses/blobs/3f/3f9a...c2
+
+The extension lives on the resource (``file_extension``, taken from the
+uploaded name), and students download under the resource title plus that
+extension (download_name()), so the same bytes uploaded as ``exam.pdf`` and
+``EXAM.PDF`` are one blob.
+
+- Uploads through Django (admin file field): CourseResource.save() hashes
+  the upload chunk by chunk and calls store(), which skips the storage write
+  when that blob already exists.
+- Files already in storage under another name (direct uploads, see
+  courses/uploads.py, and everything uploaded before this) are moved by
+  address(): streamed once to hash, copied server-side to the blob unless it
+  exists, and the old object deleted. Saving such a resource queues it on
+  ``courses.address_resource_file``; the dedupe_course_files command does
+  the backlog in parallel.
+
+A blob's references are the resources whose ``file`` names it; it is deleted,
+with its preview (courses/previews.py), when the last one is deleted
+(courses/signals.py) or pointed at another file (CourseResource.save()).
+``content_hash`` is set once a resource's file is a blob.
+
+Checking whether a blob exists and deleting an unreferenced one race with
+each other: a delete landing between an upload's check and its row commit
+would leave the row pointing at nothing. Every such step therefore runs in a
+transaction holding the blob's FileBlob row (SELECT ... FOR UPDATE), and
+references are re-counted under that lock before deleting.
+"""
+import hashlib
+import logging
+import mimetypes
+import posixpath
+import re
+from contextlib import closing
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import CourseResource, FileBlob
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'courses/blobs/'
+CHUNK_SIZE = 1024 * 1024
+
+_BLOB = re.compile(rf'^{re.escape(PREFIX)}[0-9a-f]{{2}}/([0-9a-f]{{64}})$')
+_DIGEST = re.compile(r'^[0-9a-f]{64}')
+_UNSAFE = re.compile(r'[\\/:*?"<>|]+')
+
+
+def _storage():
+    return CourseResource._meta.get_field('file').storage
+
+
+def blob_name(digest):
+    return f"{PREFIX}{digest[:2]}/{digest}"
+
+
+def is_blob(name):
+    return bool(_BLOB.match(name or ''))
+
+
+def blob_digest(name):
+    """The SHA-256 a blob is named by, or '' if ``name`` is not a blob."""
+    match = _BLOB.match(name or '')
+    return match.group(1) if match else ''
+
+
+def _key(name):
+    """The digest ``name`` is locked by: blobs, their previews and older ``<digest>.<ext>`` blobs."""
+    match = _DIGEST.match(posixpath.basename(name or ''))
+    return match.group(0) if match and name.startswith(PREFIX) else ''
+
+
+def references(name):
+    return CourseResource.objects.filter(file=name).count()
+
+
+def download_name(title, name, extension=''):
+    """File name offered to students: the resource title for blobs, else the stored name."""
+    if not is_blob(name):
+        return posixpath.basename(name)
+    stem = _UNSAFE.sub('-', title or '').strip() or 'resource'
+    ext = (extension or '').lower()
+    return stem if not ext or stem.lower().endswith(f".{ext}") else f"{stem}.{ext}"
+
+
+def content_type(filename):
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+
+def open_stream(field_file):
+    """Read a stored file as a stream, without S3File spooling it to disk first."""
+    storage = field_file.storage
+    if hasattr(storage, 'bucket_name'):
+        body = storage.connection.meta.client.get_object(Bucket=storage.bucket_name, Key=field_file.name)['Body']
+        return closing(body)
+    return storage.open(field_file.name, 'rb')
+
+
+def _lock(digest):
+    """Hold blob ``digest``'s row until the surrounding transaction ends."""
+    FileBlob.objects.select_for_update().get_or_create(digest=digest)
+
+
+def _save_as(storage, name, content):
+    """Write ``name`` exactly: never the renamed copy storages make on a clash."""
+    saved = storage.save(name, content)
+    if saved != name:
+        storage.delete(saved)
+        raise RuntimeError(f"{name} was stored as {saved}")
+    return name
+
+
+# =============================================================================
+# New uploads
+# =============================================================================
+
+def store(field_file):
+    """
+    Store an uncommitted upload under its content address.
+    Returns ``(sha256 hex digest, stored name)``. Must run in the transaction
+    that saves the resource, so the blob cannot be released before it commits.
+    """
+    digest = hashlib.sha256()
+    for chunk in field_file.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+    digest = digest.hexdigest()
+    name = blob_name(digest)
+    storage = field_file.storage
+    _lock(digest)
+    if storage.exists(name):
+        logger.info(f"BLOBS: {name} already stored, upload skipped")
+    else:
+        upload = field_file.file
+        if not getattr(upload, 'content_type', None):
+            upload.content_type = content_type(field_file.name)  # S3 has no name to guess from
+        _save_as(storage, name, upload)
+    return digest, name
+
+
+# =============================================================================
+# Files already in storage
+# =============================================================================
+
+def _copy(storage, source, target):
+    if hasattr(storage, 'bucket_name'):
+        storage.connection.meta.client.copy_object(
+            Bucket=storage.bucket_name, Key=target,
+            CopySource={'Bucket': storage.bucket_name, 'Key': source},
+        )
+        return target
+    with storage.open(source, 'rb') as f:
+        return _save_as(storage, target, f)
+
+
+def address(name):
+    """
+    Move the stored file ``name`` to its content address and repoint every
+    resource using it. Returns the bytes reclaimed (the size, when the blob
+    already existed and the duplicate was deleted), or None if skipped.
+    """
+    if not name or is_blob(name):
+        return None
+    resource = CourseResource.objects.filter(file=name).first()
+    if resource is None:
+        return None
+
+    storage = _storage()
+    digest, size = hashlib.sha256(), 0
+    with open_stream(resource.file) as stream:
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    digest = digest.hexdigest()
+    target = blob_name(digest)
+
+    with transaction.atomic():
+        _lock(digest)
+        duplicate = storage.exists(target)
+        if not duplicate:
+            _copy(storage, name, target)
+        updated = CourseResource.objects.filter(file=name).update(file=target, content_hash=digest)
+        if not updated:
+            # Every resource moved to another file meanwhile.
+            if not duplicate and not references(target):
+                storage.delete(target)
+                FileBlob.objects.filter(digest=digest).delete()
+            return None
+
+    storage.delete(name)
+    logger.info(f"BLOBS: {name} -> {target}" + (" (duplicate removed)" if duplicate else ""))
+    from .previews import schedule as schedule_preview
+    schedule_preview(target, resource.file_extension)  # .update() above sends no post_save
+    return size if duplicate else 0
+
+
+def schedule(name):
+    def _enqueue():
+        if settings.COURSE_FILES_ASYNC:
+            from .tasks import address_resource_file
+            try:
+                address_resource_file.delay(name)
+                return
+            except Exception as e:
+                logger.error(f"BLOBS: Could not enqueue {name}, addressing inline: {e}")
+        address(name)
+
+    transaction.on_commit(_enqueue)
+
+
+# =============================================================================
+# Deleting unreferenced blobs
+# =============================================================================
+
+def purge(name):
+    """
+    Delete blob ``name`` and its preview if no resource references it,
+    checked under the blob's lock. Returns the bytes freed, or None if kept.
+    """
+    from .previews import preview_name
+
+    digest = _key(name)
+    if not digest:
+        return None
+    storage = _storage()
+    with transaction.atomic():
+        _lock(digest)
+        if references(name):
+            return None
+        freed = 0
+        for path in (name, preview_name(name)):
+            if storage.exists(path):
+                freed += storage.size(path)
+                storage.delete(path)
+                logger.info(f"BLOBS: Deleted unreferenced {path}")
+        if not storage.exists(blob_name(digest)):
+            FileBlob.objects.filter(digest=digest).delete()
+    return freed
+
+
+def release(name):
+    """Delete blob ``name`` once no resource references it (after commit)."""
+    def _release():
+        try:
+            purge(name)
+        except Exception as e:
+            logger.warning(f"BLOBS: Could not delete {name}: {e}")
+
+    if _key(name):
+        transaction.on_commit(_release)
+
+
+def orphans():
+    """Stored blobs, or blobs' leftover previews, no resource references."""
+    from .previews import SUFFIX
+    storage = _storage()
+    try:
+        directories, _ = storage.listdir(PREFIX.rstrip('/'))
+    except FileNotFoundError:  # local storage before the first blob
+        return
+    for directory in directories:
+        _, files = storage.listdir(f"{PREFIX}{directory}")
+        sources = {f"{PREFIX}{directory}/{filename.removesuffix(SUFFIX)}" for filename in files}
+        for name in sorted(sources):
+            if not references(name):
+                yield name
@@ -0,0 +1,248 @@
+"""
+ZIP bundles of every uploaded file in a course or semester.
+
+Before exams students download a course's resources one by one. request()
+fingerprints the member files (id, file name and updated_at of each active
+resource with an upload) and returns the ResourceBundle for that
+fingerprint, queuing ``courses.build_resource_bundle`` when it is new. Until
+a resource changes, everyone gets the same stored archive, served like a
+resource download (courses/downloads.py: a signed storage URL).
+
+build() never holds the archive in memory: each member is streamed from
+storage in chunks into the ZIP, and the ZIP's output goes part by part into
+a multipart upload (S3-compatible storage) or into a temporary file (local
+storage). Members are stored, not deflated — slides, PDFs and archives are
+already compressed. Once a bundle is ready, older bundles of the same course
+or semester are deleted.
+"""
+import hashlib
+import logging
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .blobs import download_name, open_stream
+from .models import CourseResource, ResourceBundle
+from .uploads import PART_SIZE
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+STALE_AFTER = timedelta(minutes=30)  # a queued or failed build older than this is retried
+
+
+def members(course=None, semester=None):
+    """Active resources with an uploaded file, in archive order."""
+    resources = CourseResource.objects.filter(is_active=True).exclude(file='').exclude(file__isnull=True)
+    if course is not None:
+        resources = resources.filter(course=course)
+    else:
+        resources = resources.filter(course__semester=semester)
+    return list(resources.select_related('course').order_by(
+        'course__sort_order', 'course__name', 'resource_type', 'sort_order', 'id',
+    ))
+
+
+def fingerprint(course, semester, resources):
+    scope = f"course:{course.pk}" if course else f"semester:{semester.pk}"
+    digest = hashlib.sha256(scope.encode())
+    for resource in sorted(resources, key=lambda r: r.pk):
+        digest.update(f"|{resource.pk}:{resource.file.name}:{resource.updated_at.isoformat()}".encode())
+    return digest.hexdigest()
+
+
+def request(course=None, semester=None):
+    """
+    The bundle of the current files of ``course`` or ``semester``, queuing a
+    build if needed. None when there is nothing to bundle.
+    """
+    resources = members(course, semester)
+    if not resources:
+        return None
+    bundle, created = ResourceBundle.objects.get_or_create(
+        fingerprint=fingerprint(course, semester, resources),
+        defaults={'course': course, 'semester': semester, 'member_count': len(resources)},
+    )
+    if created:
+        schedule(bundle.pk)
+    elif bundle.status != ResourceBundle.READY and bundle.updated_at < timezone.now() - STALE_AFTER:
+        # A lost or failed build: requeue it, once, whoever gets here first.
+        if ResourceBundle.objects.filter(pk=bundle.pk, updated_at=bundle.updated_at).update(
+            status=ResourceBundle.PENDING, error='', updated_at=timezone.now(),
+        ):
+            bundle.status = ResourceBundle.PENDING
+            schedule(bundle.pk)
+    return bundle
+
+
+def schedule(pk):
+    def _enqueue():
+        if settings.COURSE_FILES_ASYNC:
+            from .tasks import build_resource_bundle
+            try:
+                build_resource_bundle.delay(pk)
+                return
+            except Exception as e:
+                logger.error(f"BUNDLES: Could not enqueue bundle {pk}, building inline: {e}")
+        build(pk)
+
+    transaction.on_commit(_enqueue)
+
+
+# =============================================================================
+# Building
+# =============================================================================
+
+class _MultipartWriter:
+    """Write-only, unseekable file that uploads every PART_SIZE bytes as a part."""
+
+    def __init__(self, client, bucket, key):
+        self.client, self.bucket, self.key = client, bucket, key
+        self.upload_id = client.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType='application/zip',
+        )['UploadId']
+        self.buffer, self.parts, self.position = bytearray(), [], 0
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        while len(self.buffer) >= PART_SIZE:
+            self._upload(bytes(self.buffer[:PART_SIZE]))
+            del self.buffer[:PART_SIZE]
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def _upload(self, data):
+        number = len(self.parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number, Body=data,
+        )
+        self.parts.append({'PartNumber': number, 'ETag': response['ETag']})
+
+    def complete(self):
+        if self.buffer or not self.parts:
+            self._upload(bytes(self.buffer))
+            self.buffer.clear()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={'Parts': self.parts},
+        )
+
+    def abort(self):
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+
+
+def _arcname(resource, semester_bundle, used):
+    name = download_name(resource.title, resource.file.name, resource.file_extension)
+    if semester_bundle:
+        course = resource.course
+        folder = f"{course.code} {course.name}" if course.code else course.name
+        name = f"{folder.replace('/', '-').strip()}/{name}"
+    stem, dot, ext = name.rpartition('.')
+    candidate, n = name, 1
+    while candidate in used:
+        n += 1
+        candidate = f"{stem} ({n}).{ext}" if dot else f"{name} ({n})"
+    used.add(candidate)
+    return candidate
+
+
+def _write_zip(fp, resources, semester_bundle):
+    used = set()
+    with zipfile.ZipFile(fp, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for resource in resources:
+            info = zipfile.ZipInfo(
+                _arcname(resource, semester_bundle, used),
+                date_time=timezone.localtime(resource.updated_at).timetuple()[:6],
+            )
+            with open_stream(resource.file) as source, archive.open(info, 'w') as target:
+                shutil.copyfileobj(source, target, CHUNK_SIZE)
+
+
+def _store(storage, name, resources, semester_bundle):
+    """Write the archive to ``name`` in ``storage``. Returns (stored name, size)."""
+    if hasattr(storage, 'bucket_name'):
+        writer = _MultipartWriter(storage.connection.meta.client, storage.bucket_name, name)
+        try:
+            _write_zip(writer, resources, semester_bundle)
+            writer.complete()
+        except Exception:
+            writer.abort()
+            raise
+        return name, writer.position
+
+    with tempfile.TemporaryFile() as tmp:
+        _write_zip(tmp, resources, semester_bundle)
+        size = tmp.tell()
+        tmp.seek(0)
+        return storage.save(name, File(tmp)), size
+
+
+def _filename(bundle):
+    if bundle.course_id:
+        course = bundle.course
+        return slugify(f"{course.code or ''} {course.name}") or f"course-{course.pk}"
+    semester = bundle.semester
+    return f"year-{semester.academic_year.year}-semester-{semester.semester_number}"
+
+
+def build(pk):
+    """Build bundle ``pk`` if it is still queued. Returns the final status."""
+    if not ResourceBundle.objects.filter(pk=pk, status=ResourceBundle.PENDING).update(
+        status=ResourceBundle.BUILDING, updated_at=timezone.now(),
+    ):
+        return None  # already built, being built, or deleted
+    bundle = ResourceBundle.objects.select_related('course', 'semester').get(pk=pk)
+
+    resources = members(bundle.course, bundle.semester)
+    if not resources or fingerprint(bundle.course, bundle.semester, resources) != bundle.fingerprint:
+        # Resources changed since the request; the next request makes a new bundle.
+        bundle.delete()
+        return None
+
+    storage = ResourceBundle._meta.get_field('file').storage
+    name = f"courses/bundles/{bundle.fingerprint[:16]}/{_filename(bundle)}.zip"
+    try:
+        name, size = _store(storage, name, resources, semester_bundle=bundle.semester_id is not None)
+    except Exception as e:
+        logger.error(f"BUNDLES: Building bundle {pk} failed: {e}", exc_info=True)
+        ResourceBundle.objects.filter(pk=pk).update(
+            status=ResourceBundle.FAILED, error=str(e)[:1000], updated_at=timezone.now(),
+        )
+        return ResourceBundle.FAILED
+
+    if not ResourceBundle.objects.filter(pk=pk).update(
+        status=ResourceBundle.READY, file=name, file_size=size, member_count=len(resources),
+        updated_at=timezone.now(),
+    ):
+        storage.delete(name)  # pruned by a newer bundle meanwhile
+        return None
+    logger.info(f"BUNDLES: Bundle {pk} ready ({len(resources)} files, {size} bytes)")
+    prune(bundle)
+    return ResourceBundle.READY
+
+
+def prune(bundle):
+    """Delete the bundles of ``bundle``'s course or semester that it replaces."""
+    older = ResourceBundle.objects.filter(
+        course_id=bundle.course_id, semester_id=bundle.semester_id, created_at__lt=bundle.created_at,
+    )
+    for old in older:
+        if old.file:
+            try:
+                old.file.delete(save=False)
+            except Exception as e:
+                logger.warning(f"BUNDLES: Could not delete {old.file.name}: {e}")
+        old.delete()
@@ -0,0 +1,157 @@
+"""
+Buffered download counters for course resources.
+
+TrackDownloadView records a click with a single atomic increment instead of
+an UPDATE on the hot CourseResource row. flush() later applies all buffered
+deltas with one bulk UPDATE and refreshes the materialized course tree.
+
+Redis backend (production):
+    Clicks are HINCRBY'd into PENDING_KEY. A flush atomically RENAMEs the hash
+    to PROCESSING_KEY, applies it, and only then deletes it. If the worker dies
+    mid-flush the processing hash is still there and the next flush applies it
+    first, so counts are never lost (at worst a crash between the DB commit and
+    the DEL applies one batch twice).
+
+Memory backend (development, or DOWNLOAD_COUNTER_BACKEND=memory):
+    A per-process dict, flushed from the request path once per
+    DOWNLOAD_COUNTER_FLUSH_INTERVAL and at interpreter exit.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'courses:downloads:pending'
+PROCESSING_KEY = 'courses:downloads:processing'
+FLUSH_LOCK_KEY = 'courses:downloads:flush-lock'
+
+_memory_lock = threading.Lock()
+_memory_counts = Counter()
+_memory_last_flush = time.monotonic()
+
+
+def _use_redis():
+    return settings.DOWNLOAD_COUNTER_BACKEND == 'redis'
+
+
+def _redis():
+    from core.redis_client import get_redis_client
+    return get_redis_client()
+
+
+def increment(resource_id, amount=1):
+    """Record ``amount`` downloads of a resource. Never touches the database."""
+    if _use_redis():
+        try:
+            _redis().hincrby(PENDING_KEY, resource_id, amount)
+            return
+        except Exception as e:
+            # Keep the click in this process rather than dropping it.
+            logger.warning(f"DOWNLOAD COUNTER: Redis unavailable, buffering in memory: {e}")
+
+    with _memory_lock:
+        _memory_counts[int(resource_id)] += amount
+        due = time.monotonic() - _memory_last_flush >= settings.DOWNLOAD_COUNTER_FLUSH_INTERVAL
+
+    if due:
+        try:
+            flush_memory()
+        except Exception as e:
+            logger.error(f"DOWNLOAD COUNTER: In-process flush failed, will retry: {e}")
+
+
+def apply_counts(counts):
+    """
+    Add ``{resource_id: delta}`` to download_count with a single UPDATE and
+    refresh the affected courses in the course tree. Returns rows updated.
+    """
+    counts = {int(pk): int(delta) for pk, delta in counts.items() if int(delta) > 0}
+    if not counts:
+        return 0
+
+    from .models import CourseResource
+    from .tree import schedule_refresh
+
+    delta = Case(
+        *[When(pk=pk, then=Value(n)) for pk, n in counts.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    with transaction.atomic():
+        resources = CourseResource.objects.filter(pk__in=counts.keys(), is_active=True)
+        updated = resources.update(download_count=F('download_count') + delta)
+        course_ids = set(
+            CourseResource.objects.filter(pk__in=counts.keys()).values_list('course_id', flat=True)
+        )
+        schedule_refresh(course_ids=course_ids)
+    return updated
+
+
+def flush_memory():
+    global _memory_last_flush
+    with _memory_lock:
+        counts = dict(_memory_counts)
+        _memory_counts.clear()
+        _memory_last_flush = time.monotonic()
+
+    try:
+        return apply_counts(counts)
+    except Exception:
+        # Put the batch back so the next flush retries it.
+        with _memory_lock:
+            _memory_counts.update(counts)
+        raise
+
+
+def flush_redis():
+    client = _redis()
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=300, blocking=False)
+    if not lock.acquire():
+        logger.info('DOWNLOAD COUNTER: Another flush is in progress; skipping.')
+        return 0
+
+    try:
+        # A batch left behind by a crashed flush goes first.
+        if not client.exists(PROCESSING_KEY):
+            try:
+                client.rename(PENDING_KEY, PROCESSING_KEY)
+            except ResponseError:
+                # RENAME fails when there is nothing pending.
+                return 0
+        counts = client.hgetall(PROCESSING_KEY)
+        updated = apply_counts({pk.decode(): n.decode() for pk, n in counts.items()})
+        client.delete(PROCESSING_KEY)
+        return updated
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+
+def flush():
+    """Apply every buffered count visible to this process. Returns rows updated."""
+    updated = flush_memory()
+    if _use_redis():
+        updated += flush_redis()
+    return updated
+
+
+def _flush_at_exit():
+    if not _memory_counts:
+        return
+    try:
+        flush_memory()
+    except Exception as e:
+        logger.error(f"DOWNLOAD COUNTER: Failed to flush {sum(_memory_counts.values())} buffered count(s) at exit: {e}")
+
+
+atexit.register(_flush_at_exit)
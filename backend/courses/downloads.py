@@ -0,0 +1,66 @@
+"""
+Responses for ResourceDownloadView.
+
+A download is one request: the view counts it (buffered, courses/counters.py)
+and answers with a redirect, so file bytes never pass through a Python worker.
+
+- S3-compatible storage: a presigned GET URL valid for COURSE_DOWNLOAD_URL_TTL
+  seconds that downloads as an attachment. With a TTL of 0 the redirect goes
+  to the public (CDN) URL instead, for buckets served publicly.
+- Local storage with COURSE_DOWNLOAD_ACCEL_PREFIX set: an X-Accel-Redirect to
+  that internal nginx location, which serves the file itself.
+- Local storage otherwise: a redirect to the MEDIA_URL path.
+- Link-only resources: a redirect to the external URL.
+"""
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect
+from django.utils.http import content_disposition_header
+
+from .blobs import content_type, download_name
+from .models import CourseResource
+
+
+def _storage():
+    return CourseResource._meta.get_field('file').storage
+
+
+def _signed_url(storage, name, filename):
+    return storage.connection.meta.client.generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': storage.bucket_name,
+            'Key': name,
+            'ResponseContentDisposition': content_disposition_header(True, filename),
+            'ResponseContentType': content_type(filename),  # blob names have no extension
+        },
+        ExpiresIn=settings.COURSE_DOWNLOAD_URL_TTL,
+    )
+
+
+def file_response(name, filename=None):
+    """Serve stored file ``name``, saved by the browser as ``filename`` (default: its basename)."""
+    filename = filename or posixpath.basename(name)
+    storage = _storage()
+    if hasattr(storage, 'bucket_name'):
+        if settings.COURSE_DOWNLOAD_URL_TTL:
+            return HttpResponseRedirect(_signed_url(storage, name, filename))
+        return HttpResponseRedirect(storage.url(name))
+
+    prefix = settings.COURSE_DOWNLOAD_ACCEL_PREFIX
+    if prefix:
+        response = HttpResponse()
+        del response['Content-Type']  # let nginx set it from the file
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
+    return HttpResponseRedirect(storage.url(name))
+
+
+def respond(file_name, external_url, title='', extension=''):
+    """The download response for a resource's stored ``file_name`` or ``external_url``."""
+    if file_name:
+        return file_response(file_name, download_name(title, file_name, extension))
+    return HttpResponseRedirect(external_url)
@@ -0,0 +1,84 @@
+"""
+Moves existing course resource files to content-addressed storage
+(courses/blobs.py), so identical files are stored once.
+
+Each distinct stored file is streamed once to hash it, then copied
+server-side to its blob (or, when the blob already exists, simply dropped).
+Files are processed on a thread pool; the work is storage I/O. Blobs
+stored before blob names dropped the extension (``<digest>.pdf``) count as
+files to move.
+
+Usage:
+    python manage.py dedupe_course_files                  # 4 workers
+    python manage.py dedupe_course_files --workers 8
+    python manage.py dedupe_course_files --dry-run        # count files still to move
+    python manage.py dedupe_course_files --prune          # also delete unreferenced blobs
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from courses import blobs
+from courses.models import CourseResource
+
+
+class Command(BaseCommand):
+    help = 'Store course resource files once each, by content hash'
+
+    FAILED = object()
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Parallel workers (default: 4)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the files that would be moved')
+        parser.add_argument('--prune', action='store_true', help='Delete blobs no resource references')
+
+    def handle(self, *args, **options):
+        names = sorted(
+            name for name in CourseResource.objects.exclude(file='').exclude(file__isnull=True)
+            .values_list('file', flat=True).distinct()
+            if not blobs.is_blob(name)
+        )
+        self.stdout.write(f"{len(names)} file(s) to move")
+        if options['dry_run']:
+            return
+
+        started = time.perf_counter()
+        if options['workers'] <= 1:
+            results = [self._address(name) for name in names]
+        else:
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                futures = [pool.submit(self._address_in_thread, name) for name in names]
+                results = [future.result() for future in as_completed(futures)]
+
+        failed = results.count(self.FAILED)
+        reclaimed_per_file = [result for result in results if result is not None and result is not self.FAILED]
+        moved = len(reclaimed_per_file)
+        duplicates = sum(1 for size in reclaimed_per_file if size > 0)
+        reclaimed = sum(reclaimed_per_file)
+
+        if options['prune']:
+            for name in blobs.orphans():
+                freed = blobs.purge(name)  # re-checks references under the blob's lock
+                if freed is not None:
+                    reclaimed += freed
+                    self.stdout.write(f"Deleted unreferenced {name}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved {moved} file(s), removed {duplicates} duplicate(s), {failed} failed; "
+            f"reclaimed {reclaimed / (1024 * 1024):.1f} MB ({reclaimed} bytes) in {time.perf_counter() - started:.1f} s"
+        ))
+
+    def _address(self, name):
+        try:
+            return blobs.address(name)
+        except Exception as e:
+            self.stderr.write(f"{name}: {e}")
+            return self.FAILED
+
+    def _address_in_thread(self, name):
+        try:
+            return self._address(name)
+        finally:
+            connection.close()  # each worker thread has its own connection
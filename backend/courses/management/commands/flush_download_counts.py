@@ -0,0 +1,24 @@
+"""
+Management command: flush_download_counts
+
+Applies buffered resource download counts to the database immediately,
+instead of waiting for the periodic Celery task. Useful before a deploy
+or when reading exact counts for a report.
+
+Usage:
+    python manage.py flush_download_counts
+"""
+
+from django.core.management.base import BaseCommand
+
+from courses import counters
+
+
+class Command(BaseCommand):
+    help = "Flush buffered course resource download counts to the database."
+
+    def handle(self, *args, **options):
+        updated = counters.flush()
+        self.stdout.write(self.style.SUCCESS(
+            f"Flushed download counts for {updated} resource(s)."
+        ))
@@ -0,0 +1,69 @@
+"""
+Backfills first-page previews (courses/previews.py) of course resource files.
+
+Renders every content-addressed PDF/PPTX whose preview is missing or
+outdated, on a thread pool: downloads overlap, while pdfium itself renders
+one page at a time. Files not yet content-addressed are skipped — run
+dedupe_course_files first.
+
+Usage:
+    python manage.py generate_previews                  # 4 workers
+    python manage.py generate_previews --workers 8
+    python manage.py generate_previews --force --dry-run
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from courses import previews
+from courses.models import CourseResource
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or outdated previews of course resource files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Parallel workers (default: 4)')
+        parser.add_argument('--force', action='store_true', help='Re-render previews that are already up to date')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the files that would be rendered')
+
+    def handle(self, *args, **options):
+        names = set()
+        resources = CourseResource.objects.exclude(content_hash='').only('pk', 'file', 'file_extension', 'preview')
+        for resource in resources.iterator():
+            if previews.supports(resource.file_extension) and (options['force'] or not previews.is_current(resource)):
+                names.add(resource.file.name)
+        names = sorted(names)
+
+        self.stdout.write(f"{len(names)} file(s) to preview")
+        if options['dry_run'] or not names:
+            return
+
+        started = time.perf_counter()
+        if options['workers'] <= 1:
+            results = [self._generate(name, options['force']) for name in names]
+        else:
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                futures = [pool.submit(self._generate_in_thread, name, options['force']) for name in names]
+                results = [future.result() for future in as_completed(futures)]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {sum(results)} preview(s), {len(results) - sum(results)} without image, "
+            f"in {time.perf_counter() - started:.1f} s"
+        ))
+
+    def _generate(self, name, force):
+        try:
+            data = previews.generate(name, force=force)
+        except Exception as e:
+            self.stderr.write(f"{name}: {e}")
+            return False
+        return bool(data and data.get('image'))
+
+    def _generate_in_thread(self, name, force):
+        try:
+            return self._generate(name, force)
+        finally:
+            connection.close()  # each worker thread has its own connection
@@ -0,0 +1,24 @@
+"""
+Management command: rebuild_course_tree
+
+Re-renders the materialized course tree served by /api/courses/years/ from
+the database. The tree is normally kept current by signals; run this after
+bulk imports done with .update()/raw SQL, or if a refresh ever failed.
+
+Usage:
+    python manage.py rebuild_course_tree
+"""
+
+from django.core.management.base import BaseCommand
+
+from courses import tree
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized course tree from the database."
+
+    def handle(self, *args, **options):
+        etag, body = tree.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Course tree rebuilt ({len(body)} bytes, etag {etag})."
+        ))
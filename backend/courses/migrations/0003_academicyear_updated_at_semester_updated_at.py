@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_add_courseresource_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='academicyear',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='semester',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
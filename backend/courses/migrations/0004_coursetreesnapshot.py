@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_academicyear_updated_at_semester_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseTreeSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.TextField(default='[]', help_text='Rendered AcademicYear → Semester → Course → Resource tree')),
+                ('etag', models.CharField(blank=True, max_length=64)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Course Tree Snapshot',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 16:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_coursetreesnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceBundle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=64, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Queued'), ('building', 'Building'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('file', models.FileField(blank=True, upload_to='courses/bundles/')),
+                ('file_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('member_count', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bundles', to='courses.course')),
+                ('semester', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bundles', to='courses.semester')),
+            ],
+            options={
+                'verbose_name': 'Resource Bundle',
+                'verbose_name_plural': 'Resource Bundles',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_resourcebundle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseresource',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='SHA-256 of the file once stored content-addressed (courses/blobs.py)', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_resource_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseresource',
+            name='preview',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+import posixpath
+
+from django.db import models, transaction
 from .validators import validate_resource_file
 
 
@@ -6,6 +8,7 @@ class AcademicYear(models.Model):
     year = models.IntegerField(primary_key=True, help_text="Academic Year (e.g. 1, 2, 3, 4)")
     year_name = models.CharField(max_length=50, blank=True, null=True, help_text="Optional name (e.g. 'Freshman', 'Sophomore')")
     is_active = models.BooleanField(default=True, help_text="Uncheck to hide this year from the frontend")
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['year']
@@ -17,6 +20,7 @@ class Semester(models.Model):
     academic_year = models.ForeignKey(AcademicYear, related_name='semesters', on_delete=models.CASCADE)
     semester_number = models.IntegerField(help_text="1 for First Semester, 2 for Second Semester")
     semester_name = models.CharField(max_length=50, blank=True, null=True, help_text="Optional name")
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['academic_year', 'semester_number']
@@ -87,6 +91,10 @@ class CourseResource(models.Model):
     )
 
     # --- Auto-populated metadata ---
+    content_hash = models.CharField(
+        max_length=64, blank=True, db_index=True, editable=False,
+        help_text="SHA-256 of the file once stored content-addressed (courses/blobs.py)"
+    )
     file_size = models.PositiveBigIntegerField(
         null=True, blank=True,
         help_text="File size in bytes (auto-calculated on upload)"
@@ -95,6 +103,7 @@ class CourseResource(models.Model):
         max_length=10, blank=True,
         help_text="Auto-detected file extension (pdf, pptx, zip, etc.)"
     )
+    preview = models.JSONField(default=dict, blank=True, editable=False)  # courses/previews.py
 
     # --- Tracking & visibility ---
     download_count = models.PositiveIntegerField(default=0)
@@ -122,16 +131,36 @@ class CourseResource(models.Model):
                 "You must provide either a file upload or an external URL."
             )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored file name as loaded, so save() can tell when it changes.
+        if 'file' in field_names:
+            instance._stored_file = instance.__dict__['file'] or ''
+        return instance
+
     def save(self, *args, **kwargs):
-        # Auto-populate file metadata on upload
+        with transaction.atomic():  # a new blob's lock (courses/blobs.py) is held until the row commits
+            self._save(*args, **kwargs)
+
+    def _save(self, *args, **kwargs):
+        from .blobs import blob_digest, is_blob, release, store
+
+        # Auto-populate file metadata on upload. Direct uploads (courses/uploads.py)
+        # arrive already stored with file_size taken from a HEAD; don't re-fetch.
         if self.file:
-            try:
-                self.file_size = self.file.size
-            except Exception:
-                pass
-            name = self.file.name or ''
-            if '.' in name:
+            if not self.file._committed or self.file_size is None:
+                try:
+                    self.file_size = self.file.size
+                except Exception:
+                    pass
+            # Blob names carry no extension: take it from the uploaded name.
+            name = posixpath.basename(self.file.name or '')
+            if '.' in name and not is_blob(self.file.name):
                 self.file_extension = name.rsplit('.', 1)[-1].lower()
+            if not self.file._committed:
+                # Store each distinct file once (courses/blobs.py).
+                self.content_hash, self.file = store(self.file)
         elif self.external_url:
             # Try to detect extension from URL
             url_path = self.external_url.split('?')[0]  # strip query params
@@ -139,7 +168,17 @@ class CourseResource(models.Model):
                 ext = url_path.rsplit('.', 1)[-1].lower()
                 if len(ext) <= 10 and ext in ('pdf', 'zip', 'rar', 'pptx', 'docx', '7z'):
                     self.file_extension = ext
+
+        previous = '' if self._state.adding else getattr(self, '_stored_file', None)
+        current = self.file.name if self.file else ''
+        if previous is not None and current != previous:
+            # Another file: its hash is known only if it is already a blob,
+            # otherwise post_save queues it to be addressed.
+            self.content_hash = blob_digest(current)
         super().save(*args, **kwargs)
+        self._stored_file = current
+        if previous and previous != current:
+            release(previous)  # deleted after commit if nothing else uses it
 
     @property
     def download_url(self):
@@ -148,3 +187,75 @@ class CourseResource(models.Model):
             return self.file.url
         return self.external_url or ''
 
+
+
+class FileBlob(models.Model):
+    """
+    One content-addressed resource file (courses/blobs.py), stored under its
+    digest. The row is the per-digest lock: storing, moving and deleting the
+    blob all hold it, so a blob is never deleted while a resource is about
+    to reference it.
+    """
+    digest = models.CharField(max_length=64, primary_key=True, help_text="SHA-256 of the file")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "File Blob"
+
+    def __str__(self):
+        return self.digest
+
+
+class CourseTreeSnapshot(models.Model):
+    """
+    Materialized JSON of the public course hierarchy served by CourseListView.
+    Singleton row (pk=1) maintained by courses/tree.py — never edit by hand.
+    """
+    payload = models.TextField(default='[]', help_text="Rendered AcademicYear → Semester → Course → Resource tree")
+    etag = models.CharField(max_length=64, blank=True)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Course Tree Snapshot"
+
+    def __str__(self):
+        return f"Course tree snapshot ({self.built_at:%Y-%m-%d %H:%M})"
+
+    def save(self, *args, **kwargs):
+        # Enforce singleton: always store as pk=1
+        self.pk = 1
+        super().save(*args, **kwargs)
+
+
+class ResourceBundle(models.Model):
+    """
+    A ZIP of every uploaded file in a course or semester, built on demand by
+    courses/bundles.py. ``fingerprint`` hashes the member files and their
+    ``updated_at``, so any change to the resources makes a new bundle.
+    """
+    PENDING, BUILDING, READY, FAILED = 'pending', 'building', 'ready', 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Queued'),
+        (BUILDING, 'Building'),
+        (READY, 'Ready'),
+        (FAILED, 'Failed'),
+    ]
+
+    course = models.ForeignKey(Course, null=True, blank=True, related_name='bundles', on_delete=models.CASCADE)
+    semester = models.ForeignKey(Semester, null=True, blank=True, related_name='bundles', on_delete=models.CASCADE)
+    fingerprint = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    file = models.FileField(upload_to='courses/bundles/', blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    member_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Resource Bundle"
+        verbose_name_plural = "Resource Bundles"
+
+    def __str__(self):
+        return f"{self.course or self.semester} bundle ({self.get_status_display()})"
@@ -0,0 +1,167 @@
+"""
+First-page previews of course resource files.
+
+Each content-addressed file (courses/blobs.py) that is a PDF or PPTX gets a
+small WebP thumbnail stored next to it, plus its page count:
+
+    courses/blobs/3f/3f9a...c2 -> courses/blobs/3f/3f9a...c2.preview.webp
+
+Blob names carry no extension; the file type is the resource's
+``file_extension``.
+
+- PDF: the first page rendered with pdfium (pypdfium2), WIDTH px wide.
+- PPTX: the preview picture PowerPoint embeds (docProps/thumbnail.jpeg),
+  when present; the page count is the number of slides. Rendering slides
+  would need LibreOffice on the worker.
+
+What was generated is recorded on every resource using the file, in
+``preview``: ``{"source": file name, "image": preview name, "width", "height",
+"pages"}``. The course tree serializes it as ``preview_url`` / ``page_count``.
+
+Previews are queued on ``courses.render_resource_preview`` after commit
+(inline when COURSE_FILES_ASYNC is off) once a file is content-addressed —
+by CourseResource.save() for uploads, by blobs.address() for moved files.
+Identical files share one preview. The generate_previews command backfills.
+"""
+import logging
+import re
+import shutil
+import tempfile
+import threading
+import zipfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image as PILImage
+
+from .blobs import CHUNK_SIZE, open_stream
+from .models import CourseResource
+
+logger = logging.getLogger(__name__)
+
+WIDTH = 320
+QUALITY = 75
+SUFFIX = '.preview.webp'
+EXTENSIONS = ('pdf', 'pptx')
+
+_SLIDE = re.compile(r'^ppt/slides/slide\d+\.xml$')
+_pdfium_lock = threading.Lock()  # pdfium is not thread-safe
+
+
+def preview_name(name):
+    return f"{name}{SUFFIX}"
+
+
+def supports(extension):
+    return (extension or '').lower() in EXTENSIONS
+
+
+def is_current(resource):
+    return not resource.file or (resource.preview or {}).get('source') == resource.file.name
+
+
+# =============================================================================
+# Rendering
+# =============================================================================
+
+def _render_pdf(path):
+    import pypdfium2 as pdfium
+
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            pages = len(pdf)
+            page = pdf[0]
+            image = page.render(scale=WIDTH / page.get_width()).to_pil()
+            page.close()
+        finally:
+            pdf.close()
+    return image, pages
+
+
+def _render_pptx(path):
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        pages = sum(1 for name in names if _SLIDE.match(name))
+        thumbnail = next((name for name in names if name.lower() in (
+            'docprops/thumbnail.jpeg', 'docprops/thumbnail.jpg', 'docprops/thumbnail.png',
+        )), None)
+        if thumbnail is None:
+            return None, pages
+        image = PILImage.open(BytesIO(archive.read(thumbnail)))
+        image.load()
+    if image.width > WIDTH:
+        image = image.resize((WIDTH, max(round(image.height * WIDTH / image.width), 1)), PILImage.LANCZOS)
+    return image, pages
+
+
+def render(field_file, extension):
+    """Render ``field_file``, an ``extension`` file, and store its thumbnail. Returns the preview metadata."""
+    extension = extension.lower()
+    with tempfile.NamedTemporaryFile(suffix=f".{extension}") as tmp:
+        with open_stream(field_file) as stream:
+            shutil.copyfileobj(stream, tmp, CHUNK_SIZE)
+        tmp.flush()
+        if extension == 'pdf':
+            image, pages = _render_pdf(tmp.name)
+        else:
+            image, pages = _render_pptx(tmp.name)
+
+    data = {'source': field_file.name, 'pages': pages}
+    if image is not None:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGB')
+        buffer = BytesIO()
+        image.save(buffer, format='WEBP', quality=QUALITY)
+        storage = field_file.storage
+        name = preview_name(field_file.name)
+        if storage.exists(name):
+            storage.delete(name)  # a failed or older render of the same bytes
+        data.update(
+            image=storage.save(name, ContentFile(buffer.getvalue())),
+            width=image.width, height=image.height,
+        )
+    return data
+
+
+def generate(name, force=False):
+    """Bring the preview of every resource using stored file ``name`` up to date."""
+    from .tree import schedule_refresh
+
+    resources = CourseResource.objects.filter(file=name)
+    resource = resources.first()
+    if resource is None or not supports(resource.file_extension):
+        return None
+    current = None if force else resources.filter(preview__source=name).values_list('preview', flat=True).first()
+    if current is None:
+        try:
+            current = render(resource.file, resource.file_extension)
+        except Exception as e:
+            logger.error(f"PREVIEWS: {name} failed: {e}", exc_info=True)
+            current = {'source': name, 'pages': None}
+
+    with transaction.atomic():
+        course_ids = list(resources.values_list('course_id', flat=True))
+        resources.update(preview=current)
+        schedule_refresh(course_ids=course_ids)  # the tree embeds preview_url
+    logger.info(f"PREVIEWS: {name}: {current.get('pages')} page(s), image={'image' in current}")
+    return current
+
+
+def schedule(name, extension):
+    if not supports(extension):
+        return
+
+    def _enqueue():
+        if settings.COURSE_FILES_ASYNC:
+            from .tasks import render_resource_preview
+            try:
+                render_resource_preview.delay(name)
+                return
+            except Exception as e:
+                logger.error(f"PREVIEWS: Could not enqueue {name}, rendering inline: {e}")
+        generate(name)
+
+    transaction.on_commit(_enqueue)
@@ -1,25 +1,42 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import AcademicYear, Semester, Course, CourseResource
+from .models import AcademicYear, Semester, Course, CourseResource, ResourceBundle
 
 
 class CourseResourceSerializer(serializers.ModelSerializer):
     """Serializer for individual course resources (files and links)."""
     download_url = serializers.SerializerMethodField()
+    is_external = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+    page_count = serializers.SerializerMethodField()
 
     class Meta:
         model = CourseResource
         fields = [
-            'id', 'title', 'resource_type', 'download_url',
-            'file_extension', 'file_size', 'download_count', 'created_at'
+            'id', 'title', 'resource_type', 'download_url', 'is_external',
+            'file_extension', 'file_size', 'preview_url', 'page_count',
+            'download_count', 'created_at'
         ]
 
     def get_download_url(self, obj):
-        if obj.file:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return obj.external_url
+        # The counting redirect (ResourceDownloadView), relative to this API;
+        # CourseListView makes it absolute per request.
+        return reverse('resource-download', args=[obj.pk])
+
+    def get_is_external(self, obj):
+        return not obj.file
+
+    def _preview(self, obj):
+        # Only while it describes the current file (courses/previews.py).
+        preview = obj.preview or {}
+        return preview if obj.file and preview.get('source') == obj.file.name else {}
+
+    def get_preview_url(self, obj):
+        image = self._preview(obj).get('image')
+        return obj.file.storage.url(image) if image else None
+
+    def get_page_count(self, obj):
+        return self._preview(obj).get('pages')
 
 
 class CourseSerializer(serializers.ModelSerializer):
@@ -34,7 +51,8 @@ class CourseSerializer(serializers.ModelSerializer):
         ]
 
     def get_resource_count(self, obj):
-        return obj.resources.count()
+        # len() over the prefetched set — .count() would issue a query per course.
+        return len(obj.resources.all())
 
 
 class SemesterSerializer(serializers.ModelSerializer):
@@ -51,3 +69,18 @@ class AcademicYearSerializer(serializers.ModelSerializer):
         model = AcademicYear
         fields = ['year', 'year_name', 'semesters']
 
+
+class ResourceBundleSerializer(serializers.ModelSerializer):
+    """Build status of a course/semester ZIP; download_url is set once ready."""
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ResourceBundle
+        fields = ['id', 'course', 'semester', 'status', 'member_count', 'file_size', 'download_url', 'created_at']
+
+    def get_download_url(self, obj):
+        if obj.status != ResourceBundle.READY:
+            return None
+        url = reverse('resource-bundle-download', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,54 @@
+"""
+Courses signal handlers.
+
+Keeps the materialized course tree (courses/tree.py) current: any write to a
+course, semester or resource re-renders the affected semester nodes once the
+transaction commits; academic year changes rebuild the whole document.
+
+Also keeps resource files content-addressed (courses/blobs.py) and their
+previews current (courses/previews.py).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import blobs, previews
+from .models import AcademicYear, Course, CourseResource, Semester
+from .tree import schedule_refresh
+
+
+@receiver(post_save, sender=AcademicYear)
+@receiver(post_delete, sender=AcademicYear)
+def refresh_tree_for_year(sender, instance, **kwargs):
+    schedule_refresh(full=True)
+
+
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def refresh_tree_for_semester(sender, instance, **kwargs):
+    schedule_refresh(semester_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def refresh_tree_for_course(sender, instance, **kwargs):
+    schedule_refresh(semester_ids=[instance.semester_id], course_ids=[instance.pk])
+
+
+@receiver(post_save, sender=CourseResource)
+@receiver(post_delete, sender=CourseResource)
+def refresh_tree_for_resource(sender, instance, **kwargs):
+    schedule_refresh(course_ids=[instance.course_id])
+
+
+@receiver(post_save, sender=CourseResource)
+def address_resource_file(sender, instance, **kwargs):
+    if instance.file and not instance.content_hash:
+        blobs.schedule(instance.file.name)  # previews follow once addressed
+    elif not previews.is_current(instance):
+        previews.schedule(instance.file.name, instance.file_extension)
+
+
+@receiver(post_delete, sender=CourseResource)
+def release_resource_file(sender, instance, **kwargs):
+    if instance.file:
+        blobs.release(instance.file.name)
@@ -0,0 +1,92 @@
+"""
+Courses Celery tasks.
+
+Scheduled tasks that run automatically via Celery Beat.
+"""
+
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    name='courses.flush_download_counters',
+    bind=True,
+    max_retries=0,       # Next beat tick retries; buffered counts stay in Redis until applied
+    ignore_result=True,
+)
+def flush_download_counters(self):
+    """
+    Apply buffered resource download counts (courses/counters.py) to the
+    database with a single bulk UPDATE.
+
+    Runs every DOWNLOAD_COUNTER_FLUSH_INTERVAL seconds via Celery Beat.
+    A failed flush leaves its batch in Redis and the next run applies it.
+    """
+    try:
+        from courses import counters
+
+        updated = counters.flush()
+        if updated:
+            logger.info('DOWNLOAD COUNTER: Flushed counts for %d resource(s).', updated)
+        return updated
+
+    except Exception as exc:
+        logger.error(
+            'DOWNLOAD COUNTER: Flush failed with an unexpected error: %s',
+            exc,
+            exc_info=True
+        )
+        return 0
+
+
+@shared_task(
+    name='courses.build_resource_bundle',
+    bind=True,
+    max_retries=0,       # A lost build is requeued by the next request for it
+    ignore_result=True,
+)
+def build_resource_bundle(self, bundle_id):
+    """Build a queued course/semester ZIP bundle (courses/bundles.py)."""
+    try:
+        from courses import bundles
+
+        return bundles.build(bundle_id)
+    except Exception as exc:
+        logger.error('BUNDLES: Bundle %s failed: %s', bundle_id, exc, exc_info=True)
+        return None
+
+
+@shared_task(
+    name='courses.address_resource_file',
+    bind=True,
+    max_retries=0,       # dedupe_course_files picks up anything missed
+    ignore_result=True,
+)
+def address_resource_file(self, name):
+    """Move a stored resource file to its content address (courses/blobs.py)."""
+    try:
+        from courses import blobs
+
+        return blobs.address(name)
+    except Exception as exc:
+        logger.error('BLOBS: Addressing %s failed: %s', name, exc, exc_info=True)
+        return None
+
+
+@shared_task(
+    name='courses.render_resource_preview',
+    bind=True,
+    max_retries=0,       # generate_previews picks up anything missed
+    ignore_result=True,
+)
+def render_resource_preview(self, name):
+    """Render the first-page preview of a stored resource file (courses/previews.py)."""
+    try:
+        from courses import previews
+
+        return previews.generate(name)
+    except Exception as exc:
+        logger.error('PREVIEWS: Rendering %s failed: %s', name, exc, exc_info=True)
+        return None
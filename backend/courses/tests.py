@@ -1,3 +1,588 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from PIL import Image
+
+from . import blobs, bundles, counters, previews, tree, uploads
+from .models import AcademicYear, Course, CourseResource, FileBlob, ResourceBundle, Semester
+
+try:
+    from moto import mock_aws
+except ImportError:  # test-only dependency, see requirements-dev.txt
+    mock_aws = None
+
+
+class CourseTreeTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)  # don't leak throttle history into other suites
+        self.url = reverse('course-years-list')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.year = AcademicYear.objects.create(year=1, year_name="Freshman")
+            self.semester = Semester.objects.create(academic_year=self.year, semester_number=1)
+            self.course = Course.objects.create(semester=self.semester, name="Calculus", code="MATH 151")
+            CourseResource.objects.create(
+                course=self.course, title="Past Questions", resource_type='past_questions',
+                external_url="https://example.com/pq.pdf",
+            )
+
+    def test_tree_is_served_without_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        course = response.json()[0]['semesters'][0]['courses'][0]
+        self.assertEqual(course['resource_count'], 1)
+        self.assertEqual(course['resources'][0]['title'], "Past Questions")
+
+    def test_tree_matches_full_rebuild_after_incremental_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            second = Semester.objects.create(academic_year=self.year, semester_number=2)
+            Course.objects.create(semester=second, name="Electronics", code="EE 152")
+            self.course.name = "Calculus I"
+            self.course.save()
+
+        _, incremental = tree.get_tree()
+        _, rebuilt = tree.rebuild()
+        self.assertEqual(incremental, rebuilt)
+
+        semesters = self.client.get(self.url).json()[0]['semesters']
+        self.assertEqual([s['semester_number'] for s in semesters], [1, 2])
+        self.assertEqual(semesters[0]['courses'][0]['name'], "Calculus I")
+
+    def test_deleting_a_course_removes_it(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.delete()
+        semesters = self.client.get(self.url).json()[0]['semesters']
+        self.assertEqual(semesters[0]['courses'], [])
+
+    def test_inactive_year_is_hidden(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.year.is_active = False
+            self.year.save()
+        self.assertEqual(self.client.get(self.url).json(), [])
+
+    def test_etag_follows_tree(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(semester=self.semester, name="Physics")
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_200_OK,
+        )
+
+
+@override_settings(DOWNLOAD_COUNTER_BACKEND='memory', DOWNLOAD_COUNTER_FLUSH_INTERVAL=3600)
+class DownloadCounterTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)  # don't leak throttle history into other suites
+        counters._memory_counts.clear()
+        year = AcademicYear.objects.create(year=2)
+        semester = Semester.objects.create(academic_year=year, semester_number=1)
+        course = Course.objects.create(semester=semester, name="Circuit Theory")
+        self.resource = CourseResource.objects.create(
+            course=course, title="Slides", external_url="https://example.com/slides",
+        )
+        self.url = reverse('resource-track-download', args=[self.resource.pk])
+
+    def test_clicks_are_buffered_without_queries(self):
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                self.assertEqual(self.client.post(self.url).status_code, status.HTTP_204_NO_CONTENT)
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.download_count, 0)
+
+    def test_flush_applies_aggregated_counts(self):
+        for _ in range(5):
+            self.client.post(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(counters.flush(), 1)
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.download_count, 5)
+        # The tree picks up the new count.
+        course = self.client.get(reverse('course-years-list')).json()[0]['semesters'][0]['courses'][0]
+        self.assertEqual(course['resources'][0]['download_count'], 5)
+        # Nothing is applied twice.
+        self.assertEqual(counters.flush(), 0)
+
+    def test_failed_flush_keeps_counts(self):
+        counters.increment(self.resource.pk, 4)
+        with mock.patch.object(counters, 'apply_counts', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                counters.flush()
+        counters.flush()
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.download_count, 4)
+
+
+@override_settings(DOWNLOAD_COUNTER_BACKEND='memory', DOWNLOAD_COUNTER_FLUSH_INTERVAL=3600)
+class ResourceDownloadTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        counters._memory_counts.clear()
+        year = AcademicYear.objects.create(year=4)
+        semester = Semester.objects.create(academic_year=year, semester_number=1)
+        self.course = Course.objects.create(semester=semester, name="Control Systems")
+        self.resource = CourseResource.objects.create(
+            course=self.course, title="Slides", file='courses/2026/control.pdf', file_size=100,
+        )
+        self.url = reverse('resource-download', args=[self.resource.pk])
+
+    def test_download_counts_and_redirects_to_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(response['Location'], '/media/courses/2026/control.pdf')
+        counters.flush()
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.download_count, 1)
+
+    @override_settings(COURSE_DOWNLOAD_ACCEL_PREFIX='/protected-media/')
+    def test_local_files_can_be_handed_to_nginx(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/courses/2026/control.pdf')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="control.pdf"')
+
+    def test_links_and_hidden_resources(self):
+        link = CourseResource.objects.create(course=self.course, title="Drive", external_url="https://example.com/a.pdf")
+        response = self.client.get(reverse('resource-download', args=[link.pk]))
+        self.assertEqual(response['Location'], "https://example.com/a.pdf")
+
+        CourseResource.objects.filter(pk=self.resource.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tree_links_to_download_endpoint(self):
+        tree.rebuild()
+        resource = self.client.get(reverse('course-years-list')).json()[0]['semesters'][0]['courses'][0]['resources'][0]
+        self.assertEqual(resource['download_url'], 'http://testserver' + self.url)
+        self.assertFalse(resource['is_external'])
+
+
+@override_settings(COURSE_FILES_ASYNC=False)
+class ResourceBundleTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        self.media = override_settings(MEDIA_ROOT=media)
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+        year = AcademicYear.objects.create(year=1)
+        self.semester = Semester.objects.create(academic_year=year, semester_number=2)
+        self.course = Course.objects.create(semester=self.semester, name="Thermodynamics", code="ME 162")
+        self.other = Course.objects.create(semester=self.semester, name="Statics", code="ME 164")
+        self.slides = self._resource(self.course, 'week1.pdf', b'slides')
+        self._resource(self.course, 'exam.pdf', b'exam')
+        self._resource(self.other, 'statics.pdf', b'statics')
+        CourseResource.objects.create(course=self.course, title="Link", external_url="https://example.com/x")
+
+    def _resource(self, course, name, data):
+        resource = CourseResource(course=course, title=name)
+        resource.file.save(name, ContentFile(data), save=False)
+        resource.save()
+        return resource
+
+    def _request(self, **scope):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('resource-bundle'), scope, format='json')
+        return response
+
+    def _archive(self, bundle_id):
+        bundle = self.client.get(reverse('resource-bundle-detail', args=[bundle_id])).json()
+        self.assertEqual(bundle['status'], 'ready')
+        location = self.client.get(bundle['download_url'])['Location']
+        with open(self.media.options['MEDIA_ROOT'] + location[len('/media'):], 'rb') as f:
+            archive = zipfile.ZipFile(io.BytesIO(f.read()))
+        return {name: archive.read(name) for name in archive.namelist()}
+
+    def test_course_bundle_is_built_then_reused(self):
+        response = self._request(course=self.course.pk)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(self._archive(response.json()['id']), {'week1.pdf': b'slides', 'exam.pdf': b'exam'})
+
+        again = self._request(course=self.course.pk)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.json()['id'], response.json()['id'])
+
+    def test_semester_bundle_groups_files_by_course(self):
+        response = self._request(semester=self.semester.pk)
+        self.assertEqual(sorted(self._archive(response.json()['id'])), [
+            'ME 162 Thermodynamics/exam.pdf', 'ME 162 Thermodynamics/week1.pdf', 'ME 164 Statics/statics.pdf',
+        ])
+
+    def test_changed_resources_replace_the_bundle(self):
+        first = self._request(course=self.course.pk).json()['id']
+        self.slides.title = "Week 1 (updated)"
+        self.slides.save()
+
+        second = self._request(course=self.course.pk).json()['id']
+        self.assertNotEqual(first, second)
+        self.assertEqual(list(ResourceBundle.objects.values_list('id', flat=True)), [second])
+
+    def test_hidden_years_are_not_bundled(self):
+        built = self._request(course=self.course.pk).json()['id']
+        self.semester.academic_year.is_active = False
+        self.semester.academic_year.save()
+        self.assertEqual(self._request(course=self.course.pk).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self._request(semester=self.semester.pk).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse('resource-bundle-download', args=[built])).status_code, 404)
+
+    def test_semester_bundle_is_named_by_year_number(self):
+        year = AcademicYear.objects.create(year=4)
+        semester = Semester.objects.create(academic_year=year, semester_number=1)
+        self._resource(Course.objects.create(semester=semester, name="Capstone"), 'brief.pdf', b'brief')
+        self._request(semester=semester.pk)
+        self.assertIn('year-4-semester-1', ResourceBundle.objects.get(semester=semester).file.name)
+
+    def test_nothing_to_bundle(self):
+        empty = Course.objects.create(semester=self.semester, name="Links only")
+        self.assertEqual(self._request(course=empty.pk).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self._request().status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(COURSE_FILES_ASYNC=False)
+class ContentAddressedFileTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        year = AcademicYear.objects.create(year=2)
+        semester = Semester.objects.create(academic_year=year, semester_number=2)
+        self.course = Course.objects.create(semester=semester, name="Circuits", code="EE 152")
+        self.storage = CourseResource._meta.get_field('file').storage
+
+    def _stored(self):
+        return sorted(
+            f"{root[len(self.media_root) + 1:]}/{name}"
+            for root, _, names in os.walk(self.media_root) for name in names
+        )
+
+    def test_identical_uploads_are_stored_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = CourseResource.objects.create(
+                course=self.course, title="2024 Exam", file=SimpleUploadedFile('exam.pdf', b'%PDF exam'),
+            )
+        with self.captureOnCommitCallbacks(execute=True), mock.patch.object(self.storage, 'save') as save:
+            second = CourseResource.objects.create(
+                course=self.course, title="Final 2024", file=SimpleUploadedFile('FINAL.TXT', b'%PDF exam'),
+            )
+        save.assert_not_called()
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(first.file.name, f"courses/blobs/{first.content_hash[:2]}/{first.content_hash}")
+        self.assertEqual((first.file_extension, second.file_extension), ('pdf', 'txt'))
+        self.assertEqual(self._stored(), [first.file.name])
+        second.full_clean()  # the stored name has no extension to validate
+
+        with override_settings(COURSE_DOWNLOAD_ACCEL_PREFIX='/protected-media/'):
+            response = self.client.get(reverse('resource-download', args=[second.pk]))
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + first.file.name)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Final 2024.txt"')
+
+        # The blob stays until its last reference goes.
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(len(self._stored()), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertEqual(self._stored(), [])
+
+    def test_release_rechecks_references_under_the_blob_lock(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = CourseResource.objects.create(
+                course=self.course, title="2024 Exam", file=SimpleUploadedFile('exam.pdf', b'%PDF exam'),
+            )
+        name = first.file.name
+        with self.captureOnCommitCallbacks() as callbacks:
+            first.delete()
+        # Uploaded again before the release runs: the upload finds the blob
+        # still stored, so the release must now keep it.
+        with self.captureOnCommitCallbacks(execute=True):
+            second = CourseResource.objects.create(
+                course=self.course, title="2024 Exam", file=SimpleUploadedFile('exam.pdf', b'%PDF exam'),
+            )
+        for callback in callbacks:
+            callback()
+        self.assertEqual(second.file.name, name)
+        self.assertEqual(self._stored(), [name])
+        self.assertTrue(FileBlob.objects.filter(digest=second.content_hash).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertEqual(self._stored(), [])
+        self.assertFalse(FileBlob.objects.exists())
+
+    def test_replacing_the_file_readdresses_it_and_releases_the_old_blob(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resource = CourseResource.objects.create(
+                course=self.course, title="2024 Exam", file=SimpleUploadedFile('a.pdf', b'%PDF first'),
+            )
+        old = resource.file.name
+
+        # As the direct-upload form does: point it at a key already in storage.
+        uploaded = self.storage.save('courses/2026/0123456789abcdef0123456789abcdef/b.pdf', ContentFile(b'%PDF second'))
+        resource = CourseResource.objects.get(pk=resource.pk)
+        resource.file = uploaded
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.save()
+
+        resource.refresh_from_db()
+        self.assertTrue(blobs.is_blob(resource.file.name))
+        self.assertEqual(resource.content_hash, hashlib.sha256(b'%PDF second').hexdigest())
+        self.assertEqual(self._stored(), [resource.file.name])
+        self.assertFalse(self.storage.exists(old))
+
+    def test_dedupe_command_moves_existing_files(self):
+        digest = hashlib.sha256(b'same bytes').hexdigest()
+        for name in ('a.pdf', 'b.pdf', 'c.pdf', f'courses/blobs/{digest[:2]}/{digest}.pdf'):
+            resource = CourseResource(course=self.course, title=name, file_extension='pdf')
+            resource.file.save(name, ContentFile(b'other' if name == 'c.pdf' else b'same bytes'), save=False)
+            CourseResource.objects.bulk_create([resource])  # as before content addressing, or with the extension
+
+        output = io.StringIO()
+        call_command('dedupe_course_files', '--workers', '1', stdout=output)
+        self.assertIn('Moved 4 file(s), removed 2 duplicate(s), 0 failed; reclaimed 0.0 MB (20 bytes)', output.getvalue())
+
+        names = dict(CourseResource.objects.values_list('title', 'file'))
+        self.assertEqual(len(set(names.values())), 2)
+        self.assertEqual(names['a.pdf'], blobs.blob_name(digest))
+        self.assertEqual(self._stored(), sorted({names['a.pdf'], names['c.pdf']}))
+        self.assertFalse(CourseResource.objects.filter(content_hash='').exists())
+        self.assertEqual(blobs.download_name("Week 1: Intro", names['c.pdf'], 'pdf'), 'Week 1- Intro.pdf')
+
+
+def _pdf(pages=3):
+    buffer = io.BytesIO()
+    images = [Image.new('RGB', (800, 1000), (255, 255, 255)) for _ in range(pages)]
+    images[0].save(buffer, format='PDF', save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+
+def _pptx(slides=2):
+    thumbnail = io.BytesIO()
+    Image.new('RGB', (256, 192), (200, 30, 30)).save(thumbnail, format='JPEG')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('docProps/thumbnail.jpeg', thumbnail.getvalue())
+        for n in range(1, slides + 1):
+            archive.writestr(f'ppt/slides/slide{n}.xml', '<p:sld/>')
+    return buffer.getvalue()
+
+
+@override_settings(COURSE_FILES_ASYNC=False)
+class ResourcePreviewTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        year = AcademicYear.objects.create(year=3)
+        semester = Semester.objects.create(academic_year=year, semester_number=1)
+        self.course = Course.objects.create(semester=semester, name="Digital Logic", code="CE 252")
+        self.storage = CourseResource._meta.get_field('file').storage
+
+    def _upload(self, name, data, title="Slides"):
+        with self.captureOnCommitCallbacks(execute=True):
+            resource = CourseResource.objects.create(
+                course=self.course, title=title, file=SimpleUploadedFile(name, data),
+            )
+        resource.refresh_from_db()
+        return resource
+
+    def test_pdf_preview_in_course_tree(self):
+        resource = self._upload('deck.pdf', _pdf(pages=3))
+        self.assertEqual(resource.preview['pages'], 3)
+        self.assertEqual(resource.preview['image'], previews.preview_name(resource.file.name))
+        self.assertEqual((resource.preview['width'], resource.preview['height']), (320, 400))
+
+        served = self.client.get(reverse('course-years-list')).json()[0]['semesters'][0]['courses'][0]['resources'][0]
+        self.assertEqual(served['page_count'], 3)
+        self.assertEqual(served['preview_url'], f"http://testserver/media/{resource.preview['image']}")
+
+    def test_pptx_uses_embedded_thumbnail(self):
+        resource = self._upload('lecture.pptx', _pptx(slides=2))
+        self.assertEqual(resource.preview['pages'], 2)
+        self.assertEqual(resource.preview['width'], 256)
+
+    def test_identical_files_share_one_preview(self):
+        data = _pdf()  # once: Pillow stamps the creation time into each PDF
+        first = self._upload('deck.pdf', data)
+        with mock.patch.object(previews, 'render') as render:
+            second = self._upload('copy.pdf', data, title="Copy")
+        render.assert_not_called()
+        self.assertEqual(second.preview, first.preview)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+            second.delete()
+        self.assertFalse(self.storage.exists(first.preview['image']))
+
+    def test_backfill_command(self):
+        resource = self._upload('deck.pdf', _pdf(pages=1))
+        CourseResource.objects.filter(pk=resource.pk).update(preview={})
+
+        output = io.StringIO()
+        call_command('generate_previews', '--workers', '1', stdout=output)
+        self.assertIn('Rendered 1 preview(s)', output.getvalue())
+        resource.refresh_from_db()
+        self.assertEqual(resource.preview['pages'], 1)
+
+
+BUCKET = 'aces-test'
+
+
+@skipUnless(mock_aws, "moto is not installed (pip install -r requirements-dev.txt)")
+@override_settings(STORAGES={
+    'default': {
+        'BACKEND': 'storages.backends.s3boto3.S3Boto3Storage',
+        'OPTIONS': {
+            'bucket_name': BUCKET, 'access_key': 'test', 'secret_key': 'test', 'region_name': 'us-east-1',
+            'file_overwrite': False, 'querystring_auth': False, 'signature_version': 's3v4',
+        },
+    },
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class DirectUploadTests(TestCase):
+    """Presigned uploads against moto's in-process S3."""
+
+    def setUp(self):
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        import boto3
+        import requests
+        self.s3 = boto3.client('s3', region_name='us-east-1', aws_access_key_id='test', aws_secret_access_key='test')
+        self.s3.create_bucket(Bucket=BUCKET)
+        self.put = requests.put
+
+        year = AcademicYear.objects.create(year=3)
+        semester = Semester.objects.create(academic_year=year, semester_number=1)
+        self.course = Course.objects.create(semester=semester, name="Signals", code="EE 351")
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', username='admin', password='pw')
+        self.client.force_login(admin)
+
+    def _post(self, name, payload):
+        return self.client.post(reverse(name), json.dumps(payload), content_type='application/json')
+
+    def _upload(self, filename, data, declared_size=None):
+        plan = self._post('admin:courses-direct-upload-begin', {
+            'filename': filename, 'size': declared_size or len(data), 'content_type': 'application/pdf',
+        }).json()
+        parts = []
+        if 'upload_id' in plan:
+            for part in plan['parts']:
+                start = (part['number'] - 1) * plan['part_size']
+                response = self.put(part['url'], data=data[start:start + plan['part_size']])
+                parts.append({'number': part['number'], 'etag': response.headers['ETag']})
+        else:
+            self.assertEqual(self.put(plan['url'], data=data, headers=plan['headers']).status_code, 200)
+        return plan, self._post('admin:courses-direct-upload-complete', {
+            'key': plan['key'], 'upload_id': plan.get('upload_id', ''), 'parts': parts,
+        })
+
+    def test_uploaded_file_is_attached_with_head_metadata(self):
+        self.assertContains(self.client.get(reverse('admin:courses_course_add')), 'data-direct-upload')
+        plan, response = self._upload('Week 1 Slides.pdf', b'%PDF-1.4 slides')
+        self.assertEqual(response.status_code, 200)
+
+        with mock.patch('storages.backends.s3boto3.S3Boto3Storage.size') as size:
+            response = self.client.post(reverse('admin:courses_courseresource_add'), {
+                'course': self.course.pk, 'title': "Week 1", 'resource_type': 'slides',
+                'direct_upload': response.json()['token'], 'is_active': 'on', 'sort_order': 0,
+                'download_count': 0,
+            })
+        self.assertEqual(response.status_code, 302)
+        size.assert_not_called()
+        resource = CourseResource.objects.get()
+        self.assertEqual(resource.file.name, plan['key'])
+        self.assertEqual((resource.file_size, resource.file_extension), (15, 'pdf'))
+
+    def test_large_files_use_multipart(self):
+        data = b'x' * (5 * 1024 * 1024 + 10)
+        with mock.patch.object(uploads, 'PART_SIZE', 5 * 1024 * 1024):
+            plan, response = self._upload('lab.zip', data)
+        self.assertEqual(len(plan['parts']), 2)
+        self.assertEqual(uploads.read_token(response.json()['token'])['size'], len(data))
+
+    def test_oversized_upload_is_rejected_and_deleted(self):
+        self.assertEqual(self._post('admin:courses-direct-upload-begin', {
+            'filename': 'huge.zip', 'size': 200 * 1024 * 1024,
+        }).status_code, 400)
+
+        # The declared size passes; the HEAD after upload catches the real one.
+        with mock.patch('courses.validators.MAX_FILE_SIZE', 10):
+            plan, response = self._upload('notes.pdf', b'more than ten bytes', declared_size=5)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.s3.list_objects_v2(Bucket=BUCKET).get('KeyCount'), 0)
+
+    def test_rejects_unknown_types_and_keys(self):
+        self.assertEqual(self._post('admin:courses-direct-upload-begin', {
+            'filename': 'run.exe', 'size': 10,
+        }).status_code, 400)
+        self.assertEqual(self._post('admin:courses-direct-upload-complete', {
+            'key': 'shop/products/other.png',
+        }).status_code, 400)
+
+    def test_download_redirects_to_signed_url(self):
+        resource = CourseResource.objects.create(
+            course=self.course, title="Slides", file='courses/2026/abc/slides.pdf', file_size=10,
+        )
+        response = self.client.get(reverse('resource-download', args=[resource.pk]))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('X-Amz-Signature=', response['Location'])
+        self.assertIn('response-content-disposition=attachment', response['Location'])
+
+    def test_bundle_is_streamed_into_a_multipart_upload(self):
+        for name in ('a.pdf', 'b.pdf'):
+            self.s3.put_object(Bucket=BUCKET, Key=f'courses/2026/{name}', Body=name.encode() * 1_200_000)
+            CourseResource.objects.create(course=self.course, title=name, file=f'courses/2026/{name}', file_size=6_000_000)
+
+        # 12 MB archive in 5 MB parts (the S3 minimum)
+        with override_settings(COURSE_FILES_ASYNC=False), mock.patch.object(bundles, 'PART_SIZE', 5 * 1024 * 1024), \
+                self.captureOnCommitCallbacks(execute=True):
+            bundle = bundles.request(course=self.course)
+        bundle.refresh_from_db()
+        self.assertEqual(bundle.status, ResourceBundle.READY)
+        body = self.s3.get_object(Bucket=BUCKET, Key=bundle.file.name)['Body'].read()
+        self.assertEqual(len(body), bundle.file_size)
+        self.assertEqual(zipfile.ZipFile(io.BytesIO(body)).read('b.pdf'), b'b.pdf' * 1_200_000)
+
+        response = self.client.get(reverse('resource-bundle-download', args=[bundle.pk]))
+        self.assertIn('X-Amz-Signature=', response['Location'])
@@ -0,0 +1,166 @@
+"""
+Materialized course tree for CourseListView.
+
+The whole AcademicYear → Semester → Course → CourseResource hierarchy is
+rendered once into a JSON document, stored in the CourseTreeSnapshot row and
+cached as raw bytes, so a request for /api/courses/years/ is a single cache
+lookup with no serialization.
+
+The document is maintained incrementally: changes to a course, semester or
+resource (see courses/signals.py) re-render only the affected semester nodes
+and splice them into the stored document. Academic year changes, which are
+rare, trigger a full rebuild.
+"""
+import hashlib
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch
+
+from .models import AcademicYear, Course, CourseTreeSnapshot, Semester
+from .serializers import AcademicYearSerializer, SemesterSerializer
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'courses:tree'
+
+
+def _semester_queryset():
+    return Semester.objects.prefetch_related('courses', 'courses__resources')
+
+
+def _render(tree):
+    body = json.dumps(tree, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+    return body, hashlib.md5(body).hexdigest()
+
+
+def _store(snapshot, tree):
+    body, etag = _render(tree)
+    snapshot.payload = body.decode('utf-8')
+    snapshot.etag = etag
+    snapshot.save()
+    cache.set(CACHE_KEY, (etag, body), timeout=settings.COURSE_TREE_CACHE_TIMEOUT)
+    return etag, body
+
+
+def build_tree():
+    """Render the full tree from the database (four queries)."""
+    years = AcademicYear.objects.filter(is_active=True).prefetch_related(
+        Prefetch('semesters', queryset=_semester_queryset()),
+    )
+    return json.loads(json.dumps(AcademicYearSerializer(years, many=True).data, cls=DjangoJSONEncoder))
+
+
+def rebuild():
+    """Rebuild and store the whole document."""
+    with transaction.atomic():
+        snapshot, _ = CourseTreeSnapshot.objects.select_for_update().get_or_create(pk=1)
+        result = _store(snapshot, build_tree())
+    logger.info('COURSE TREE: full rebuild complete')
+    return result
+
+
+def refresh(semester_ids=(), course_ids=()):
+    """
+    Re-render the given semesters, plus any semester that holds (or held)
+    one of the given courses, and splice them into the stored document.
+    """
+    semester_ids = set(semester_ids)
+    course_ids = set(course_ids)
+
+    with transaction.atomic():
+        snapshot = CourseTreeSnapshot.objects.select_for_update().filter(pk=1).first()
+        if snapshot is None:
+            return rebuild()
+
+        tree = json.loads(snapshot.payload)
+
+        # Semesters a course currently belongs to, and those it was in when the
+        # document was last rendered (covers courses moved between semesters).
+        if course_ids:
+            semester_ids.update(
+                Course.objects.filter(id__in=course_ids).values_list('semester_id', flat=True)
+            )
+            for year in tree:
+                for semester in year['semesters']:
+                    if any(course['id'] in course_ids for course in semester['courses']):
+                        semester_ids.add(semester['id'])
+
+        if not semester_ids:
+            return snapshot.etag, snapshot.payload.encode('utf-8')
+
+        years = {year['year']: year for year in tree}
+        for year in tree:
+            year['semesters'] = [s for s in year['semesters'] if s['id'] not in semester_ids]
+
+        for semester in _semester_queryset().filter(id__in=semester_ids, academic_year__is_active=True):
+            year = years.get(semester.academic_year_id)
+            if year is None:
+                continue
+            year['semesters'].append(
+                json.loads(json.dumps(SemesterSerializer(semester).data, cls=DjangoJSONEncoder))
+            )
+            year['semesters'].sort(key=lambda s: (s['semester_number'], s['id']))
+
+        return _store(snapshot, tree)
+
+
+def get_tree():
+    """Return ``(etag, body_bytes)`` for the current tree."""
+    cached = cache.get(CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    snapshot = CourseTreeSnapshot.objects.filter(pk=1).first()
+    if snapshot is None:
+        return rebuild()
+
+    result = (snapshot.etag, snapshot.payload.encode('utf-8'))
+    cache.set(CACHE_KEY, result, timeout=settings.COURSE_TREE_CACHE_TIMEOUT)
+    return result
+
+
+# -----------------------------------------------------------------------------
+# Deferred refreshes
+# A cascade delete or an admin inline save can fire dozens of signals in one
+# transaction; work is accumulated per thread and applied once on commit.
+# -----------------------------------------------------------------------------
+
+_pending = threading.local()
+
+
+def _pending_work():
+    if not hasattr(_pending, 'work'):
+        _pending.work = {'full': False, 'semesters': set(), 'courses': set()}
+    return _pending.work
+
+
+def _apply_pending():
+    work = _pending_work()
+    full, semesters, courses = work['full'], set(work['semesters']), set(work['courses'])
+    work['full'] = False
+    work['semesters'].clear()
+    work['courses'].clear()
+
+    try:
+        if full:
+            rebuild()
+        elif semesters or courses:
+            refresh(semester_ids=semesters, course_ids=courses)
+    except Exception as e:
+        # Never break the write that triggered the refresh; the next change
+        # (or `manage.py rebuild_course_tree`) repairs the document.
+        logger.error(f"COURSE TREE: refresh failed: {e}", exc_info=True)
+
+
+def schedule_refresh(semester_ids=(), course_ids=(), full=False):
+    work = _pending_work()
+    work['full'] = work['full'] or full
+    work['semesters'].update(semester_ids)
+    work['courses'].update(course_ids)
+    transaction.on_commit(_apply_pending)
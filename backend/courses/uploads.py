@@ -0,0 +1,146 @@
+"""
+Direct-to-storage uploads for course resource files.
+
+Large lecture files go from the admin's browser straight to the bucket
+instead of streaming through a gunicorn worker and then on to R2:
+
+1. begin() validates the file name and size and returns a presigned PUT URL,
+   or, above PART_SIZE, a multipart upload id with one presigned URL per part.
+2. The browser uploads the bytes (admin/js/direct_upload.js).
+3. complete() finishes a multipart upload, HEADs the object for its real
+   size, deletes it if it breaks the resource limits, and returns a signed
+   token carrying the key, size and extension.
+4. Saving the admin form with that token (CourseResourceAdminForm) points
+   CourseResource.file at the key and records file_size / file_extension
+   from the HEAD, so Django never reads the file.
+
+Presigned PUT is used rather than a POST policy because R2 does not
+implement POST Object. The bucket's CORS rules must allow PUT from the admin
+origin and expose the ETag header (needed to complete multipart uploads).
+Needs S3-compatible storage (USE_CLOUD_STORAGE); with local storage the
+admin keeps the ordinary file input.
+"""
+import math
+import posixpath
+import re
+import uuid
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from . import validators
+from .models import CourseResource
+
+PART_SIZE = 16 * 1024 * 1024      # multipart above this; S3 parts must be >= 5 MB
+URL_EXPIRY = 60 * 60              # seconds a presigned URL stays valid
+TOKEN_MAX_AGE = 24 * 60 * 60      # seconds a completed upload can wait for the form save
+TOKEN_SALT = 'courses.uploads'
+
+_KEY = re.compile(r'^courses/\d{4}/[0-9a-f]{32}/[^/]+$')
+
+
+class DirectUploadError(Exception):
+    """A direct upload was refused; the message is shown to the admin."""
+
+
+def _storage():
+    return CourseResource._meta.get_field('file').storage
+
+
+def is_available():
+    return hasattr(_storage(), 'bucket_name')
+
+
+def _client():
+    if not is_available():
+        raise DirectUploadError("Direct uploads need S3-compatible storage (USE_CLOUD_STORAGE).")
+    storage = _storage()
+    return storage.connection.meta.client, storage.bucket_name
+
+
+def _presign(client, operation, **params):
+    return client.generate_presigned_url(operation, Params=params, ExpiresIn=URL_EXPIRY)
+
+
+def begin(filename, size, content_type=''):
+    """Start an upload of ``size`` bytes and return the plan for the browser."""
+    try:
+        validators.validate_extension(filename)
+        validators.validate_size(size)
+    except ValidationError as e:
+        raise DirectUploadError(e.messages[0])
+    if size <= 0:
+        raise DirectUploadError("The file is empty.")
+
+    client, bucket = _client()
+    name = get_valid_filename(posixpath.basename(filename.replace('\\', '/')))
+    key = f"courses/{timezone.now():%Y}/{uuid.uuid4().hex}/{name}"
+    content_type = content_type or 'application/octet-stream'
+
+    try:
+        if size <= PART_SIZE:
+            return {
+                'key': key,
+                'url': _presign(client, 'put_object', Bucket=bucket, Key=key, ContentType=content_type),
+                'headers': {'Content-Type': content_type},
+            }
+        upload_id = client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)['UploadId']
+        return {
+            'key': key,
+            'upload_id': upload_id,
+            'part_size': PART_SIZE,
+            'parts': [
+                {'number': number, 'url': _presign(
+                    client, 'upload_part', Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number,
+                )}
+                for number in range(1, math.ceil(size / PART_SIZE) + 1)
+            ],
+        }
+    except (BotoCoreError, ClientError) as e:
+        raise DirectUploadError(f"Could not start the upload: {e}")
+
+
+def complete(key, upload_id='', parts=()):
+    """
+    Finish the upload of ``key`` and check what actually arrived.
+    ``parts`` are ``{'number': n, 'etag': '...'}`` for multipart uploads.
+    Returns the token to submit with the admin form.
+    """
+    if not _KEY.match(key or ''):
+        raise DirectUploadError("Unknown upload.")
+    client, bucket = _client()
+    try:
+        if upload_id:
+            client.complete_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={'Parts': [
+                    {'PartNumber': int(part['number']), 'ETag': part['etag']}
+                    for part in sorted(parts, key=lambda part: int(part['number']))
+                ]},
+            )
+        size = client.head_object(Bucket=bucket, Key=key)['ContentLength']
+    except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as e:
+        raise DirectUploadError(f"The upload could not be completed: {e}")
+
+    try:
+        validators.validate_size(size)
+    except ValidationError as e:
+        client.delete_object(Bucket=bucket, Key=key)
+        raise DirectUploadError(e.messages[0])
+
+    return signing.dumps({
+        'key': key,
+        'size': size,
+        'extension': key.rsplit('.', 1)[-1].lower() if '.' in posixpath.basename(key) else '',
+    }, salt=TOKEN_SALT)
+
+
+def read_token(token):
+    """The ``{'key', 'size', 'extension'}`` of a completed upload."""
+    try:
+        return signing.loads(token, salt=TOKEN_SALT, max_age=TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        raise DirectUploadError("The upload has expired; please upload the file again.")
@@ -3,6 +3,10 @@ from . import views
 
 urlpatterns = [
     path('years/', views.CourseListView.as_view(), name='course-years-list'),
+    path('resources/<int:pk>/download/', views.ResourceDownloadView.as_view(), name='resource-download'),
     path('resources/<int:pk>/track/', views.TrackDownloadView.as_view(), name='resource-track-download'),
+    path('bundles/', views.ResourceBundleView.as_view(), name='resource-bundle'),
+    path('bundles/<int:pk>/', views.ResourceBundleDetailView.as_view(), name='resource-bundle-detail'),
+    path('bundles/<int:pk>/download/', views.ResourceBundleDownloadView.as_view(), name='resource-bundle-download'),
 ]
 
@@ -22,17 +22,33 @@ def validate_resource_file(file):
     Validate uploaded course resource files.
     - Only allows known safe file extensions (no executables, scripts, etc.)
     - Enforces a 100MB max file size.
+
+    Files already in storage were size-checked when uploaded (direct uploads
+    by courses/uploads.py), so they are not fetched again to re-check.
+    Content-addressed files (courses/blobs.py) are named without an
+    extension; theirs was checked before they were stored.
     """
-    ext = os.path.splitext(file.name)[1].lower().lstrip('.')
+    from .blobs import is_blob
+
+    committed = getattr(file, '_committed', False)
+    if not (committed and is_blob(file.name)):
+        validate_extension(file.name)
+    if not committed:
+        validate_size(file.size)
 
+
+def validate_extension(name):
+    ext = os.path.splitext(name)[1].lower().lstrip('.')
     if ext not in ALLOWED_EXTENSIONS:
         raise ValidationError(
             f"Unsupported file type: .{ext}. "
             f"Allowed types: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
         )
 
-    if file.size > MAX_FILE_SIZE:
-        size_mb = file.size / (1024 * 1024)
+
+def validate_size(size):
+    if size > MAX_FILE_SIZE:
+        size_mb = size / (1024 * 1024)
         raise ValidationError(
             f"File too large: {size_mb:.1f}MB. Maximum allowed is 100MB."
         )
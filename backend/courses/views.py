@@ -1,29 +1,42 @@
+from django.db.models import Q
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.throttling import AnonRateThrottle
-from django.db.models import F
-from .models import AcademicYear, CourseResource
-from .serializers import AcademicYearSerializer
+from . import bundles, counters, downloads, tree as course_tree
+from .models import Course, CourseResource, ResourceBundle, Semester
+from .serializers import ResourceBundleSerializer
+from core.conditional import ConditionalGetMixin
+from core.throttling import SlidingWindowAnonRateThrottle
 
 
-class CourseListView(generics.ListAPIView):
+class CourseListView(ConditionalGetMixin, generics.GenericAPIView):
     """
-    Returns hierarchical list of all active academic years, 
+    Returns hierarchical list of all active academic years,
     semesters, courses, and their resources.
+
+    The response body is the materialized document from courses/tree.py,
+    served as stored bytes — no queries or serialization per request.
     """
-    serializer_class = AcademicYearSerializer
     pagination_class = None  # Return all data at once to match valid JSON structure
-    
-    def get_queryset(self):
-        return AcademicYear.objects.filter(is_active=True).prefetch_related(
-            'semesters',
-            'semesters__courses',
-            'semesters__courses__resources',  # Prefetch resources to prevent N+1
-        )
+
+    def get_validator(self):
+        etag, _ = course_tree.get_tree()
+        return f'tree-{etag}', None
+
+    def get(self, request, *args, **kwargs):
+        _, body = course_tree.get_tree()
+        # download_url is stored as this API's relative download path, and
+        # preview_url is relative with local storage; make them absolute for
+        # this host as the serializer would with a request in context.
+        origin = request.build_absolute_uri('/').rstrip('/').encode('utf-8')
+        body = body.replace(b'"download_url":"/', b'"download_url":"' + origin + b'/')
+        body = body.replace(b'"preview_url":"/', b'"preview_url":"' + origin + b'/')
+        return HttpResponse(body, content_type='application/json')
 
 
-class DownloadRateThrottle(AnonRateThrottle):
+class DownloadRateThrottle(SlidingWindowAnonRateThrottle):
     """Limit downloads to 30 per minute per IP to prevent stat padding."""
     rate = '30/min'
 
@@ -33,13 +46,86 @@ class TrackDownloadView(APIView):
     Increment download counter for a course resource.
     Fire-and-forget — always returns 204 No Content.
     Rate limited to prevent abuse.
+
+    Kept for older clients; ResourceDownloadView counts downloads itself.
+
+    The click is buffered (courses/counters.py) and applied to the database
+    in bulk by a periodic task, so this view never locks the resource row.
     """
     throttle_classes = [DownloadRateThrottle]
 
     def post(self, request, pk):
-        CourseResource.objects.filter(pk=pk, is_active=True).update(
-            download_count=F('download_count') + 1
-        )
+        counters.increment(pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class ResourceDownloadView(APIView):
+    """
+    Count a download and redirect to the file (see courses/downloads.py).
+
+    The redirect is never throttled — only the counting is, with the same
+    limit as TrackDownloadView — so a busy lab on one IP can still download.
+    """
+    throttle_classes = []
+
+    def get(self, request, pk):
+        resource = CourseResource.objects.filter(pk=pk, is_active=True).values(
+            'file', 'external_url', 'title', 'file_extension',
+        ).first()
+        if resource is None or not (resource['file'] or resource['external_url']):
+            raise Http404
+        if DownloadRateThrottle().allow_request(request, self):
+            counters.increment(pk)
+        return downloads.respond(
+            resource['file'], resource['external_url'], resource['title'], resource['file_extension'],
+        )
+
+
+class ResourceBundleView(APIView):
+    """
+    POST {"course": id} or {"semester": id}: the ZIP bundle of its current
+    files (courses/bundles.py). 200 when ready to download, 202 while it is
+    being built — poll ResourceBundleDetailView until download_url is set.
+    """
+
+    def post(self, request):
+        course_id, semester_id = request.data.get('course'), request.data.get('semester')
+        if bool(course_id) == bool(semester_id):
+            return Response({'detail': 'Give either a course or a semester.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            if course_id:
+                # Only what the course tree shows: years hidden there stay hidden.
+                course = get_object_or_404(Course, pk=int(course_id), semester__academic_year__is_active=True)
+                bundle = bundles.request(course=course)
+            else:
+                semester = get_object_or_404(Semester, pk=int(semester_id), academic_year__is_active=True)
+                bundle = bundles.request(semester=semester)
+        except (TypeError, ValueError):
+            return Response({'detail': 'Invalid id.'}, status=status.HTTP_400_BAD_REQUEST)
+        if bundle is None:
+            return Response({'detail': 'No downloadable files.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            ResourceBundleSerializer(bundle, context={'request': request}).data,
+            status=status.HTTP_200_OK if bundle.status == ResourceBundle.READY else status.HTTP_202_ACCEPTED,
+        )
+
+
+def _visible_bundles():
+    return ResourceBundle.objects.filter(
+        Q(course__semester__academic_year__is_active=True) | Q(semester__academic_year__is_active=True)
+    )
+
+
+class ResourceBundleDetailView(generics.RetrieveAPIView):
+    """Build status of one bundle."""
+    queryset = _visible_bundles()
+    serializer_class = ResourceBundleSerializer
+
+
+class ResourceBundleDownloadView(APIView):
+    """Redirect to a ready bundle's archive, like ResourceDownloadView."""
+    throttle_classes = []
+
+    def get(self, request, pk):
+        bundle = get_object_or_404(_visible_bundles(), pk=pk, status=ResourceBundle.READY)
+        return downloads.file_response(bundle.file.name)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0007_event_location_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date', '-time', '-id'], name='event_keyset_idx'),
+        ),
+    ]
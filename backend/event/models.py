@@ -14,12 +14,17 @@ class Event(models.Model):
     location_url = models.URLField(max_length=500, blank=True, help_text="Google Maps link for the venue")
     
     image = models.ImageField(upload_to="events/", help_text="Event banner image")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-date', '-time']
+        indexes = [
+            # Keyset pagination of the events list (event/views.py)
+            models.Index(fields=['-date', '-time', '-id'], name='event_keyset_idx'),
+        ]
 
     def __str__(self):
         return self.name
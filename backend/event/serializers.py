@@ -1,9 +1,12 @@
 from rest_framework import serializers
+
+from core.renditions import RenditionsField
 from .models import Event
 
 class EventSerializer(serializers.ModelSerializer):
     status = serializers.ReadOnlyField()
+    image_renditions = RenditionsField('image')
 
     class Meta:
         model = Event
-        fields = ('id', 'name', 'slug', 'description', 'date', 'time', 'location', 'location_url', 'status', 'image', 'created_at')
+        fields = ('id', 'name', 'slug', 'description', 'date', 'time', 'location', 'location_url', 'status', 'image', 'image_renditions', 'created_at')
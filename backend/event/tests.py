@@ -1,3 +1,62 @@
-from django.test import TestCase
+from datetime import date, time
 
-# Create your tests here.
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from .models import Event
+
+
+class EventPaginationTests(APITestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        for day in range(1, 6):
+            # Two events per day at the same time: only the id breaks the tie.
+            for n in range(2):
+                Event.objects.create(
+                    name=f"Event {day}-{n}", date=date(2026, 3, day), time=time(10),
+                    location="Hall", image='events/x.jpg',
+                )
+
+    def _walk(self, url):
+        seen = []
+        while url:
+            body = self.client.get(url).json()
+            seen += [e['slug'] for e in body['results']]
+            url = body['next']
+        return seen
+
+    def test_pages_cover_every_event_once_in_order(self):
+        seen = self._walk(reverse('event:event-list') + '?page_size=3')
+        expected = list(Event.objects.order_by('-date', '-time', '-id').values_list('slug', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_new_event_does_not_shift_later_pages(self):
+        first = self.client.get(reverse('event:event-list') + '?page_size=4').json()
+        Event.objects.create(
+            name="Late addition", date=date(2026, 4, 1), time=time(9), location="Hall", image='events/x.jpg',
+        )
+        rest = self._walk(first['next'])
+        older = list(Event.objects.order_by('-date', '-time', '-id').values_list('slug', flat=True))[5:]
+        self.assertEqual(rest, older)
+
+    def test_new_event_on_the_cursor_date_does_not_shift_later_pages(self):
+        first = self.client.get(reverse('event:event-list') + '?page_size=3').json()
+        expected = list(Event.objects.order_by('-date', '-time', '-id').values_list('slug', flat=True))[3:]
+        # Sorts before the last event of the first page: same date and time, higher id.
+        Event.objects.create(
+            name="Same day", date=date(2026, 3, 4), time=time(10), location="Hall", image='events/x.jpg',
+        )
+        self.assertEqual(self._walk(first['next']), expected)
+
+    def test_previous_link_walks_back(self):
+        first = self.client.get(reverse('event:event-list') + '?page_size=3').json()
+        second = self.client.get(first['next']).json()
+        back = self.client.get(second['previous']).json()
+        self.assertEqual([e['slug'] for e in back['results']], [e['slug'] for e in first['results']])
+        self.assertIsNone(back['previous'])
+
+    def test_malformed_cursor_is_not_found(self):
+        self.assertEqual(self.client.get(reverse('event:event-list') + '?cursor=bm9wZQ==').status_code, 404)
@@ -1,8 +1,15 @@
 from rest_framework import viewsets, permissions
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
 from .models import Event
 from .serializers import EventSerializer
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventPagination(KeysetPagination):
+    page_size = 50
+    ordering = ('-date', '-time', '-id')  # event_keyset_idx
+
+
+class EventViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows events to be viewed or edited.
     Standard Django storage is used for images (DigitalOcean/Local).
@@ -11,3 +18,4 @@ class EventViewSet(viewsets.ModelViewSet):
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     lookup_field = 'slug'  # Or 'id', but slug is nicer for URLs
+    pagination_class = EventPagination
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executives', '0006_academicyear_group_photo_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='academicyear',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='executive',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='sociallink',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
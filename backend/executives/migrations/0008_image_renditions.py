@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('executives', '0007_academicyear_updated_at_executive_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='academicyear',
+            name='group_photo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='academicyear',
+            name='hero_banner_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='executive',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
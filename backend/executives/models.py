@@ -9,12 +9,14 @@ class AcademicYear(models.Model):
         null=True,
         help_text=_("Hero banner for the Executives page.")
     )
+    hero_banner_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     group_photo = models.ImageField(
         upload_to='executives/group_photos/', 
         blank=True, 
         null=True,
         help_text=_("Group photo displayed on the About page.")
     )
+    group_photo_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     description = models.TextField(
         blank=True, 
         help_text=_("Optional welcome message from the executives.")
@@ -28,6 +30,7 @@ class AcademicYear(models.Model):
         help_text=_("Set this to true to make this the default active year.")
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-name']
@@ -74,6 +77,8 @@ class Executive(models.Model):
     name = models.CharField(max_length=100)
     position = models.CharField(max_length=50, choices=POSITION_CHOICES)
     image = models.ImageField(upload_to='executives/profiles/')
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['academic_year', 'position']  # Will use POSITION_ORDER in view
@@ -106,6 +111,7 @@ class SocialLink(models.Model):
     platform = models.CharField(max_length=20, choices=PLATFORM_CHOICES)
     url = models.CharField(max_length=255, help_text="URL or Email Address")
     is_visible = models.BooleanField(default=True, help_text="Uncheck to hide this link on the website")
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.platform} - {self.url}"
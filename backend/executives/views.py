@@ -1,5 +1,7 @@
 from rest_framework import serializers, viewsets
 from rest_framework.response import Response
+from core.conditional import ConditionalGetMixin
+from core.renditions import RenditionsField
 from .models import AcademicYear, Executive, SocialLink
 
 class SocialLinkSerializer(serializers.ModelSerializer):
@@ -11,11 +13,12 @@ class ExecutiveSerializer(serializers.ModelSerializer):
     display_position = serializers.CharField(source='get_position_display', read_only=True)
     sort_order = serializers.IntegerField(read_only=True)
     image = serializers.SerializerMethodField()
+    image_renditions = RenditionsField('image')
     social_links = serializers.SerializerMethodField()
     
     class Meta:
         model = Executive
-        fields = ['id', 'name', 'position', 'display_position', 'image', 'sort_order', 'social_links']
+        fields = ['id', 'name', 'position', 'display_position', 'image', 'image_renditions', 'sort_order', 'social_links']
     
     def get_social_links(self, obj):
         links = obj.social_links.filter(is_visible=True)
@@ -34,10 +37,12 @@ class AcademicYearSerializer(serializers.ModelSerializer):
     executives = serializers.SerializerMethodField()
     hero_banner = serializers.SerializerMethodField()
     group_photo = serializers.SerializerMethodField()
+    hero_banner_renditions = RenditionsField('hero_banner')
+    group_photo_renditions = RenditionsField('group_photo')
     
     class Meta:
         model = AcademicYear
-        fields = ['id', 'name', 'hero_banner', 'group_photo', 'description', 'show_description', 'is_current', 'executives']
+        fields = ['id', 'name', 'hero_banner', 'hero_banner_renditions', 'group_photo', 'group_photo_renditions', 'description', 'show_description', 'is_current', 'executives']
     
     def get_hero_banner(self, obj):
         """Return absolute URL for the hero banner"""
@@ -64,9 +69,15 @@ class AcademicYearSerializer(serializers.ModelSerializer):
         # Pass request context to nested serializer
         return ExecutiveSerializer(sorted_executives, many=True, context=self.context).data
 
-class ExecutiveViewSet(viewsets.ReadOnlyModelViewSet):
+class ExecutiveViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = AcademicYear.objects.prefetch_related('executives').all()
     serializer_class = AcademicYearSerializer
+    validator_timestamp_fields = (
+        'updated_at',
+        'executives__updated_at',
+        'executives__social_links__updated_at',
+    )
+    validator_count_fields = ('pk', 'executives', 'executives__social_links')
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
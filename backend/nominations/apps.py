@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class NominationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'nominations'
+
+    def ready(self):
+        from core import singletons
+        from .models import NominationSettings
+        singletons.register(NominationSettings)  # drop the cached row on save
@@ -1,5 +1,7 @@
 from django.db import models
 
+from core import singletons
+
 class Category(models.Model):
     group_name = models.CharField(
         max_length=255,
@@ -44,8 +46,8 @@ class NominationSettings(models.Model):
 
     @classmethod
     def get_settings(cls):
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
+        # Served from cache (core/singletons.py); invalidated on save.
+        return singletons.get(cls)
 
 
 class Nomination(models.Model):
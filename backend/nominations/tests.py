@@ -141,3 +141,9 @@ class NominationsAPITests(APITestCase):
         }
         response = self.client.post(url, payload, format='multipart')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_status_is_served_from_cache(self):
+        url = reverse('nominations:nomination-status')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.client.get(url).json()['is_open'])
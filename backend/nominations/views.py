@@ -2,13 +2,13 @@ from django.db import IntegrityError
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
+from core.throttling import SlidingWindowAnonRateThrottle
 from rest_framework.parsers import MultiPartParser, FormParser
 
 from .models import Category, Nomination, NominationSettings
 from .serializers import CategorySerializer, NominationSerializer
 
-class NominationSubmissionThrottle(AnonRateThrottle):
+class NominationSubmissionThrottle(SlidingWindowAnonRateThrottle):
     rate = '10/hour'
 
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarship', '0007_alter_scholarship_deadline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scholarship',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
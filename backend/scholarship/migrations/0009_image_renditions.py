@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarship', '0008_scholarship_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scholarship',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -16,6 +16,7 @@ class Scholarship(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField()
     image = models.ImageField(upload_to="images/scholarships", null=True, blank=True)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     
     # Link to scholarship application/details
     link = models.URLField(max_length=500, blank=True, help_text="Link to scholarship application or more info")
@@ -37,6 +38,7 @@ class Scholarship(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     last_updated = models.DateField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Precise timestamp for HTTP cache validators
 
     class Meta:
         ordering = ['-last_updated']
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from core.renditions import RenditionsField
 from .models import Scholarship
 
 
@@ -7,6 +9,7 @@ class ScholarshipSerializer(serializers.ModelSerializer):
     Serializer for the simplified Scholarship model.
     """
     lastUpdated = serializers.DateField(source='last_updated', read_only=True)
+    image_renditions = RenditionsField('image')
     
     class Meta:
         model = Scholarship
@@ -15,6 +18,7 @@ class ScholarshipSerializer(serializers.ModelSerializer):
             'name',
             'description',
             'image',
+            'image_renditions',
             'link',
             'eligibility',
             'deadline',
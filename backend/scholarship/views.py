@@ -5,14 +5,17 @@ from django.core.files.storage import default_storage
 from rest_framework.response import Response
 from uuid import uuid4
 
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
 from .models import Scholarship
 from .serializers import ScholarshipSerializer
 
-class ScholarshipList(generics.ListAPIView):
-    """List all scholarships"""
+class ScholarshipList(ConditionalGetMixin, generics.ListAPIView):
+    """List all scholarships, newest first, in keyset pages"""
     permission_classes = [permissions.AllowAny]
     queryset = Scholarship.objects.order_by('-id')
     serializer_class = ScholarshipSerializer
+    pagination_class = KeysetPagination
 
 class ScholarshipDetail(generics.RetrieveAPIView):
     """Retrieve a scholarship"""
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    """Read-only view of the search index (rebuilt by `manage.py rebuild_search_index`)."""
+    list_display = ('title', 'kind', 'subtitle', 'updated_at')
+    list_filter = ('kind',)
+    search_fields = ('title',)
+    readonly_fields = ('kind', 'object_id', 'title', 'subtitle', 'body', 'url', 'image', 'updated_at')
+    exclude = ('search_text', 'search_vector')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
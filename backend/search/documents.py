@@ -0,0 +1,220 @@
+"""
+Builds SearchDocument rows from the models they describe.
+
+Each source below turns one instance into the document fields, or None when
+the instance must not be searchable (inactive, unapproved, unavailable).
+search/signals.py re-indexes instances as they are saved or deleted; the
+rebuild_search_index command re-indexes everything.
+
+Documents are upserted in bulk, and on PostgreSQL their weighted tsvector
+(title A, subtitle B, body C) is filled by one UPDATE afterwards.
+"""
+from collections import namedtuple
+
+from django.apps import apps
+from django.db import connection
+from django.utils import timezone
+
+from core.fulltext import CONFIG
+
+from .models import SearchDocument
+
+BATCH_SIZE = 500
+
+Source = namedtuple('Source', 'kind model build select_related')
+
+
+def _file_url(field):
+    try:
+        return field.url if field else ''
+    except ValueError:
+        return ''
+
+
+def _join(*parts):
+    return ' '.join(part for part in parts if part)
+
+
+def _course(course):
+    if not course.semester.academic_year.is_active:
+        return None  # hidden from the course tree (courses/tree.py)
+    return {
+        'title': _join(course.code, course.name),
+        'subtitle': str(course.semester.academic_year),
+        'body': course.description or '',
+        'url': '/courses',
+    }
+
+
+def _resource(resource):
+    if not (resource.is_active and resource.course.semester.academic_year.is_active):
+        return None
+    course = resource.course
+    return {
+        'title': resource.title,
+        'subtitle': _join(course.code or course.name, '·', resource.get_resource_type_display()),
+        'body': course.name,
+        'url': '/courses',
+    }
+
+
+def _scholarship(scholarship):
+    return {
+        'title': scholarship.name,
+        'subtitle': scholarship.get_status_display(),
+        'body': _join(scholarship.description, scholarship.eligibility),
+        'url': f"/scholarships/{scholarship.pk}",
+        'image': _file_url(scholarship.image),
+    }
+
+
+def _event(event):
+    return {
+        'title': event.name,
+        'subtitle': _join(event.date.isoformat(), '·', event.location),
+        'body': event.description,
+        'url': '/events',
+        'image': _file_url(event.image),
+    }
+
+
+def _business(business):
+    if not business.is_approved:
+        return None
+    return {
+        'title': business.name,
+        'subtitle': 'Student business',
+        'body': business.description,
+        'url': f"/marketplace/{business.slug}",
+        'image': _file_url(business.logo),
+    }
+
+
+def _marketplace_product(product):
+    if not (product.is_available and product.business.is_approved):
+        return None
+    return {
+        'title': product.name,
+        'subtitle': _join(product.business.name, '·', product.get_category_display()),
+        'body': product.description,
+        'url': f"/marketplace/{product.business.slug}",
+        'image': _file_url(product.image),
+    }
+
+
+def _merch(product):
+    if not product.is_active:
+        return None
+    return {
+        'title': product.name,
+        'subtitle': _join('ACES Shop ·', product.category.name),
+        'body': product.description,
+        'url': f"/shop/{product.slug}",
+        'image': _file_url(product.image),
+    }
+
+
+SOURCES = [
+    Source('course', 'courses.Course', _course, ('semester__academic_year',)),
+    Source('resource', 'courses.CourseResource', _resource, ('course__semester__academic_year',)),
+    Source('scholarship', 'scholarship.Scholarship', _scholarship, ()),
+    Source('event', 'event.Event', _event, ()),
+    Source('business', 'student_businesses.Business', _business, ()),
+    Source('marketplace', 'student_businesses.Product', _marketplace_product, ('business',)),
+    Source('merch', 'shop.Product', _merch, ('category',)),
+]
+
+# Documents that embed another model's fields: (model, dependent source, FK name).
+DEPENDENTS = [
+    ('courses.AcademicYear', 'courses.Course', 'semester__academic_year'),
+    ('courses.AcademicYear', 'courses.CourseResource', 'course__semester__academic_year'),
+    ('courses.Semester', 'courses.Course', 'semester'),
+    ('courses.Semester', 'courses.CourseResource', 'course__semester'),
+    ('courses.Course', 'courses.CourseResource', 'course'),
+    ('student_businesses.Business', 'student_businesses.Product', 'business'),
+    ('shop.Category', 'shop.Product', 'category'),
+]
+
+
+def source_for(model):
+    label = model._meta.label
+    for source in SOURCES:
+        if source.model == label:
+            return source
+    return None
+
+
+def queryset(source):
+    model = apps.get_model(source.model)
+    return model._default_manager.select_related(*source.select_related).order_by('pk')
+
+
+def index(source, instances):
+    """Upsert the documents of ``instances`` and drop those no longer searchable."""
+    documents, hidden = [], []
+    for instance in instances:
+        fields = source.build(instance)
+        if fields is None:
+            hidden.append(instance.pk)
+            continue
+        fields['search_text'] = _join(fields['title'], fields['subtitle'], fields['body']).lower()
+        fields['title'], fields['subtitle'] = fields['title'][:255], fields['subtitle'][:255]
+        documents.append(SearchDocument(kind=source.kind, object_id=instance.pk, **fields))
+
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['title', 'subtitle', 'body', 'url', 'image', 'search_text', 'updated_at'],
+        )
+        _update_vectors(source.kind, [document.object_id for document in documents])
+    if hidden:
+        remove(source.kind, hidden)
+    return len(documents)
+
+
+def reindex(model, instances):
+    """
+    Re-index ``instances`` of ``model`` and the documents embedding them.
+    For bulk ``.update()`` calls, which send no post_save for search/signals.py.
+    """
+    instances = list(instances)
+    index(source_for(model), instances)
+    for parent, child, fk in DEPENDENTS:
+        if parent == model._meta.label:
+            source = source_for(apps.get_model(child))
+            index(source, queryset(source).filter(**{f"{fk}__in": instances}))
+
+
+def remove(kind, object_ids):
+    SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def rebuild(source):
+    """Re-index every instance of ``source``. Returns the number of documents."""
+    started = timezone.now()
+    total, batch = 0, []
+    for instance in queryset(source).iterator(chunk_size=BATCH_SIZE):
+        batch.append(instance)
+        if len(batch) == BATCH_SIZE:
+            total += index(source, batch)
+            batch = []
+    total += index(source, batch)
+    # Whatever was not upserted by this run belongs to deleted rows.
+    SearchDocument.objects.filter(kind=source.kind, updated_at__lt=started).delete()
+    return total
+
+
+def _update_vectors(kind, object_ids):
+    if connection.vendor != 'postgresql':
+        return
+    from django.contrib.postgres.search import SearchVector
+
+    SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).update(
+        search_vector=(
+            SearchVector('title', weight='A', config=CONFIG)
+            + SearchVector('subtitle', weight='B', config=CONFIG)
+            + SearchVector('body', weight='C', config=CONFIG)
+        ),
+    )
@@ -0,0 +1,40 @@
+"""
+Rebuilds the site-wide search index (search/documents.py) from scratch.
+
+Signals keep documents current as rows change; run this after deploying
+the search app, after bulk imports that bypass signals, or to repair drift.
+
+Usage:
+    python manage.py rebuild_search_index                   # every source
+    python manage.py rebuild_search_index --type event --type scholarship
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search import documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the site-wide search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', action='append', dest='kinds',
+            help=f"Only rebuild these document types ({', '.join(s.kind for s in documents.SOURCES)})",
+        )
+
+    def handle(self, *args, **options):
+        sources = documents.SOURCES
+        if options['kinds']:
+            unknown = set(options['kinds']) - {source.kind for source in sources}
+            if unknown:
+                raise CommandError(f"Unknown document type(s): {', '.join(sorted(unknown))}")
+            sources = [source for source in sources if source.kind in options['kinds']]
+
+        for source in sources:
+            started = time.perf_counter()
+            count = documents.rebuild(source)
+            self.stdout.write(self.style.SUCCESS(
+                f"{source.kind:>12}: {count} document(s) in {(time.perf_counter() - started) * 1000:.0f} ms"
+            ))
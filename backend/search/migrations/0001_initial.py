@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-18 16:24
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX search_document_vector_idx ON search_searchdocument USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX search_document_text_trgm_idx ON search_searchdocument USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS search_document_vector_idx")
+    schema_editor.execute("DROP INDEX IF EXISTS search_document_text_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        TrigramExtension(),  # no-op outside PostgreSQL
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Course'), ('resource', 'Course Resource'), ('scholarship', 'Scholarship'), ('event', 'Event'), ('business', 'Student Business'), ('marketplace', 'Marketplace Product'), ('merch', 'Shop Product')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('url', models.CharField(help_text='Frontend path of the item', max_length=300)),
+                ('image', models.CharField(blank=True, max_length=500)),
+                ('search_text', models.TextField(blank=True, default='')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_unique_object')],
+            },
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
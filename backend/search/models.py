@@ -0,0 +1,40 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable item from another app, denormalised for /api/search/.
+    Rows are written by search/documents.py from signals — never edit by hand.
+    """
+    KIND_CHOICES = [
+        ('course', 'Course'),
+        ('resource', 'Course Resource'),
+        ('scholarship', 'Scholarship'),
+        ('event', 'Event'),
+        ('business', 'Student Business'),
+        ('marketplace', 'Marketplace Product'),
+        ('merch', 'Shop Product'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=300, help_text="Frontend path of the item")
+    image = models.CharField(max_length=500, blank=True)
+    # Lowercased title, subtitle and body; trigram-indexed on PostgreSQL
+    search_text = models.TextField(blank=True, default='')
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_unique_object'),
+        ]
+        # GIN indexes on search_vector and search_text are created by
+        # migration 0001 on PostgreSQL only.
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
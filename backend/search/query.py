@@ -0,0 +1,21 @@
+"""
+Ranked queries over SearchDocument, matched as in the marketplace
+(core/fulltext.py): on PostgreSQL every term matches as a prefix against the
+weighted tsvector, or by trigram word similarity for typos, ordered by
+ts_rank plus similarity; on SQLite every term must be a substring of
+search_text and titles starting with the first term rank first.
+"""
+from core.fulltext import rank, terms
+
+from .models import SearchDocument
+
+
+def search(query, kinds=None):
+    """SearchDocuments matching ``query``, optionally of ``kinds`` only, best first."""
+    words = terms(query)
+    if not words:
+        return SearchDocument.objects.none()
+    documents = SearchDocument.objects.defer('body', 'search_text', 'search_vector')
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    return rank(documents, words, 'title', 'rank')
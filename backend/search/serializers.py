@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from .models import SearchDocument
+
+
+class SearchHitSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField(source='object_id')
+
+    class Meta:
+        model = SearchDocument
+        fields = ['type', 'id', 'title', 'subtitle', 'url', 'image']
@@ -0,0 +1,37 @@
+"""
+Search signal handlers.
+
+Re-indexes a search document (search/documents.py) whenever its source row
+is saved or deleted, and the documents that embed a row's fields (a
+business's products, a course's resources) when that row is saved.
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from . import documents
+
+
+def _index(sender, instance, **kwargs):
+    documents.index(documents.source_for(sender), [instance])
+
+
+def _remove(sender, instance, **kwargs):
+    documents.remove(documents.source_for(sender).kind, [instance.pk])
+
+
+def _dependent_indexer(source, fk):
+    def _index_dependents(sender, instance, **kwargs):
+        documents.index(source, documents.queryset(source).filter(**{fk: instance}))
+    return _index_dependents
+
+
+for _source in documents.SOURCES:
+    _model = apps.get_model(_source.model)
+    post_save.connect(_index, sender=_model, dispatch_uid=f"search-index-{_source.kind}")
+    post_delete.connect(_remove, sender=_model, dispatch_uid=f"search-remove-{_source.kind}")
+
+for _parent, _child, _fk in documents.DEPENDENTS:
+    post_save.connect(
+        _dependent_indexer(documents.source_for(apps.get_model(_child)), _fk),
+        sender=apps.get_model(_parent), weak=False, dispatch_uid=f"search-dependents-{_parent}-{_child}",
+    )
@@ -0,0 +1,113 @@
+from datetime import date, time
+from io import StringIO
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from courses.models import AcademicYear, Course, CourseResource, Semester
+from event.models import Event
+from scholarship.models import Scholarship
+from shop.models import Category, Product as ShopProduct
+from student_businesses.models import Business, Product
+
+from .models import SearchDocument
+
+
+class SiteSearchTests(APITestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        self.url = reverse('search:search')
+        self.event = Event.objects.create(
+            name="Robotics Workshop", description="Build a line follower", date=date(2026, 5, 1),
+            time=time(10), location="Engineering Auditorium", image='events/x.jpg',
+        )
+        self.scholarship = Scholarship.objects.create(
+            name="MTN Bright Scholarship", description="For robotics and engineering students",
+            deadline=date(2026, 6, 1),
+        )
+        owner = get_user_model().objects.create_user(email='vendor@example.com', username='vendor', password='pass12345')
+        self.business = Business.objects.create(
+            owner=owner, name="Circuit Corner", description="Arduino kits", whatsapp_number='233541234567',
+            is_approved=True,
+        )
+        self.kit = Product.objects.create(
+            business=self.business, name="Robotics Starter Kit", price=Decimal('80.00'), image='p.jpg',
+        )
+        self.hoodie = ShopProduct.objects.create(
+            category=Category.objects.create(name="Apparel"), name="ACES Hoodie", description="Warm hoodie",
+            price=Decimal('150.00'), stock=10,
+        )
+
+    def _hits(self, **params):
+        return [(hit['type'], hit['id']) for hit in self.client.get(self.url, params).json()['results']]
+
+    def test_ranked_hits_across_apps(self):
+        self.assertEqual(self._hits(q='robot'), [
+            ('event', self.event.pk),
+            ('marketplace', self.kit.pk),
+            ('scholarship', self.scholarship.pk),
+        ])
+        hit = self.client.get(self.url, {'q': 'hood'}).json()['results'][0]
+        self.assertEqual(hit['url'], f"/shop/{self.hoodie.slug}")
+
+    def test_type_filter_and_empty_query(self):
+        self.assertEqual(self._hits(q='robot', type='scholarship,bogus'), [('scholarship', self.scholarship.pk)])
+        self.assertEqual(self._hits(q='  '), [])
+
+    def test_documents_follow_their_sources(self):
+        self.business.is_approved = False
+        self.business.save()
+        self.assertEqual(self._hits(q='circuit'), [])
+
+        self.event.delete()
+        self.assertNotIn('event', [kind for kind, _ in self._hits(q='robot')])
+
+        self.hoodie.name = "ACES Sweater"
+        self.hoodie.save()
+        self.assertEqual(self._hits(q='sweater'), [('merch', self.hoodie.pk)])
+
+    def test_admin_approval_actions_reindex(self):
+        admin_user = get_user_model().objects.create_superuser(
+            email='admin@example.com', username='admin', password='pass12345',
+        )
+        self.client.force_login(admin_user)
+        changelist = reverse('admin:student_businesses_business_changelist')
+
+        def run(action):
+            self.client.post(changelist, {'action': action, '_selected_action': [self.business.pk]})
+
+        run('unapprove_businesses')
+        self.assertEqual(self._hits(q='circuit'), [])
+        self.assertEqual(self._hits(q='starter'), [])
+
+        run('approve_businesses')
+        self.assertCountEqual(self._hits(q='circuit'), [('business', self.business.pk), ('marketplace', self.kit.pk)])
+
+    def test_hidden_academic_years_are_not_searchable(self):
+        year = AcademicYear.objects.create(year=3)
+        semester = Semester.objects.create(academic_year=year, semester_number=1)
+        course = Course.objects.create(semester=semester, name="Robot Dynamics", code="ME 351")
+        resource = CourseResource.objects.create(
+            course=course, title="Robotics Past Questions", external_url="https://example.com/pq.pdf",
+        )
+        visible = [('course', course.pk), ('resource', resource.pk)]
+        self.assertCountEqual([hit for hit in self._hits(q='robot') if hit[0] in ('course', 'resource')], visible)
+
+        year.is_active = False
+        year.save()
+        self.assertEqual([hit for hit in self._hits(q='robot') if hit[0] in ('course', 'resource')], [])
+
+    def test_rebuild_restores_missing_documents(self):
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(SearchDocument.objects.count(), 5)
+
+    def test_search_is_two_queries(self):
+        with self.assertNumQueries(2):  # count + page
+            self.client.get(self.url, {'q': 'robot'})
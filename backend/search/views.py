@@ -0,0 +1,27 @@
+from rest_framework import generics, permissions
+from rest_framework.pagination import LimitOffsetPagination
+
+from .models import SearchDocument
+from .query import search
+from .serializers import SearchHitSerializer
+
+
+class SearchPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 50
+
+
+class SearchView(generics.ListAPIView):
+    """
+    Site-wide search: /api/search/?q=<text>[&type=event,scholarship]
+    Returns ranked hits across courses, resources, scholarships, events,
+    student businesses, marketplace products and shop products.
+    """
+    serializer_class = SearchHitSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        kinds = {choice for choice, _ in SearchDocument.KIND_CHOICES}
+        requested = [k for k in self.request.query_params.get('type', '').split(',') if k in kinds]
+        return search(self.request.query_params.get('q'), requested)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Product, Order, OrderItem, ProductImage, Coupon, ProductSize, SiteSettings
+from .models import Category, Product, Order, OrderItem, OrderEmail, ProductImage, Coupon, ProductSize, ProductSKU, SiteSettings, StockReservation
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -21,12 +21,19 @@ class ProductSizeInline(admin.TabularInline):
     # classes = ['collapse'] # Removed to make it immediately visible
 
 
+class ProductSKUInline(admin.TabularInline):
+    model = ProductSKU
+    extra = 0
+    fields = ['size', 'color', 'stock']
+    verbose_name_plural = "Stock per Size / Colour (SKUs) — product stock becomes their total"
+
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ['name', 'category', 'price', 'stock', 'is_active', 'has_sizes']
     list_filter = ['category', 'is_active', 'has_sizes']
     prepopulated_fields = {'slug': ('name',)}
-    inlines = [ProductImageInline, ProductSizeInline]
+    inlines = [ProductImageInline, ProductSizeInline, ProductSKUInline]
     fieldsets = (
         (None, {
             'fields': ('name', 'slug', 'category', 'description', 'price', 'stock', 'is_active')
@@ -40,6 +47,12 @@ class ProductAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_readonly_fields(self, request, obj=None):
+        # With SKUs, stock is their total and is maintained by shop/inventory.py.
+        if obj is not None and obj.skus.exists():
+            return ['stock']
+        return []
+
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
     raw_id_fields = ['product']
@@ -53,6 +66,32 @@ class OrderItemInline(admin.TabularInline):
     def has_delete_permission(self, request, obj=None):
         return False
 
+class OrderEmailInline(admin.TabularInline):
+    model = OrderEmail
+    fields = ['kind', 'status', 'attempts', 'last_error', 'sent_at']
+    readonly_fields = fields
+    extra = 0
+    verbose_name_plural = "Emails"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+class StockReservationInline(admin.TabularInline):
+    model = StockReservation
+    fields = ['product', 'size', 'quantity', 'expires_at', 'released_at']
+    readonly_fields = fields
+    extra = 0
+    verbose_name_plural = "Stock Holds"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 from django.utils.html import format_html
 import csv
 from django.http import HttpResponse
@@ -97,9 +136,14 @@ class OrderAdmin(admin.ModelAdmin):
         from django.utils import timezone
         from datetime import timedelta
         
+        from .inventory import release_holds
+
         # Threshold: 48 hours
         threshold = timezone.now() - timedelta(hours=48)
-        Order.objects.filter(status='PENDING', created_at__lt=threshold).update(status='FAILED')
+        stale_ids = list(Order.objects.filter(status='PENDING', created_at__lt=threshold).values_list('id', flat=True))
+        if stale_ids:
+            Order.objects.filter(id__in=stale_ids, status='PENDING').update(status='FAILED')
+            release_holds(stale_ids)
         
         return super().changelist_view(request, extra_context=extra_context)
 
@@ -137,6 +181,7 @@ class OrderAdmin(admin.ModelAdmin):
     @admin.action(description="❌ Mark selected orders as Failed (Cancel)")
     def mark_as_failed(self, request, queryset):
         from django.contrib import messages
+        from .inventory import release_holds
         
         # Separate orders by whether they can be cancelled
         # FULFILLED orders with delivered_at cannot be cancelled
@@ -151,7 +196,10 @@ class OrderAdmin(admin.ModelAdmin):
         # Only cancel non-delivered orders
         if cancellable_orders.exists():
             # Clear completion timestamps when cancelling
-            updated = cancellable_orders.update(status='FAILED', completed_at=None)
+            cancelled_ids = list(cancellable_orders.values_list('id', flat=True))
+            updated = Order.objects.filter(id__in=cancelled_ids).update(status='FAILED', completed_at=None)
+            # Give any held stock back
+            release_holds(cancelled_ids)
             messages.success(request, f"❌ {updated} order(s) marked as FAILED/Cancelled.")
         else:
             updated = 0
@@ -197,9 +245,8 @@ class OrderAdmin(admin.ModelAdmin):
         from django.contrib import messages
         from django.db import transaction
         import uuid
-        import threading
-        from .utils import send_customer_email
-        from .models import Product
+        from .inventory import decrement_stock, release_holds
+        from .outbox import queue_order_emails
 
         order = get_object_or_404(Order, pk=order_id)
 
@@ -214,30 +261,18 @@ class OrderAdmin(admin.ModelAdmin):
                     messages.error(request, f"⚠️ Order #{locked_order.id} status changed during processing.")
                     return redirect('admin:shop_order_changelist')
 
-                # Decrement stock
-                for item in locked_order.items.select_related('product').all():
-                    product = Product.objects.select_for_update().get(id=item.product.id)
-                    if product.stock >= item.quantity:
-                        product.stock -= item.quantity
-                    else:
-                        product.stock = 0
-                    product.save()
+                # Decrement stock (consumes the order's holds)
+                decrement_stock(locked_order.items.all())
+                release_holds([locked_order.id])
 
                 locked_order.status = 'PAID'
                 locked_order.verification_code = str(uuid.uuid4())
                 locked_order.save()
 
-                # Send email
-                def run_safe_email(email_func, ord_obj):
-                    try:
-                        email_func(ord_obj)
-                    except Exception as email_err:
-                        import logging
-                        logging.getLogger(__name__).error(f"Failed to send email for order #{ord_obj.id}: {email_err}")
+                # Queue confirmation email (sent by a Celery worker after commit)
+                queue_order_emails(locked_order, 'CUSTOMER')
 
-                threading.Thread(target=run_safe_email, args=(send_customer_email, locked_order), daemon=True).start()
-
-                messages.success(request, f"💰 Order #{locked_order.id} marked as PAID. Stock updated and confirmation email sent!")
+                messages.success(request, f"💰 Order #{locked_order.id} marked as PAID. Stock updated and confirmation email queued!")
         except Exception as e:
             messages.error(request, f"Error verifying payment: {str(e)}")
 
@@ -248,12 +283,12 @@ class OrderAdmin(admin.ModelAdmin):
         from django.contrib import messages
         from django.db import transaction
         import uuid
-        import threading
-        from .utils import send_customer_email
-        from .models import Product
+        from .inventory import decrement_stock, release_holds
+        from .outbox import queue_order_emails, dispatch_order_emails
         
         pending_orders = queryset.filter(status='PENDING')
         updated_count = 0
+        queued_email_ids = []
         
         for order in pending_orders:
             try:
@@ -262,31 +297,21 @@ class OrderAdmin(admin.ModelAdmin):
                     if locked_order.status != 'PENDING':
                         continue
                         
-                    # Decrement stock
-                    for item in locked_order.items.select_related('product').all():
-                        product = Product.objects.select_for_update().get(id=item.product.id)
-                        if product.stock >= item.quantity:
-                            product.stock -= item.quantity
-                        else:
-                            product.stock = 0
-                        product.save()
+                    # Decrement stock (consumes the order's holds)
+                    decrement_stock(locked_order.items.all())
+                    release_holds([locked_order.id])
                     
                     locked_order.status = 'PAID'
                     locked_order.verification_code = str(uuid.uuid4())
                     locked_order.save()
                     
-                    # Send email
-                    def run_safe_email(email_func, ord_obj):
-                        try:
-                            email_func(ord_obj)
-                        except Exception as email_err:
-                            import logging
-                            logging.getLogger(__name__).error(f"Failed to send email for order #{ord_obj.id}: {email_err}")
-
-                    threading.Thread(target=run_safe_email, args=(send_customer_email, locked_order), daemon=True).start()
+                    # Queue email; all orders are handed to the workers in one batch below
+                    queued_email_ids += queue_order_emails(locked_order, 'CUSTOMER', dispatch=False)
                     updated_count += 1
             except Exception as e:
                 messages.error(request, f"Error verifying order #{order.id}: {str(e)}")
+
+        dispatch_order_emails(queued_email_ids)
                 
         if updated_count > 0:
             messages.success(request, f"💰 Successfully verified payment and marked {updated_count} order(s) as PAID.")
@@ -296,7 +321,7 @@ class OrderAdmin(admin.ModelAdmin):
     search_fields = ['id', 'full_name', 'email', 'phone', 'paystack_reference', 'momo_sender_name']
     date_hierarchy = 'created_at'
     list_per_page = 20
-    inlines = [OrderItemInline]
+    inlines = [OrderItemInline, StockReservationInline, OrderEmailInline]
     actions = ["mark_as_paid", "mark_as_fulfilled", "export_production_manifest", "mark_as_failed"]
     
     # Premium Fieldsets Layout
@@ -619,6 +644,50 @@ class CouponAdmin(admin.ModelAdmin):
         js = ('admin/js/coupon_admin.js',)  # We'll create this file
 
 
+# =============================================================================
+# Order Email Outbox
+# =============================================================================
+
+@admin.register(OrderEmail)
+class OrderEmailAdmin(admin.ModelAdmin):
+    """
+    Delivery status of queued order emails (shop/outbox.py).
+    Rows are created by checkout and payment flows, never by hand.
+    """
+    list_display = ['order', 'kind', '_status_badge', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['order__id', 'order__email']
+    raw_id_fields = ['order']
+    readonly_fields = ['order', 'kind', 'status', 'attempts', 'last_error', 'next_attempt_at', 'created_at', 'sent_at']
+    list_select_related = ['order']
+    actions = ['retry_now']
+
+    def has_add_permission(self, request):
+        return False
+
+    def _status_badge(self, obj):
+        colors = {'PENDING': '#f59e0b', 'SENDING': '#3b82f6', 'SENT': '#22c55e', 'FAILED': '#ef4444'}
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 4px 12px; border-radius: 15px; font-weight: bold; font-size: 11px;">{}</span>',
+            colors.get(obj.status, "grey"),
+            obj.status
+        )
+    _status_badge.short_description = "Status"
+    _status_badge.admin_order_field = "status"
+
+    @admin.action(description="📧 Retry sending now")
+    def retry_now(self, request, queryset):
+        from django.contrib import messages
+        from django.utils import timezone
+        from .outbox import dispatch_order_emails
+
+        retry = queryset.filter(status__in=['PENDING', 'FAILED'])
+        ids = list(retry.values_list('id', flat=True))
+        retry.update(status='PENDING', next_attempt_at=timezone.now())
+        dispatch_order_emails(ids)
+        messages.success(request, f"📧 Queued {len(ids)} email(s) for delivery.")
+
+
 # =============================================================================
 # Site Settings — Kill Switch Admin
 # =============================================================================
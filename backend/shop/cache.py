@@ -0,0 +1,82 @@
+"""
+Versioned response cache for the public product catalog.
+
+The product list and product detail endpoints store their fully rendered JSON
+under keys that embed a catalog version number. Any write to Product,
+ProductImage, ProductSize or Category bumps the version (see shop/signals.py),
+so superseded entries are never read again and simply age out of the cache.
+
+Serving a cached response costs two cache lookups (version + body) and no
+database queries.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_ALIAS = 'catalog'
+VERSION_KEY = 'shop:catalog:version'
+
+
+def _cache():
+    return caches[CATALOG_CACHE_ALIAS]
+
+
+def _fresh_version():
+    # Seed from the clock rather than 1 so a version key that was evicted
+    # (or lost on a cache restart) can never collide with old entries.
+    return time.time_ns() // 1_000_000
+
+
+def get_catalog_version():
+    """Return the current catalog version, initialising it if absent."""
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response by moving to a new version."""
+    cache = _cache()
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        # Version key is missing — start a new sequence.
+        version = _fresh_version()
+        cache.set(VERSION_KEY, version, timeout=None)
+    logger.info('CATALOG CACHE: bumped catalog version to %s', version)
+    return version
+
+
+def response_key(request, kind):
+    """
+    Build the cache key for a catalog response.
+
+    The key covers everything that changes the rendered bytes: host and
+    scheme (image URLs are absolute), path and query string (filters,
+    pagination) and the negotiated renderer format.
+    """
+    fingerprint = '|'.join([
+        request.scheme,
+        request.get_host(),
+        request.get_full_path(),
+        request.accepted_renderer.format,
+    ])
+    digest = hashlib.md5(fingerprint.encode('utf-8')).hexdigest()
+    return f'shop:catalog:{get_catalog_version()}:{kind}:{digest}'
+
+
+def get_response(key):
+    """Return the cached response body for ``key`` or None."""
+    return _cache().get(key)
+
+
+def set_response(key, body):
+    _cache().set(key, body, timeout=settings.CATALOG_CACHE_TIMEOUT)
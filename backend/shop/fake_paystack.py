@@ -0,0 +1,146 @@
+"""
+A local stand-in for the Paystack API, for tests and offline development.
+
+Serves /transaction/initialize, /transaction/verify/<reference> and the
+paged /transaction list on a random localhost port from a background
+thread. Point the client at it with PAYSTACK_BASE_URL:
+
+    with FakePaystack() as fake:
+        with override_settings(PAYSTACK_BASE_URL=fake.url):
+            ...
+
+``fail_next(n, status)`` makes the next n requests return an error status;
+``delay`` (seconds) slows every response down.
+"""
+import json
+import math
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakePaystack:
+    def __init__(self):
+        self.transactions = {}
+        self.requests = []
+        self.delay = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    # --- Scripting --------------------------------------------------------
+
+    def fail_next(self, count=1, status=503):
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def mark_paid(self, reference, amount=None):
+        transaction = self.transactions.setdefault(reference, {'reference': reference, 'amount': amount or 0})
+        if amount is not None:
+            transaction['amount'] = amount
+        transaction['status'] = 'success'
+
+    # --- Server -----------------------------------------------------------
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _handle(self, method, path, body):
+        self.requests.append((method, path))
+        path, _, query = path.partition('?')
+        if self.delay:
+            threading.Event().wait(self.delay)
+        failure = self._next_failure()
+        if failure:
+            return failure, {'status': False, 'message': "Fake Paystack failure"}
+
+        if method == 'POST' and path == '/transaction/initialize':
+            reference = uuid.uuid4().hex[:12]
+            self.transactions[reference] = {
+                'reference': reference, 'amount': body.get('amount'), 'status': 'pending',
+            }
+            return 200, {'status': True, 'message': "Authorization URL created", 'data': {
+                'authorization_url': f"https://checkout.paystack.test/{reference}",
+                'access_code': f"access-{reference}",
+                'reference': reference,
+            }}
+
+        if method == 'GET' and path == '/transaction':
+            params = {k: v[0] for k, v in parse_qs(query).items()}
+            page, per_page = int(params.get('page', 1)), int(params.get('perPage', 50))
+            matching = [
+                dict(t) for t in self.transactions.values()
+                if 'status' not in params or t.get('status') == params['status']
+            ]
+            return 200, {
+                'status': True, 'message': "Transactions retrieved",
+                'data': matching[(page - 1) * per_page:page * per_page],
+                'meta': {
+                    'total': len(matching), 'page': page, 'perPage': per_page,
+                    'pageCount': max(math.ceil(len(matching) / per_page), 1),
+                },
+            }
+
+        match = re.fullmatch(r'/transaction/verify/([^/]+)', path)
+        if method == 'GET' and match:
+            transaction = self.transactions.get(match.group(1))
+            if transaction is None:
+                return 400, {'status': False, 'message': "Transaction reference not found"}
+            return 200, {'status': True, 'message': "Verification successful", 'data': dict(transaction)}
+
+        return 404, {'status': False, 'message': "Not found"}
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+            def _respond(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                body = json.loads(raw) if raw else {}
+                status, payload = fake._handle(method, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
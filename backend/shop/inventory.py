@@ -0,0 +1,356 @@
+"""
+Stock bookkeeping for orders.
+
+reserve_stock() holds inventory for a PENDING order when it is created, so
+concurrent checkouts for a limited drop cannot oversell: available stock is
+stock minus active StockReservation holds. decrement_stock() applies a paid
+order to stock; the order's holds are then released.
+
+Products may carry per-variant stock in ProductSKU rows (size x colour).
+For those, each order line is matched to a SKU, SKU stock is checked and
+decremented, and Product.stock is kept as the sum of SKU stock. Every stock
+change also rewrites Product.availability, the denormalized summary served
+by the catalog, so list requests never aggregate SKUs.
+
+Stock-changing functions lock the affected rows with SELECT ... FOR UPDATE
+ordered by id, so concurrent requests always acquire locks in the same order
+and cannot deadlock. They must be called inside transaction.atomic().
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Exists, F, IntegerField, JSONField, OuterRef, Q, Sum, Value, When
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .models import Product, ProductSize, ProductSKU, StockReservation
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# SKUs and the availability summary
+# =============================================================================
+
+def _norm(value):
+    return (value or '').strip().casefold()
+
+
+def variant_label(size, color):
+    return " / ".join(v for v in (size, color) if v) or "Default"
+
+
+def resolve_sku(skus, size, color):
+    """
+    Pick the SKU for an order line from a product's ``skus``: an exact
+    size and colour match first, then SKUs that leave colour, size, or both
+    blank. Returns None if nothing matches.
+    """
+    size, color = _norm(size), _norm(color)
+    by_key = {(_norm(sku.size), _norm(sku.color)): sku for sku in skus}
+    for key in ((size, color), (size, ''), ('', color), ('', '')):
+        if key in by_key:
+            return by_key[key]
+    return None
+
+
+def build_availability(stock, skus=()):
+    """The Product.availability document for a product and its SKUs."""
+    sizes = defaultdict(int)
+    for sku in skus:
+        if sku.size:
+            sizes[sku.size] += sku.stock
+    return {
+        'in_stock': stock > 0,
+        'total': stock,
+        'sizes': dict(sizes),
+        'skus': [
+            {'id': sku.id, 'size': sku.size, 'color': sku.color, 'stock': sku.stock}
+            for sku in skus
+        ],
+    }
+
+
+def _has_skus():
+    return Exists(ProductSKU.objects.filter(product=OuterRef('pk')))
+
+
+def _lock_skus(product_ids):
+    """Lock the SKUs of ``product_ids``; returns ``{product_id: [sku, ...]}``."""
+    skus_by_product = defaultdict(list)
+    if product_ids:
+        skus = ProductSKU.objects.select_for_update().filter(product_id__in=product_ids).order_by('id')
+        for sku in skus:
+            skus_by_product[sku.product_id].append(sku)
+    return skus_by_product
+
+
+def _sync_size_flags(skus_by_product):
+    """Flip ProductSize.is_available to match SKU stock per size."""
+    in_stock, sold_out = Q(pk__in=[]), Q(pk__in=[])
+    for product_id, skus in skus_by_product.items():
+        sizes = build_availability(0, skus)['sizes']
+        available = [name for name, qty in sizes.items() if qty > 0]
+        empty = [name for name, qty in sizes.items() if qty <= 0]
+        if available:
+            in_stock |= Q(product_id=product_id, name__in=available)
+        if empty:
+            sold_out |= Q(product_id=product_id, name__in=empty)
+    ProductSize.objects.filter(in_stock, is_available=False).update(is_available=True)
+    ProductSize.objects.filter(sold_out, is_available=True).update(is_available=False)
+
+
+def refresh_availability(product_ids):
+    """
+    Recompute Product.stock (for products with SKUs) and Product.availability
+    from the database. Called when SKUs or products are edited in the admin.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    skus_by_product = defaultdict(list)
+    for sku in ProductSKU.objects.filter(product_id__in=product_ids).order_by('id'):
+        skus_by_product[sku.product_id].append(sku)
+
+    stock_whens, availability_whens = [], []
+    for product_id, stock in Product.objects.filter(id__in=product_ids).values_list('id', 'stock'):
+        skus = skus_by_product.get(product_id, [])
+        if skus:
+            stock = sum(sku.stock for sku in skus)
+            stock_whens.append(When(id=product_id, then=Value(stock)))
+        availability_whens.append(
+            When(id=product_id, then=Value(build_availability(stock, skus), output_field=JSONField()))
+        )
+
+    Product.objects.filter(id__in=product_ids).update(
+        stock=Case(*stock_whens, default=F('stock'), output_field=IntegerField()),
+        availability=Case(*availability_whens, default=F('availability'), output_field=JSONField()),
+    )
+    if skus_by_product:
+        _sync_size_flags(skus_by_product)
+    transaction.on_commit(bump_catalog_version)
+
+
+# =============================================================================
+# Paid orders
+# =============================================================================
+
+def decrement_stock(items):
+    """
+    Subtract the quantities of ``items`` (OrderItems) from product stock,
+    and from the matching SKU for products that have SKUs.
+
+    Stock that would go negative is clamped to 0 and logged as an underflow,
+    matching the previous per-item behaviour. Returns the number of products
+    updated.
+    """
+    items = list(items)
+    quantities = defaultdict(int)
+    for item in items:
+        quantities[item.product_id] += item.quantity
+    if not quantities:
+        return 0
+
+    product_ids = sorted(quantities)
+    locked = {
+        p['id']: p
+        for p in Product.objects.select_for_update().annotate(has_skus=_has_skus())
+        .filter(id__in=product_ids).order_by('id').values('id', 'name', 'stock', 'has_skus')
+    }
+    skus_by_product = _lock_skus([pid for pid, p in locked.items() if p['has_skus']])
+
+    # --- SKU-level decrement -------------------------------------------------
+    sku_quantities = defaultdict(int)
+    for item in items:
+        skus = skus_by_product.get(item.product_id)
+        if not skus:
+            continue
+        sku = resolve_sku(skus, item.selected_size, item.selected_color)
+        if sku is None:
+            logger.warning(
+                f"STOCK: No SKU of product #{item.product_id} matches "
+                f"{variant_label(item.selected_size, item.selected_color)}; not decremented."
+            )
+            continue
+        sku_quantities[sku.id] += item.quantity
+
+    if sku_quantities:
+        for skus in skus_by_product.values():
+            for sku in skus:
+                quantity = sku_quantities.get(sku.id, 0)
+                if sku.stock < quantity:
+                    logger.warning(
+                        f"STOCK UNDERFLOW: SKU #{sku.id} ({sku.label}) of product #{sku.product_id} "
+                        f"had {sku.stock} but order needed {quantity}. Setting stock to 0."
+                    )
+                sku.stock = max(sku.stock - quantity, 0)
+        ProductSKU.objects.filter(id__in=sku_quantities).update(
+            stock=Case(
+                *[
+                    When(id=sku_id, stock__gte=quantity, then=F('stock') - quantity)
+                    for sku_id, quantity in sku_quantities.items()
+                ],
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            updated_at=timezone.now(),
+        )
+
+    # --- Product totals and availability (one UPDATE) ------------------------
+    stock_whens, availability_whens = [], []
+    for product_id, quantity in quantities.items():
+        product = locked.get(product_id)
+        if product is None:
+            continue
+        skus = skus_by_product.get(product_id, [])
+        if skus:
+            new_stock = sum(sku.stock for sku in skus)
+            stock_whens.append(When(id=product_id, then=Value(new_stock)))
+        else:
+            if product['stock'] < quantity:
+                logger.warning(
+                    f"STOCK UNDERFLOW: Product #{product_id} ({product['name']}) "
+                    f"had {product['stock']} but order needed {quantity}. "
+                    f"Setting stock to 0."
+                )
+            new_stock = max(product['stock'] - quantity, 0)
+            stock_whens.append(When(id=product_id, stock__gte=quantity, then=F('stock') - quantity))
+        availability_whens.append(
+            When(id=product_id, then=Value(build_availability(new_stock, skus), output_field=JSONField()))
+        )
+
+    updated = Product.objects.filter(id__in=product_ids).update(
+        stock=Case(*stock_whens, default=Value(0), output_field=IntegerField()),
+        availability=Case(*availability_whens, default=F('availability'), output_field=JSONField()),
+        updated_at=timezone.now(),
+    )
+    if sku_quantities:
+        _sync_size_flags({pid: skus for pid, skus in skus_by_product.items() if skus})
+
+    # .update() skips post_save, so invalidate the cached catalog explicitly.
+    transaction.on_commit(bump_catalog_version)
+    return updated
+
+
+# =============================================================================
+# Reservations (holds)
+# =============================================================================
+
+class InsufficientStock(Exception):
+    def __init__(self, product, available, requested, variant=None):
+        self.product = product
+        self.available = available
+        self.requested = requested
+        self.variant = variant
+        name = f"{product.name} ({variant})" if variant else product.name
+        super().__init__(
+            f"Product '{name}' only has {available} in stock (requested {requested})"
+        )
+
+
+def hold_ttl(payment_method):
+    minutes = settings.STOCK_HOLD_MINUTES.get(payment_method, settings.STOCK_HOLD_MINUTES['PAYSTACK'])
+    return timedelta(minutes=minutes)
+
+
+def _active(holds, exclude_order=None):
+    holds = holds.filter(released_at__isnull=True, expires_at__gt=timezone.now())
+    if exclude_order is not None:
+        holds = holds.exclude(order=exclude_order)
+    return holds.order_by()
+
+
+def active_holds(product_ids, exclude_order=None):
+    """``{product_id: held quantity}`` for unexpired, unreleased holds."""
+    holds = _active(StockReservation.objects.filter(product_id__in=product_ids), exclude_order)
+    return dict(holds.values('product_id').annotate(held=Sum('quantity')).values_list('product_id', 'held'))
+
+
+def active_sku_holds(sku_ids, exclude_order=None):
+    """``{sku_id: held quantity}`` for unexpired, unreleased holds."""
+    holds = _active(StockReservation.objects.filter(sku_id__in=sku_ids), exclude_order)
+    return dict(holds.values('sku_id').annotate(held=Sum('quantity')).values_list('sku_id', 'held'))
+
+
+def available_stock(product_ids):
+    """``{product_id: stock - active holds}`` (never negative)."""
+    held = active_holds(product_ids)
+    return {
+        product_id: max(stock - held.get(product_id, 0), 0)
+        for product_id, stock in Product.objects.filter(id__in=product_ids).values_list('id', 'stock')
+    }
+
+
+def reserve_stock(order, lines, payment_method='PAYSTACK'):
+    """
+    Replace ``order``'s holds with holds for ``lines`` — ``(product, quantity,
+    size, color)`` tuples. Raises InsufficientStock (nothing is held) when any
+    product's — or, for products with SKUs, any variant's — available stock
+    cannot cover the request.
+    """
+    quantities = defaultdict(int)
+    for product, quantity, size, color in lines:
+        quantities[product.id] += quantity
+
+    product_ids = sorted(quantities)
+    locked = {
+        p.id: p
+        for p in Product.objects.select_for_update().annotate(has_skus=_has_skus())
+        .filter(id__in=product_ids).order_by('id')
+    }
+    skus_by_product = _lock_skus([pid for pid, p in locked.items() if p.has_skus])
+
+    held = active_holds(product_ids, exclude_order=order)
+    for product_id, quantity in quantities.items():
+        product = locked[product_id]
+        available = max(product.stock - held.get(product_id, 0), 0)
+        if available < quantity:
+            raise InsufficientStock(product, available, quantity)
+
+    line_skus = []
+    sku_quantities = defaultdict(int)
+    for product, quantity, size, color in lines:
+        sku = None
+        if skus_by_product.get(product.id):
+            sku = resolve_sku(skus_by_product[product.id], size, color)
+            if sku is None:
+                raise InsufficientStock(locked[product.id], 0, quantity, variant_label(size, color))
+            sku_quantities[sku.id] += quantity
+        line_skus.append(sku)
+
+    if sku_quantities:
+        skus = {sku.id: sku for group in skus_by_product.values() for sku in group}
+        sku_held = active_sku_holds(sku_quantities.keys(), exclude_order=order)
+        for sku_id, quantity in sku_quantities.items():
+            sku = skus[sku_id]
+            available = max(sku.stock - sku_held.get(sku_id, 0), 0)
+            if available < quantity:
+                raise InsufficientStock(locked[sku.product_id], available, quantity, sku.label)
+
+    now = timezone.now()
+    StockReservation.objects.filter(order=order, released_at__isnull=True).update(released_at=now)
+    expires_at = now + hold_ttl(payment_method)
+    StockReservation.objects.bulk_create([
+        StockReservation(
+            order=order, product=product, sku=sku, size=size, quantity=quantity, expires_at=expires_at,
+        )
+        for (product, quantity, size, color), sku in zip(lines, line_skus)
+    ])
+
+
+def release_holds(order_ids):
+    """Release every active hold of the given orders. Returns holds released."""
+    return StockReservation.objects.filter(
+        order_id__in=order_ids, released_at__isnull=True,
+    ).update(released_at=timezone.now())
+
+
+def release_expired_holds():
+    """Mark holds past their expiry as released (housekeeping only — expired
+    holds already stop counting against available stock)."""
+    return StockReservation.objects.filter(
+        released_at__isnull=True, expires_at__lte=timezone.now(),
+    ).update(released_at=timezone.now())
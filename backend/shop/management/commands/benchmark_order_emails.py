@@ -0,0 +1,77 @@
+"""
+Measures how long it takes to build the customer and admin order emails.
+
+Creates a throwaway order with N items inside a transaction that is rolled
+back afterwards, so it is safe to run against any database. Nothing is sent.
+
+Usage:
+    python manage.py benchmark_order_emails                # 20 items, 200 renders each
+    python manage.py benchmark_order_emails --items 50 --iterations 500
+"""
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from shop.models import Category, Order, OrderItem, Product
+from shop.utils import build_admin_email, build_customer_email
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-email render time for shop order emails (no emails are sent)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=20, help='Order items in the sample order (default: 20)')
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per email type (default: 200)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                order = self._sample_order(options['items'])
+                for label, builder in (('customer', build_customer_email), ('admin', build_admin_email)):
+                    self._run(label, builder, order, options['iterations'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _sample_order(self, item_count):
+        category = Category.objects.create(name=f"Benchmark {uuid.uuid4().hex[:8]}")
+        order = Order.objects.create(
+            full_name="Benchmark Customer", email="benchmark@example.com", phone="0200000000",
+            address="Unity Hall", total_amount=Decimal('0.00'), status='PAID',
+            verification_code=str(uuid.uuid4()),
+        )
+        for i in range(item_count):
+            product = Product.objects.create(
+                category=category, name=f"Benchmark Product {i}", description="Benchmark",
+                price=Decimal('50.00'), stock=100,
+            )
+            OrderItem.objects.create(
+                order=order, product=product, price=product.price, quantity=1 + i % 3,
+                selected_color="Black" if i % 2 else None, selected_size="L" if i % 3 else None,
+            )
+        return order
+
+    def _run(self, label, builder, order, iterations):
+        # First render pays for template compilation, logo reads and QR generation.
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            builder(order).message()
+        cold_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            builder(order).message()
+        warm_ms = (time.perf_counter() - started) * 1000 / iterations
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{label:>8}: cold {cold_ms:7.2f} ms | warm {warm_ms:6.2f} ms/email "
+            f"| {len(queries)} query(ies) per email"
+        ))
@@ -10,6 +10,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 
+from shop.inventory import release_holds
 from shop.models import Order
 
 
@@ -59,7 +60,9 @@ class Command(BaseCommand):
             if count > 20:
                 self.stdout.write(f"  ... and {count - 20} more")
         else:
-            updated = stale_orders.update(status='FAILED')
+            stale_ids = list(stale_orders.values_list('id', flat=True))
+            updated = Order.objects.filter(id__in=stale_ids, status='PENDING').update(status='FAILED')
+            release_holds(stale_ids)
             self.stdout.write(self.style.SUCCESS(
                 f"Cleanup complete: Marked {updated} stale PENDING orders as FAILED."
             ))
@@ -0,0 +1,74 @@
+"""
+Re-runs Paystack webhooks whose processing failed.
+
+Failed WebhookLog rows are put back to 'received' and processed again,
+oldest first per reference. Processing is idempotent, so a charge that has
+since been applied is simply marked 'ignored'.
+
+Usage:
+    python manage.py replay_webhooks                     # Failed logs from the last 7 days, inline
+    python manage.py replay_webhooks --days 30           # Custom window
+    python manage.py replay_webhooks --id 12 --id 15     # Specific logs
+    python manage.py replay_webhooks --queue             # Hand them to Celery workers instead
+    python manage.py replay_webhooks --dry-run           # Preview without changing anything
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from payment_logs.models import WebhookLog
+from shop import webhooks
+
+
+class Command(BaseCommand):
+    help = "Replay failed Paystack webhooks (default: failures from the last 7 days)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Replay failures from this many days back (default: 7)')
+        parser.add_argument('--id', type=int, action='append', dest='ids', help='Replay only this log id (repeatable)')
+        parser.add_argument('--queue', action='store_true', help='Enqueue on Celery instead of processing inline')
+        parser.add_argument('--dry-run', action='store_true', help='List the logs that would be replayed')
+
+    def handle(self, *args, **options):
+        logs = WebhookLog.objects.filter(status='failed', event_type='charge.success').exclude(reference='')
+        if options['ids']:
+            logs = logs.filter(id__in=options['ids'])
+        else:
+            logs = logs.filter(created_at__gte=timezone.now() - timedelta(days=options['days']))
+
+        entries = list(logs.order_by('id').values_list('id', 'reference'))
+        if not entries:
+            self.stdout.write(self.style.SUCCESS("No failed webhooks to replay."))
+            return
+
+        references = sorted({reference for _, reference in entries})
+        self.stdout.write(f"Found {len(entries)} failed webhook(s) across {len(references)} reference(s).")
+
+        if options['dry_run']:
+            for log_id, reference in entries:
+                self.stdout.write(f"  - #{log_id} {reference}")
+            self.stdout.write(self.style.WARNING("[DRY RUN] No changes made."))
+            return
+
+        WebhookLog.objects.filter(id__in=[log_id for log_id, _ in entries]).update(
+            status='received', processing_error=None,
+        )
+
+        if options['queue']:
+            from shop.tasks import process_paystack_webhooks
+            for reference in references:
+                process_paystack_webhooks.delay(reference)
+            self.stdout.write(self.style.SUCCESS(f"Queued {len(references)} reference(s) for processing."))
+            return
+
+        for reference in references:
+            webhooks.process_reference(reference)
+        outcome = dict(
+            WebhookLog.objects.filter(id__in=[log_id for log_id, _ in entries])
+            .order_by().values_list('status').annotate(n=Count('id'))
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "Replay complete: " + ", ".join(f"{n} {s}" for s, n in sorted(outcome.items()))
+        ))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 15:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0015_alter_coupon_discount_percent_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CUSTOMER', 'Customer receipt'), ('ADMIN', 'Admin notification')], max_length=10)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], db_index=True, default='PENDING', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('next_attempt_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emails', to='shop.order')),
+            ],
+            options={
+                'verbose_name': 'Order Email',
+                'verbose_name_plural': 'Order Email Outbox',
+                'ordering': ['-created_at'],
+                'unique_together': {('order', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 16:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_availability(apps, schema_editor):
+    # No product has SKUs yet, so the summary is just the product's own stock.
+    Product = apps.get_model('shop', 'Product')
+    for product in Product.objects.only('id', 'stock').iterator():
+        Product.objects.filter(pk=product.pk).update(availability={
+            'in_stock': product.stock > 0,
+            'total': product.stock,
+            'sizes': {},
+            'skus': [],
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0017_stockreservation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='availability',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.CreateModel(
+            name='ProductSKU',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.CharField(blank=True, default='', help_text='Leave blank if the product has no sizes', max_length=20)),
+                ('color', models.CharField(blank=True, default='', help_text='Leave blank if the product has one colour', max_length=50)),
+                ('stock', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skus', to='shop.product')),
+            ],
+            options={
+                'verbose_name': 'SKU',
+                'verbose_name_plural': 'SKUs',
+                'ordering': ['product', 'size', 'color'],
+                'unique_together': {('product', 'size', 'color')},
+            },
+        ),
+        migrations.AddField(
+            model_name='stockreservation',
+            name='sku',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='shop.productsku'),
+        ),
+        migrations.RunPython(fill_availability, migrations.RunPython.noop),
+    ]
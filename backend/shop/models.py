@@ -1,10 +1,13 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 import uuid
 
+from core import singletons
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True, blank=True)
@@ -27,10 +30,14 @@ class Product(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal('0.01'))])
     image = models.ImageField(upload_to='products/', blank=True, null=True)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     image_color = models.CharField(max_length=50, blank=True, null=True, help_text="Color of the main image (e.g. Black)")
     stock = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True, db_index=True)
     has_sizes = models.BooleanField(default=True, help_text="Show size selector on product page (uncheck for caps, etc.)")
+    # Denormalized stock summary maintained by shop/inventory.py so the catalog
+    # never aggregates SKUs per request: {"in_stock", "total", "sizes", "skus"}.
+    availability = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -62,6 +69,35 @@ class ProductSize(models.Model):
     def __str__(self):
         return f"{self.product.name} - {self.name}"
 
+class ProductSKU(models.Model):
+    """
+    A sellable variant of a product (size x colour) with its own stock.
+
+    Blank size or colour means the SKU covers any value of it (e.g. a cap
+    sold in one size but several colours). When a product has SKUs,
+    Product.stock is the sum of their stock and is kept in step by
+    shop/inventory.py.
+    """
+    product = models.ForeignKey(Product, related_name='skus', on_delete=models.CASCADE)
+    size = models.CharField(max_length=20, blank=True, default='', help_text="Leave blank if the product has no sizes")
+    color = models.CharField(max_length=50, blank=True, default='', help_text="Leave blank if the product has one colour")
+    stock = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['product', 'size', 'color']
+        unique_together = ['product', 'size', 'color']
+        verbose_name = "SKU"
+        verbose_name_plural = "SKUs"
+
+    def __str__(self):
+        return f"{self.product.name} - {self.label}"
+
+    @property
+    def label(self):
+        return " / ".join(v for v in (self.size, self.color) if v) or "Default"
+
+
 class Order(models.Model):
     PAYMENT_METHOD_CHOICES = (
         ('MOMO', 'Mobile Money'),
@@ -126,9 +162,79 @@ class Order(models.Model):
     def __str__(self):
         return f"Order {self.id} - {self.full_name} ({self.status})"
 
+class StockReservation(models.Model):
+    """
+    Inventory held for a PENDING order.
+
+    A hold is active while ``released_at`` is empty and ``expires_at`` is in
+    the future; available stock is ``Product.stock`` minus active holds
+    (shop/inventory.py). Holds are released when the order is paid (stock is
+    decremented instead), fails, or is expired by the cleanup task.
+    """
+    order = models.ForeignKey(Order, related_name='reservations', on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, related_name='reservations', on_delete=models.CASCADE)
+    sku = models.ForeignKey(ProductSKU, related_name='reservations', on_delete=models.CASCADE, null=True, blank=True)
+    size = models.CharField(max_length=20, blank=True, null=True)
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField()
+    released_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Serves the "active holds per product" aggregate.
+            models.Index(
+                fields=['product', 'expires_at'],
+                condition=models.Q(released_at__isnull=True),
+                name='shop_reservation_active_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Hold {self.quantity} x {self.product_id} for Order #{self.order_id}"
+
+class OrderEmail(models.Model):
+    """
+    Outbox entry for a transactional order email.
+
+    Views and admin actions only insert rows (one per order and kind, so a
+    repeated verification never emails twice); Celery workers deliver them in
+    batches over a shared SMTP connection (shop/outbox.py).
+    """
+    KIND_CHOICES = (
+        ('CUSTOMER', 'Customer receipt'),
+        ('ADMIN', 'Admin notification'),
+    )
+
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    )
+
+    order = models.ForeignKey(Order, related_name='emails', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['order', 'kind']
+        verbose_name = "Order Email"
+        verbose_name_plural = "Order Email Outbox"
+
+    def __str__(self):
+        return f"Order #{self.order_id} {self.get_kind_display()} ({self.status})"
+
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='products/variants/')
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     color = models.CharField(max_length=50, blank=True, null=True, help_text="Optional color name (e.g. Red)")
     
     def __str__(self):
@@ -270,6 +376,6 @@ class SiteSettings(models.Model):
 
     @classmethod
     def get(cls):
-        """Return the singleton SiteSettings row, creating it with defaults if absent."""
-        obj, _ = cls.objects.get_or_create(pk=1)
-        return obj
+        """Return the singleton SiteSettings row, creating it with defaults if absent.
+        Served from cache (core/singletons.py); invalidated on save."""
+        return singletons.get(cls)
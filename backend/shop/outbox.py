@@ -0,0 +1,149 @@
+"""
+Order email outbox.
+
+Request handlers and admin actions call queue_order_emails() inside their
+transaction. That inserts one OrderEmail row per (order, kind) — a repeat
+call for the same order is a no-op — and, once the transaction commits,
+hands the new ids to a Celery task. Workers deliver pending rows in batches
+over a single SMTP connection, retrying failures with exponential backoff.
+A Beat sweep picks up anything whose dispatch was lost (broker outage,
+worker restart mid-batch).
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OrderEmail
+from .utils import build_admin_email, build_customer_email
+
+logger = logging.getLogger(__name__)
+
+BUILDERS = {
+    'CUSTOMER': build_customer_email,
+    'ADMIN': build_admin_email,
+}
+
+# A row left in SENDING longer than this belonged to a worker that died.
+STALE_SENDING_AFTER = timedelta(minutes=10)
+
+
+def queue_order_emails(order, *kinds, dispatch=True):
+    """
+    Add outbox rows for ``order`` (idempotent per order and kind).
+    Returns the ids of rows that still need sending.
+    """
+    OrderEmail.objects.bulk_create(
+        [OrderEmail(order=order, kind=kind) for kind in kinds],
+        ignore_conflicts=True,
+    )
+    ids = list(
+        OrderEmail.objects.filter(order=order, kind__in=kinds, status='PENDING')
+        .values_list('id', flat=True)
+    )
+    if dispatch:
+        dispatch_order_emails(ids)
+    return ids
+
+
+def dispatch_order_emails(ids):
+    """Enqueue delivery of ``ids`` once the surrounding transaction commits."""
+    ids = list(ids)
+    if not ids:
+        return
+
+    def _enqueue():
+        from .tasks import send_order_emails
+        try:
+            send_order_emails.delay(ids)
+        except Exception as e:
+            # The rows are safely stored; the periodic sweep will send them.
+            logger.error(f"EMAIL OUTBOX: Could not enqueue {len(ids)} email(s), leaving for sweep: {e}")
+
+    transaction.on_commit(_enqueue)
+
+
+def _claim(ids=None, limit=None):
+    """Atomically move due PENDING rows to SENDING and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        qs = OrderEmail.objects.select_for_update(skip_locked=True).filter(
+            status='PENDING', next_attempt_at__lte=now,
+        ).order_by('next_attempt_at')
+        if ids is not None:
+            qs = qs.filter(id__in=ids)
+        claimed = list(qs.values_list('id', flat=True)[:limit or settings.ORDER_EMAIL_BATCH_SIZE])
+        OrderEmail.objects.filter(id__in=claimed).update(status='SENDING', next_attempt_at=now)
+    return list(
+        OrderEmail.objects.filter(id__in=claimed)
+        .select_related('order')
+        .prefetch_related('order__items__product')
+        .order_by('id')
+    )
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(settings.ORDER_EMAIL_RETRY_BASE * 2 ** (attempts - 1), 60 * 60))
+
+
+def deliver(ids=None):
+    """
+    Send one batch of due emails over a single SMTP connection.
+    Returns ``(sent, failed)`` counts.
+    """
+    entries = _claim(ids)
+    if not entries:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Could not reach the SMTP server at all — every entry counts as an attempt.
+        logger.error(f"EMAIL OUTBOX: SMTP connection failed: {e}")
+        for entry in entries:
+            _record_failure(entry, e)
+        return 0, len(entries)
+
+    try:
+        for entry in entries:
+            try:
+                BUILDERS[entry.kind](entry.order, connection=connection).send(fail_silently=False)
+            except Exception as e:
+                logger.error(f"EMAIL OUTBOX: Order #{entry.order_id} {entry.kind} email failed: {e}")
+                _record_failure(entry, e)
+                failed += 1
+                continue
+            entry.status = 'SENT'
+            entry.attempts += 1
+            entry.sent_at = timezone.now()
+            entry.last_error = ''
+            entry.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+            sent += 1
+    finally:
+        connection.close()
+
+    logger.info(f"EMAIL OUTBOX: Batch done — {sent} sent, {failed} failed.")
+    return sent, failed
+
+
+def _record_failure(entry, error):
+    entry.attempts += 1
+    entry.last_error = str(error)[:2000]
+    if entry.attempts >= settings.ORDER_EMAIL_MAX_ATTEMPTS:
+        entry.status = 'FAILED'
+    else:
+        entry.status = 'PENDING'
+        entry.next_attempt_at = timezone.now() + _backoff(entry.attempts)
+    entry.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+
+
+def release_stale():
+    """Return rows stuck in SENDING (worker died mid-batch) to the queue."""
+    return OrderEmail.objects.filter(
+        status='SENDING', next_attempt_at__lt=timezone.now() - STALE_SENDING_AFTER,
+    ).update(status='PENDING')
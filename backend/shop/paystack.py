@@ -0,0 +1,205 @@
+"""
+Shared Paystack API client.
+
+All calls go through one pooled requests.Session per process, so checkouts
+reuse kept-alive TLS connections instead of opening a new one each time.
+Timeouts are short (settings.PAYSTACK_CONNECT_TIMEOUT / PAYSTACK_READ_TIMEOUT)
+and only idempotent GETs (verify, list) are retried.
+
+A circuit breaker trips after PAYSTACK_BREAKER_THRESHOLD consecutive
+failures (connection errors, timeouts, 5xx). While it is open, calls fail
+immediately with PaystackUnavailable — views turn that into a 503 — instead
+of tying up a worker per request. After PAYSTACK_BREAKER_COOLDOWN seconds one
+trial call is let through; success closes the breaker again.
+
+Per-endpoint latency and error counts are kept in process and reported by
+the health check.
+"""
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class PaystackUnavailable(Exception):
+    """Paystack could not be reached, or the circuit breaker is open."""
+
+
+# =============================================================================
+# Session
+# =============================================================================
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(
+                    total=2,
+                    backoff_factor=0.2,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({'GET'}),
+                    raise_on_status=False,
+                )
+                session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry))
+                session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry))
+                _session = session
+    return _session
+
+
+# =============================================================================
+# Circuit breaker
+# =============================================================================
+
+class CircuitBreaker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= settings.PAYSTACK_BREAKER_COOLDOWN:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("PAYSTACK: Circuit closed — Paystack is responding again.")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= settings.PAYSTACK_BREAKER_THRESHOLD:
+                if self.opened_at is None:
+                    logger.error(f"PAYSTACK: Circuit opened after {self.failures} consecutive failures.")
+                self.opened_at = time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+
+breaker = CircuitBreaker()
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def _record(endpoint, elapsed_ms, error):
+    with _metrics_lock:
+        entry = _metrics.setdefault(endpoint, {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        entry['calls'] += 1
+        entry['errors'] += int(error)
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+
+
+def metrics():
+    """Snapshot of per-endpoint call counts, errors and latency, plus breaker state."""
+    with _metrics_lock:
+        endpoints = {
+            name: {
+                'calls': m['calls'],
+                'errors': m['errors'],
+                'avg_ms': round(m['total_ms'] / m['calls'], 1) if m['calls'] else 0,
+                'max_ms': round(m['max_ms'], 1),
+            }
+            for name, m in _metrics.items()
+        }
+    return {'circuit': breaker.state, 'endpoints': endpoints}
+
+
+def reset_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+# =============================================================================
+# API calls
+# =============================================================================
+
+def _call(endpoint, method, path, **kwargs):
+    if not breaker.allow():
+        _record(endpoint, 0, True)
+        raise PaystackUnavailable("Paystack circuit is open")
+
+    headers = {"Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}"}
+    started = time.perf_counter()
+    try:
+        response = get_session().request(
+            method,
+            f"{settings.PAYSTACK_BASE_URL}{path}",
+            headers=headers,
+            timeout=(settings.PAYSTACK_CONNECT_TIMEOUT, settings.PAYSTACK_READ_TIMEOUT),
+            **kwargs,
+        )
+        if response.status_code >= 500:
+            raise PaystackUnavailable(f"Paystack returned HTTP {response.status_code}")
+        data = response.json()
+    except (requests.exceptions.RequestException, ValueError, PaystackUnavailable) as e:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _record(endpoint, elapsed_ms, True)
+        breaker.record_failure()
+        logger.error(f"PAYSTACK: {endpoint} failed after {elapsed_ms:.0f} ms: {e}")
+        raise PaystackUnavailable(str(e)) from e
+
+    _record(endpoint, (time.perf_counter() - started) * 1000, False)
+    breaker.record_success()
+    return data
+
+
+def initialize_transaction(payload):
+    """POST /transaction/initialize. Not retried — it is not idempotent."""
+    return _call('initialize', 'POST', '/transaction/initialize', json=payload)
+
+
+def verify_transaction(reference):
+    """GET /transaction/verify/<reference>. Retried on 502/503/504."""
+    return _call('verify', 'GET', f'/transaction/verify/{reference}')
+
+
+def list_transactions(page=1, per_page=100, start=None, end=None, status='success'):
+    """GET /transaction — one page of transactions, newest first. Retried like verify."""
+    params = {'page': page, 'perPage': per_page, 'status': status}
+    if start is not None:
+        params['from'] = start.isoformat()
+    if end is not None:
+        params['to'] = end.isoformat()
+    return _call('list', 'GET', '/transaction', params=params)
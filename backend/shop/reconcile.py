@@ -0,0 +1,79 @@
+"""
+Paystack reconciliation.
+
+Catches payments whose browser callback and webhook both went missing:
+successful transactions are pulled from Paystack's transaction list one
+page at a time, matched to orders with one ``IN`` query per page, and
+PENDING orders whose amount matches are completed through the same path as
+VerifyPaymentView._complete_verification. Anything that cannot be applied
+safely is reported, not changed.
+"""
+import logging
+
+from . import paystack
+from .models import Order
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile(start, end=None, per_page=100):
+    """
+    Reconcile successful Paystack transactions created between ``start``
+    and ``end``. Returns a report dict: counts, plus the references that
+    were unmatched or mismatched.
+    """
+    from .views import VerifyPaymentView
+
+    report = {
+        'pages': 0, 'transactions': 0, 'completed': 0, 'already_paid': 0,
+        'unmatched': [], 'mismatched': [],
+    }
+    page = 1
+    while True:
+        res_data = paystack.list_transactions(page=page, per_page=per_page, start=start, end=end)
+        transactions = [
+            t for t in res_data.get('data') or []
+            if t.get('status') == 'success' and t.get('reference')
+        ]
+        report['pages'] += 1
+        report['transactions'] += len(transactions)
+
+        orders = {
+            order.paystack_reference: order
+            for order in Order.objects.filter(paystack_reference__in=[t['reference'] for t in transactions])
+        }
+        for transaction in transactions:
+            reference = transaction['reference']
+            order = orders.get(reference)
+            if order is None:
+                report['unmatched'].append(reference)
+            elif order.status in ('PAID', 'FULFILLED'):
+                report['already_paid'] += 1
+            elif order.status != 'PENDING':
+                # e.g. FAILED by expiry after the money arrived — needs a human.
+                report['mismatched'].append({
+                    'reference': reference, 'order_id': order.id, 'reason': f"order is {order.status}",
+                })
+            elif transaction.get('amount') != int(order.total_amount * 100):
+                report['mismatched'].append({
+                    'reference': reference, 'order_id': order.id,
+                    'reason': f"amount {transaction.get('amount')} != {int(order.total_amount * 100)}",
+                })
+            else:
+                result = VerifyPaymentView()._complete_verification(order)
+                if result.status_code == 200:
+                    report['completed'] += 1
+                    logger.info(f"RECONCILE: Order #{order.id} marked as PAID from reference {reference}")
+                else:
+                    report['mismatched'].append({
+                        'reference': reference, 'order_id': order.id, 'reason': "verification failed",
+                    })
+
+        page_count = (res_data.get('meta') or {}).get('pageCount') or page
+        if not res_data.get('data') or page >= page_count:
+            break
+        page += 1
+
+    for entry in report['mismatched']:
+        logger.critical(f"RECONCILE MISMATCH: Order #{entry['order_id']} ref={entry['reference']}: {entry['reason']}")
+    return report
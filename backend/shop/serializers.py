@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from core.renditions import RenditionsField
 from .models import Category, Product, Order, OrderItem, ProductImage, ProductSize
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -7,9 +9,11 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug']
 
 class ProductImageSerializer(serializers.ModelSerializer):
+    image_renditions = RenditionsField('image')
+
     class Meta:
         model = ProductImage
-        fields = ['id', 'image', 'color']
+        fields = ['id', 'image', 'image_renditions', 'color']
 
 
 class ProductSizeSerializer(serializers.ModelSerializer):
@@ -22,10 +26,11 @@ class ProductSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     images = ProductImageSerializer(many=True, read_only=True)
     sizes = ProductSizeSerializer(many=True, read_only=True)
-    
+    image_renditions = RenditionsField('image')
+
     class Meta:
         model = Product
-        fields = ['id', 'name', 'slug', 'description', 'price', 'image', 'image_color', 'stock', 'is_active', 'has_sizes', 'category', 'images', 'sizes']
+        fields = ['id', 'name', 'slug', 'description', 'price', 'image', 'image_renditions', 'image_color', 'stock', 'is_active', 'has_sizes', 'availability', 'category', 'images', 'sizes']
 
 class OrderItemSerializer(serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
@@ -0,0 +1,50 @@
+"""
+Shop signal handlers.
+
+Keeps the versioned catalog cache (shop/cache.py) in step with the database:
+any create, update or delete on a catalog model bumps the catalog version
+once the surrounding transaction commits. Product and SKU edits also refresh
+the product's denormalized stock summary (shop/inventory.py), and saving
+SiteSettings drops its cached row (core/singletons.py).
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core import singletons
+
+from .cache import bump_catalog_version
+from .inventory import refresh_availability
+from .models import Category, Product, ProductImage, ProductSize, ProductSKU, SiteSettings
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=ProductSize)
+@receiver(post_delete, sender=ProductSize)
+@receiver(post_save, sender=ProductSKU)
+@receiver(post_delete, sender=ProductSKU)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog_cache(sender, **kwargs):
+    # Bump after commit: bumping inside the transaction would let a concurrent
+    # reader cache the old rows under the new version.
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Product)
+def refresh_product_availability(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_availability([instance.pk])
+
+
+@receiver(post_save, sender=ProductSKU)
+@receiver(post_delete, sender=ProductSKU)
+def refresh_sku_availability(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_availability([instance.product_id])
+
+
+singletons.register(SiteSettings)
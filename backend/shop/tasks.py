@@ -20,7 +20,8 @@ logger = logging.getLogger(__name__)
 )
 def expire_pending_orders(self):
     """
-    Mark PENDING orders older than 24 hours as FAILED.
+    Mark PENDING orders older than 24 hours as FAILED and release their
+    stock holds (shop/inventory.py).
 
     Runs every hour via Celery Beat (configured in settings.CELERY_BEAT_SCHEDULE).
     Uses a single atomic UPDATE query — no per-object save() loops, no race conditions.
@@ -30,17 +31,27 @@ def expire_pending_orders(self):
     """
     try:
         # Import inside the task to avoid circular imports at module load time
+        from shop.inventory import release_expired_holds, release_holds
         from shop.models import Order
 
         threshold = timezone.now() - timedelta(hours=24)
 
-        # Single atomic UPDATE — far safer than a queryset loop + save()
-        # because it avoids the TOCTOU race between count() and update().
-        updated = Order.objects.filter(
+        stale_ids = list(Order.objects.filter(
             status='PENDING',
             created_at__lt=threshold
+        ).values_list('id', flat=True))
+
+        # Single UPDATE, re-checking status so an order paid in the meantime
+        # is never failed.
+        updated = Order.objects.filter(
+            id__in=stale_ids,
+            status='PENDING',
         ).update(status='FAILED')
 
+        # Give their held stock back, and tidy holds whose TTL has lapsed.
+        release_holds(stale_ids)
+        release_expired_holds()
+
         if updated == 0:
             logger.info('ORDER CLEANUP: No stale PENDING orders found.')
         else:
@@ -62,3 +73,176 @@ def expire_pending_orders(self):
             exc_info=True
         )
         return 0
+
+
+@shared_task(
+    name='shop.send_order_emails',
+    bind=True,
+    max_retries=0,       # Per-email retries are tracked on the OrderEmail rows themselves
+    ignore_result=True,
+)
+def send_order_emails(self, email_ids=None):
+    """
+    Deliver queued order emails (shop/outbox.py) in batches, reusing one
+    SMTP connection per batch.
+
+    Enqueued right after an order is placed or paid with the new outbox ids;
+    called with no ids by the periodic sweep to send everything that is due.
+    Idempotent: rows are claimed atomically, so overlapping runs never send
+    the same email twice.
+    """
+    try:
+        from shop import outbox
+
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = outbox.deliver(email_ids)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed == 0:
+                break
+
+        if total_sent or total_failed:
+            logger.info(
+                'EMAIL OUTBOX: %d email(s) sent, %d failed (will retry with backoff).',
+                total_sent, total_failed
+            )
+        return total_sent
+
+    except Exception as exc:
+        logger.error(
+            'EMAIL OUTBOX: Task failed with an unexpected error: %s',
+            exc,
+            exc_info=True
+        )
+        return 0
+
+
+@shared_task(
+    name='shop.sweep_order_emails',
+    bind=True,
+    max_retries=0,
+    ignore_result=True,
+)
+def sweep_order_emails(self):
+    """
+    Requeue emails stranded in SENDING by a dead worker and send everything
+    that is due, including retries whose backoff has elapsed.
+
+    Runs every minute via Celery Beat.
+    """
+    try:
+        from shop import outbox
+
+        released = outbox.release_stale()
+        if released:
+            logger.warning('EMAIL OUTBOX: Requeued %d email(s) stuck in SENDING.', released)
+    except Exception as exc:
+        logger.error('EMAIL OUTBOX: Sweep failed: %s', exc, exc_info=True)
+        return 0
+
+    return send_order_emails()
+
+
+@shared_task(
+    name='shop.process_paystack_webhooks',
+    bind=True,
+    max_retries=0,       # Failures are recorded on the WebhookLog row; replay with `replay_webhooks`
+    ignore_result=True,
+)
+def process_paystack_webhooks(self, reference):
+    """
+    Apply the verified Paystack webhooks stored for ``reference``
+    (shop/webhooks.py), oldest first.
+
+    Enqueued by PaystackWebhookView once the log row is committed.
+    Idempotent: rows are locked and moved out of 'received' as they are
+    handled, so duplicate or overlapping runs never apply a charge twice.
+    """
+    try:
+        from shop import webhooks
+
+        processed = webhooks.process_reference(reference)
+        logger.info('WEBHOOK: Processed %d event(s) for %s.', processed, reference)
+        return processed
+
+    except Exception as exc:
+        logger.error(
+            'WEBHOOK: Processing %s failed with an unexpected error: %s',
+            reference, exc,
+            exc_info=True
+        )
+        return 0
+
+
+@shared_task(
+    name='shop.sweep_paystack_webhooks',
+    bind=True,
+    max_retries=0,
+    ignore_result=True,
+)
+def sweep_paystack_webhooks(self):
+    """
+    Process webhook rows still 'received' after their task should have run
+    (broker outage, worker restart).
+
+    Runs every minute via Celery Beat.
+    """
+    try:
+        from shop import webhooks
+
+        references = webhooks.stale_references()
+        for reference in references:
+            webhooks.process_reference(reference)
+        if references:
+            logger.warning('WEBHOOK: Swept %d reference(s) left unprocessed.', len(references))
+        return len(references)
+
+    except Exception as exc:
+        logger.error('WEBHOOK: Sweep failed: %s', exc, exc_info=True)
+        return 0
+
+
+@shared_task(
+    name='shop.reconcile_paystack_payments',
+    bind=True,
+    max_retries=0,
+    ignore_result=True,
+)
+def reconcile_paystack_payments(self):
+    """
+    Complete PENDING Paystack orders whose payment succeeded but whose
+    callback and webhook never arrived (shop/reconcile.py).
+
+    Runs every 15 minutes via Celery Beat over the last
+    PAYSTACK_RECONCILE_WINDOW_HOURS, which is longer than the 24-hour expiry
+    so a paid order is picked up before expire_pending_orders fails it.
+    Idempotent: completed orders are PAID and skipped on the next run.
+    """
+    try:
+        from django.conf import settings
+        from shop.paystack import PaystackUnavailable
+        from shop.reconcile import reconcile
+
+        now = timezone.now()
+        try:
+            report = reconcile(now - timedelta(hours=settings.PAYSTACK_RECONCILE_WINDOW_HOURS), now)
+        except PaystackUnavailable as exc:
+            logger.warning('RECONCILE: Paystack unavailable, skipping this run: %s', exc)
+            return 0
+
+        logger.info(
+            'RECONCILE: %d transaction(s) over %d page(s): %d completed, %d already paid, '
+            '%d unmatched, %d mismatched.',
+            report['transactions'], report['pages'], report['completed'], report['already_paid'],
+            len(report['unmatched']), len(report['mismatched'])
+        )
+        return report['completed']
+
+    except Exception as exc:
+        logger.error(
+            'RECONCILE: Task failed with an unexpected error: %s',
+            exc,
+            exc_info=True
+        )
+        return 0
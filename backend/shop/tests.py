@@ -0,0 +1,643 @@
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.core.cache import caches
+import threading
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core import singletons
+from payment_logs.models import WebhookLog
+
+from . import outbox, paystack, webhooks
+from .reconcile import reconcile
+from .fake_paystack import FakePaystack
+from .inventory import available_stock, decrement_stock
+from .utils import build_admin_email, build_customer_email, get_order_qr_png
+from .models import (
+    Category, Order, OrderEmail, OrderItem, Product, ProductSize, ProductSKU, SiteSettings, StockReservation,
+)
+
+
+class CatalogCacheTests(APITestCase):
+
+    def setUp(self):
+        caches['catalog'].clear()
+        self.category = Category.objects.create(name="Apparel")
+        self.product = Product.objects.create(
+            category=self.category,
+            name="ACES Hoodie",
+            description="Warm hoodie",
+            price=Decimal('150.00'),
+            stock=10,
+        )
+
+    def test_list_is_served_from_cache_without_queries(self):
+        url = reverse('product-list')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+
+    def test_detail_is_served_from_cache_without_queries(self):
+        url = reverse('product-detail', args=[self.product.slug])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()['name'], "ACES Hoodie")
+
+    def test_product_change_invalidates_cached_list(self):
+        url = reverse('product-list')
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.price = Decimal('120.00')
+            self.product.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()['results'][0]['price'], '120.00')
+
+    def test_missing_product_is_not_cached(self):
+        url = reverse('product-detail', args=['does-not-exist'])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_product_list_revalidates_with_etag(self):
+        url = reverse('product-list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+@override_settings(ADMIN_EMAIL='shop-admin@example.com')
+class OrderEmailOutboxTests(TestCase):
+
+    def setUp(self):
+        category = Category.objects.create(name="Apparel")
+        self.product = Product.objects.create(
+            category=category, name="ACES Tee", description="Tee",
+            price=Decimal('80.00'), stock=50,
+        )
+        self.orders = [self._order(i) for i in range(3)]
+
+    def _order(self, i, status='PAID'):
+        order = Order.objects.create(
+            full_name=f"Customer {i}", email=f"customer{i}@example.com", phone="0240000000",
+            address="Hall 7", total_amount=Decimal('80.00'), status=status,
+        )
+        OrderItem.objects.create(order=order, product=self.product, price=Decimal('80.00'), quantity=1)
+        return order
+
+    def test_queueing_is_idempotent_per_order_and_kind(self):
+        order = self.orders[0]
+        outbox.queue_order_emails(order, 'CUSTOMER', 'ADMIN', dispatch=False)
+        outbox.queue_order_emails(order, 'CUSTOMER', dispatch=False)
+        self.assertEqual(order.emails.count(), 2)
+
+    def test_batch_is_sent_over_one_connection(self):
+        for order in self.orders:
+            outbox.queue_order_emails(order, 'CUSTOMER', 'ADMIN', dispatch=False)
+
+        with mock.patch.object(outbox, 'get_connection', wraps=outbox.get_connection) as get_connection:
+            sent, failed = outbox.deliver()
+
+        self.assertEqual((sent, failed), (6, 0))
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 6)
+        self.assertFalse(OrderEmail.objects.exclude(status='SENT').exists())
+        # Nothing left to send.
+        self.assertEqual(outbox.deliver(), (0, 0))
+
+    @override_settings(ORDER_EMAIL_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        ids = outbox.queue_order_emails(self.orders[0], 'CUSTOMER', dispatch=False)
+        broken = mock.Mock(side_effect=RuntimeError("SMTP 421"))
+
+        with mock.patch.dict(outbox.BUILDERS, {'CUSTOMER': broken}):
+            self.assertEqual(outbox.deliver(), (0, 1))
+            email = OrderEmail.objects.get(id=ids[0])
+            self.assertEqual(email.status, 'PENDING')
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            # Not due yet.
+            self.assertEqual(outbox.deliver(), (0, 0))
+
+            OrderEmail.objects.filter(id=ids[0]).update(next_attempt_at=timezone.now())
+            outbox.deliver()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'FAILED')
+        self.assertEqual(email.attempts, 2)
+        self.assertIn("SMTP 421", email.last_error)
+
+    def test_bulk_mark_as_paid_dispatches_one_batch(self):
+        pending = [self._order(i, status='PENDING') for i in range(5)]
+        admin_user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(admin_user)
+
+        with mock.patch('shop.tasks.send_order_emails.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('admin:shop_order_changelist'), {
+                    'action': 'mark_as_paid',
+                    '_selected_action': [o.pk for o in pending],
+                })
+
+        self.assertEqual(delay.call_count, 1)
+        self.assertEqual(len(delay.call_args.args[0]), 5)
+        self.assertEqual(OrderEmail.objects.filter(kind='CUSTOMER', status='PENDING').count(), 5)
+
+
+class OrderEmailRenderingTests(TestCase):
+
+    def setUp(self):
+        category = Category.objects.create(name="Apparel")
+        self.order = Order.objects.create(
+            full_name="Ama <Serwaa>", email="ama@example.com", phone="0240000000",
+            address="Hall 7", total_amount=Decimal('240.00'), status='PAID',
+            verification_code="c0ffee-code",
+        )
+        for i in range(20):
+            product = Product.objects.create(
+                category=category, name=f"Item {i}", description="x", price=Decimal('12.00'), stock=5,
+            )
+            OrderItem.objects.create(order=self.order, product=product, price=product.price, quantity=1)
+
+    def test_items_and_products_load_in_one_query(self):
+        for builder in (build_customer_email, build_admin_email):
+            order = Order.objects.get(pk=self.order.pk)
+            with self.assertNumQueries(1):
+                email = builder(order)
+            html = email.alternatives[0][0]
+            self.assertIn("Item 19", html)
+            self.assertIn("Ama &lt;Serwaa&gt;", html)
+
+    def test_receipt_embeds_memoized_qr_code(self):
+        email = build_customer_email(self.order)
+        content_ids = [part['Content-ID'] for part in email.attachments]
+        self.assertIn('<order_qr>', content_ids)
+        self.assertIs(get_order_qr_png("c0ffee-code"), get_order_qr_png("c0ffee-code"))
+
+
+class StockDecrementTests(TestCase):
+
+    def setUp(self):
+        category = Category.objects.create(name="Apparel")
+        self.products = [
+            Product.objects.create(
+                category=category, name=f"Drop {i}", description="x", price=Decimal('10.00'), stock=5,
+            )
+            for i in range(3)
+        ]
+        self.order = Order.objects.create(
+            full_name="Kofi", email="kofi@example.com", phone="0240000000",
+            address="Hall 7", total_amount=Decimal('30.00'),
+        )
+        for product in self.products:
+            OrderItem.objects.create(order=self.order, product=product, price=product.price, quantity=2)
+        # Same product twice in one order (different colours).
+        OrderItem.objects.create(order=self.order, product=self.products[0], price=Decimal('10.00'), quantity=1)
+
+    def test_one_locking_read_and_one_update(self):
+        items = list(self.order.items.all())
+        with self.assertNumQueries(2):
+            decrement_stock(items)
+        stocks = [Product.objects.get(pk=p.pk).stock for p in self.products]
+        self.assertEqual(stocks, [2, 3, 3])
+
+    def test_underflow_clamps_to_zero(self):
+        Product.objects.filter(pk=self.products[1].pk).update(stock=1)
+        decrement_stock(self.order.items.all())
+        self.assertEqual(Product.objects.get(pk=self.products[1].pk).stock, 0)
+        self.assertEqual(Product.objects.get(pk=self.products[2].pk).stock, 3)
+
+    def test_sequential_orders_each_cost_two_queries_and_lose_nothing(self):
+        product = self.products[2]
+        for i in range(4):
+            order = Order.objects.create(
+                full_name=f"Buyer {i}", email=f"buyer{i}@example.com", phone="0240000000",
+                address="Hall 7", total_amount=Decimal('10.00'),
+            )
+            OrderItem.objects.create(order=order, product=product, price=product.price, quantity=1)
+            items = list(order.items.all())
+            with transaction.atomic(), self.assertNumQueries(2):
+                decrement_stock(items)
+        self.assertEqual(Product.objects.get(pk=product.pk).stock, 1)
+
+    def test_update_applies_to_current_stock_not_the_read(self):
+        # Another writer changes stock between the locked read and the UPDATE
+        # (only possible where SELECT ... FOR UPDATE is a no-op, as on SQLite).
+        concurrent = {
+            self.products[0].pk: 4,  # still enough for the 3 ordered
+            self.products[1].pk: 1,  # now short of the 2 ordered
+        }
+        state = {'done': False}
+
+        def other_writer(execute, sql, params, many, context):
+            if not state['done'] and sql.startswith('UPDATE "shop_product"'):
+                state['done'] = True
+                for pk, stock in concurrent.items():
+                    Product.objects.filter(pk=pk).update(stock=stock)
+            return execute(sql, params, many, context)
+
+        items = list(self.order.items.all())
+        with connection.execute_wrapper(other_writer):
+            decrement_stock(items)
+
+        stocks = [Product.objects.get(pk=p.pk).stock for p in self.products]
+        self.assertEqual(stocks, [1, 0, 3])
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class StockDecrementConcurrencyTests(TransactionTestCase):
+    """
+    Many verifications racing on one product must never lose an update.
+    Needs real row locks (PostgreSQL); StockDecrementTests covers the same
+    guarantees sequentially everywhere.
+    """
+
+    THREADS = 20
+
+    def test_parallel_decrements_are_serialized(self):
+        category = Category.objects.create(name="Drops")
+        product = Product.objects.create(
+            category=category, name="Limited Hoodie", description="x",
+            price=Decimal('200.00'), stock=self.THREADS * 2,
+        )
+        orders = []
+        for i in range(self.THREADS):
+            order = Order.objects.create(
+                full_name=f"Buyer {i}", email=f"buyer{i}@example.com", phone="0240000000",
+                address="Hall 7", total_amount=Decimal('200.00'),
+            )
+            OrderItem.objects.create(order=order, product=product, price=product.price, quantity=1)
+            orders.append(order)
+
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def verify(order):
+            try:
+                barrier.wait()
+                with transaction.atomic():
+                    decrement_stock(order.items.all())
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=verify, args=(order,)) for order in orders]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        product.refresh_from_db()
+        self.assertEqual(product.stock, self.THREADS)
+
+
+class StockReservationTests(APITestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        category = Category.objects.create(name="Drops")
+        self.product = Product.objects.create(
+            category=category, name="Limited Hoodie", description="x", price=Decimal('200.00'), stock=3,
+        )
+        self.url = reverse('create-order')
+
+    def _checkout(self, email, quantity):
+        return self.client.post(self.url, {
+            'items': [{'id': self.product.id, 'quantity': quantity, 'size': 'L'}],
+            'user_details': {
+                'full_name': "Buyer", 'email': email, 'phone': "0240000000", 'address': "Hall 7",
+            },
+            'payment_method': 'MOMO',
+        }, format='json')
+
+    def test_checkout_holds_stock_and_prevents_oversell(self):
+        self.assertEqual(self._checkout("a@example.com", 2).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(available_stock([self.product.id]), {self.product.id: 1})
+
+        response = self._checkout("b@example.com", 2)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("only has 1 in stock", response.json()['error'])
+        # The rejected checkout left nothing behind.
+        self.assertEqual(Order.objects.count(), 1)
+
+        availability = self.client.get(reverse('product-availability'), {'ids': str(self.product.id)})
+        self.assertEqual(availability.json(), {str(self.product.id): 1})
+
+    def test_expired_holds_do_not_count(self):
+        self._checkout("a@example.com", 3)
+        StockReservation.objects.update(expires_at=timezone.now())
+        self.assertEqual(self._checkout("b@example.com", 3).status_code, status.HTTP_201_CREATED)
+
+    def test_expire_task_releases_holds(self):
+        from .tasks import expire_pending_orders
+
+        self._checkout("a@example.com", 3)
+        Order.objects.update(created_at=timezone.now() - timedelta(hours=25))
+        expire_pending_orders()
+
+        self.assertEqual(Order.objects.get().status, 'FAILED')
+        self.assertEqual(available_stock([self.product.id]), {self.product.id: 3})
+
+
+class ProductSKUTests(APITestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        category = Category.objects.create(name="Apparel")
+        self.product = Product.objects.create(
+            category=category, name="ACES Jersey", description="x", price=Decimal('150.00'), stock=0,
+        )
+        ProductSize.objects.create(product=self.product, name="M")
+        ProductSize.objects.create(product=self.product, name="L")
+        self.medium = ProductSKU.objects.create(product=self.product, size="M", color="Black", stock=2)
+        self.large = ProductSKU.objects.create(product=self.product, size="L", color="Black", stock=1)
+
+    def _checkout(self, email, size, quantity=1):
+        return self.client.post(reverse('create-order'), {
+            'items': [{'id': self.product.id, 'quantity': quantity, 'size': size, 'color': 'Black'}],
+            'user_details': {
+                'full_name': "Buyer", 'email': email, 'phone': "0240000000", 'address': "Hall 7",
+            },
+            'payment_method': 'MOMO',
+        }, format='json')
+
+    def test_product_stock_and_summary_follow_skus(self):
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 3)
+        self.assertEqual(self.product.availability['sizes'], {'M': 2, 'L': 1})
+        self.assertTrue(self.product.availability['in_stock'])
+
+        response = self.client.get(reverse('product-detail', args=[self.product.slug]))
+        self.assertEqual(response.json()['availability']['total'], 3)
+
+    def test_checkout_is_validated_per_size(self):
+        response = self._checkout("a@example.com", "L", quantity=2)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("(L / Black)' only has 1 in stock", response.json()['error'])
+
+        self.assertEqual(self._checkout("a@example.com", "L").status_code, status.HTTP_201_CREATED)
+        # L is now held; M is unaffected.
+        self.assertEqual(self._checkout("b@example.com", "L").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._checkout("c@example.com", "M").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(StockReservation.objects.filter(sku=self.large).count(), 1)
+
+    def test_unknown_variant_is_rejected(self):
+        response = self._checkout("a@example.com", "XXL")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("XXL / Black", response.json()['error'])
+
+    def test_decrement_updates_sku_and_size_flags(self):
+        order = Order.objects.create(
+            full_name="Kofi", email="kofi@example.com", phone="0240000000",
+            address="Hall 7", total_amount=Decimal('150.00'),
+        )
+        OrderItem.objects.create(
+            order=order, product=self.product, price=self.product.price, quantity=1,
+            selected_size="l", selected_color="black",
+        )
+        decrement_stock(order.items.all())
+
+        self.large.refresh_from_db()
+        self.product.refresh_from_db()
+        self.assertEqual(self.large.stock, 0)
+        self.assertEqual(self.product.stock, 2)
+        self.assertEqual(self.product.availability['sizes'], {'M': 2, 'L': 0})
+        self.assertFalse(ProductSize.objects.get(product=self.product, name="L").is_available)
+        self.assertTrue(ProductSize.objects.get(product=self.product, name="M").is_available)
+
+
+@override_settings(PAYSTACK_SECRET_KEY='sk_test_webhook', PAYSTACK_WEBHOOK_ASYNC=True)
+class PaystackWebhookQueueTests(APITestCase):
+
+    def setUp(self):
+        category = Category.objects.create(name="Apparel")
+        product = Product.objects.create(
+            category=category, name="ACES Tee", description="x", price=Decimal('50.00'), stock=5,
+        )
+        self.order = Order.objects.create(
+            full_name="Ama", email="ama@example.com", phone="0240000000", address="Hall 7",
+            total_amount=Decimal('50.00'), paystack_reference="ref-123",
+        )
+        OrderItem.objects.create(order=self.order, product=product, price=product.price, quantity=1)
+        self.url = reverse('paystack-webhook')
+
+    def _deliver(self, event='charge.success', amount=5000, signature=None):
+        body = json.dumps({'event': event, 'data': {'reference': "ref-123", 'amount': amount}}).encode()
+        if signature is None:
+            signature = hmac.new(b'sk_test_webhook', body, hashlib.sha512).hexdigest()
+        return self.client.post(
+            self.url, body, content_type='application/json', HTTP_X_PAYSTACK_SIGNATURE=signature,
+        )
+
+    def test_ingest_stores_once_and_queues(self):
+        with mock.patch('shop.tasks.process_paystack_webhooks.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertNumQueries(2):  # INSERT + pending check
+                    response = self._deliver()
+        self.assertEqual(response.json(), {'status': 'queued'})
+        delay.assert_called_once_with("ref-123")
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'PENDING')
+
+        webhooks.process_reference("ref-123")
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'PAID')
+        self.assertEqual(WebhookLog.objects.get().status, 'processed')
+
+    def test_duplicate_deliveries_queue_once_and_apply_once(self):
+        with mock.patch('shop.tasks.process_paystack_webhooks.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._deliver()
+                self._deliver()
+        delay.assert_called_once_with("ref-123")
+
+        self.assertEqual(webhooks.process_reference("ref-123"), 2)
+        statuses = list(WebhookLog.objects.order_by('id').values_list('status', flat=True))
+        self.assertEqual(statuses, ['processed', 'ignored'])
+        self.assertEqual(Product.objects.get().stock, 4)
+
+    def test_bad_signature_is_logged_and_not_queued(self):
+        with mock.patch('shop.tasks.process_paystack_webhooks.delay') as delay:
+            response = self._deliver(signature="forged")
+        self.assertEqual(response.json(), {'status': 'invalid_signature'})
+        delay.assert_not_called()
+        log = WebhookLog.objects.get()
+        self.assertEqual((log.status, log.reference), ('ignored', "ref-123"))
+
+    @override_settings(PAYSTACK_WEBHOOK_ASYNC=False)
+    def test_inline_mode_processes_immediately(self):
+        self.assertEqual(self._deliver().json(), {'status': 'processed'})
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'PAID')
+
+    def test_replay_command_retries_failed_logs(self):
+        with mock.patch('shop.tasks.process_paystack_webhooks.delay'):
+            self._deliver(amount=100)
+        webhooks.process_reference("ref-123")
+        self.assertEqual(WebhookLog.objects.get().status, 'failed')
+
+        # The payload is corrected upstream; replay picks the log up again.
+        WebhookLog.objects.update(payload={'event': 'charge.success', 'data': {'reference': "ref-123", 'amount': 5000}})
+        call_command('replay_webhooks', stdout=mock.MagicMock())
+        self.assertEqual(WebhookLog.objects.get().status, 'processed')
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'PAID')
+
+
+@override_settings(PAYSTACK_SECRET_KEY='sk_test_fake', PAYSTACK_BREAKER_THRESHOLD=2, PAYSTACK_BREAKER_COOLDOWN=60)
+class PaystackClientTests(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.fake = FakePaystack().start()
+        cls.addClassCleanup(cls.fake.stop)
+
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        self.fake.requests.clear()
+        paystack.breaker.reset()
+        paystack.reset_metrics()
+        self.addCleanup(paystack.breaker.reset)
+        settings_override = override_settings(PAYSTACK_BASE_URL=self.fake.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        category = Category.objects.create(name="Apparel")
+        self.product = Product.objects.create(
+            category=category, name="ACES Cap", description="x", price=Decimal('40.00'), stock=10,
+        )
+
+    def _checkout(self, email="ama@example.com"):
+        return self.client.post(reverse('create-order'), {
+            'items': [{'id': self.product.id, 'quantity': 1}],
+            'user_details': {
+                'full_name': "Ama", 'email': email, 'phone': "0240000000", 'address': "Hall 7",
+            },
+            'payment_method': 'PAYSTACK',
+        }, format='json')
+
+    def test_checkout_and_verify_through_client(self):
+        response = self._checkout()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        reference = response.json()['reference']
+        self.assertEqual(Order.objects.get().paystack_reference, reference)
+
+        # A transient 503 on verify is retried transparently.
+        self.fake.mark_paid(reference, amount=4000)
+        self.fake.fail_next(1, status=503)
+        response = self.client.get(reverse('verify-payment'), {'reference': reference})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Order.objects.get().status, 'PAID')
+        self.assertEqual(self.fake.requests.count(('GET', f'/transaction/verify/{reference}')), 2)
+
+    def test_circuit_opens_and_fails_fast(self):
+        self.fake.fail_next(2, status=500)
+        for email in ("a@example.com", "b@example.com"):
+            self.assertEqual(self._checkout(email).status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(paystack.breaker.state, 'open')
+
+        # Open circuit: Paystack is not contacted at all.
+        self.assertEqual(self._checkout("c@example.com").status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(len(self.fake.requests), 2)
+        self.assertEqual(paystack.metrics()['endpoints']['initialize']['errors'], 3)
+
+        # After the cooldown one trial call goes through and closes the circuit.
+        paystack.breaker.opened_at -= 60
+        self.assertEqual(self._checkout("d@example.com").status_code, status.HTTP_200_OK)
+        self.assertEqual(paystack.breaker.state, 'closed')
+
+
+@override_settings(PAYSTACK_SECRET_KEY='sk_test_fake')
+class PaystackReconcileTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.fake = FakePaystack().start()
+        cls.addClassCleanup(cls.fake.stop)
+
+    def setUp(self):
+        self.fake.transactions.clear()
+        paystack.breaker.reset()
+        settings_override = override_settings(PAYSTACK_BASE_URL=self.fake.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        category = Category.objects.create(name="Apparel")
+        product = Product.objects.create(
+            category=category, name="ACES Tee", description="x", price=Decimal('50.00'), stock=20,
+        )
+        self.orders = []
+        for i in range(5):
+            order = Order.objects.create(
+                full_name="Ama", email=f"ama{i}@example.com", phone="0240000000", address="Hall 7",
+                total_amount=Decimal('50.00'), paystack_reference=f"ref-{i}",
+            )
+            OrderItem.objects.create(order=order, product=product, price=product.price, quantity=1)
+            self.orders.append(order)
+
+    def test_paid_orders_are_completed_page_by_page(self):
+        for i in range(3):
+            self.fake.mark_paid(f"ref-{i}", amount=5000)
+        self.fake.mark_paid("ref-3", amount=100)      # short payment
+        self.fake.mark_paid("ref-unknown", amount=5000)
+        Order.objects.filter(pk=self.orders[2].pk).update(status='PAID')
+
+        # 5 transactions over 3 pages: one list call and one IN query per page.
+        report = reconcile(timezone.now() - timedelta(days=1), per_page=2)
+
+        self.assertEqual(report['pages'], 3)
+        self.assertEqual((report['completed'], report['already_paid']), (2, 1))
+        self.assertEqual(report['unmatched'], ["ref-unknown"])
+        self.assertEqual([m['reference'] for m in report['mismatched']], ["ref-3"])
+        statuses = list(Order.objects.order_by('id').values_list('status', flat=True))
+        self.assertEqual(statuses, ['PAID', 'PAID', 'PAID', 'PENDING', 'PENDING'])
+        self.assertEqual(len([r for r in self.fake.requests if r[1].startswith('/transaction?')]), 3)
+
+        # A second run changes nothing.
+        self.assertEqual(reconcile(timezone.now() - timedelta(days=1))['completed'], 0)
+
+
+class SiteSettingsCacheTests(APITestCase):
+
+    def setUp(self):
+        singletons.invalidate(SiteSettings)
+        self.addCleanup(singletons.invalidate, SiteSettings)
+        self.url = reverse('shop-status')
+
+    def test_kill_switch_costs_no_query(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.client.get(self.url).json()['is_open'])
+
+    def test_closing_the_shop_takes_effect_immediately(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            settings_obj = SiteSettings.objects.get(pk=1)
+            settings_obj.is_shop_open = False
+            settings_obj.save()
+        self.assertFalse(self.client.get(self.url).json()['is_open'])
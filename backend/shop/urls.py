@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     path('status/', views.ShopStatusView.as_view(), name='shop-status'),
     path('products/', views.ProductListView.as_view(), name='product-list'),
+    path('products/availability/', views.ProductAvailabilityView.as_view(), name='product-availability'),
     path('products/<slug:slug>/', views.ProductDetailView.as_view(), name='product-detail'),
     path('orders/create/', views.CreateOrderView.as_view(), name='create-order'),
     path('verify-payment/', views.VerifyPaymentView.as_view(), name='verify-payment'),
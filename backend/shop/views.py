@@ -2,19 +2,16 @@
 Shop views — Production-hardened (Feb 2026 Audit)
 Payment deduplication patch (Feb 18, 2026)
 """
-import hmac
-import hashlib
 import logging
-import threading
 import uuid
 from datetime import timedelta
 
-import requests
 from decimal import Decimal
 
 from django.conf import settings
 from django.db import transaction
 from django.db.models import F
+from django.http import HttpResponse
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
@@ -22,9 +19,14 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
+
+from . import cache as catalog_cache, paystack, webhooks
 from .models import Product, Category, Order, OrderItem, Coupon, SiteSettings
 from .serializers import ProductSerializer, CategorySerializer, OrderSerializer
-from .utils import send_customer_email, send_admin_email
+from .inventory import InsufficientStock, available_stock, decrement_stock, release_holds, reserve_stock
+from .outbox import queue_order_emails
 from payment_logs.models import WebhookLog
 
 logger = logging.getLogger(__name__)
@@ -32,23 +34,69 @@ logger = logging.getLogger(__name__)
 
 # =============================================================================
 # Product Views (FIX: N+1 queries via select_related / prefetch_related)
+# Responses are served from the versioned catalog cache (shop/cache.py).
 # =============================================================================
 
-class ProductListView(generics.ListAPIView):
-    """List all active products with related data pre-fetched."""
+class CatalogCacheMixin:
+    """
+    Serve rendered JSON from the catalog cache, rendering and storing it on a miss.
+    Non-JSON renderers (e.g. the browsable API) bypass the cache.
+    """
+    catalog_cache_kind = None
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        key = catalog_cache.response_key(request, self.catalog_cache_kind)
+        body = catalog_cache.get_response(key)
+        if body is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            body = request.accepted_renderer.render(
+                response.data, request.accepted_media_type, self.get_renderer_context()
+            )
+            catalog_cache.set_response(key, body)
+
+        return HttpResponse(body, content_type=request.accepted_renderer.media_type)
+
+
+class CatalogPagination(KeysetPagination):
+    # The merch catalog is small; one page normally holds all of it.
+    page_size = 48
+    ordering = ('id',)
+
+
+class ProductListView(ConditionalGetMixin, CatalogCacheMixin, generics.ListAPIView):
+    """List all active products with related data pre-fetched, in keyset pages."""
     queryset = Product.objects.filter(is_active=True).select_related(
         'category'
     ).prefetch_related('images', 'sizes')
     serializer_class = ProductSerializer
+    pagination_class = CatalogPagination
+    catalog_cache_kind = 'list'
 
+    def get_validator(self):
+        # The catalog version already changes on every catalog write,
+        # so revalidation needs no database query.
+        return f'catalog-{catalog_cache.get_catalog_version()}', None
 
-class ProductDetailView(generics.RetrieveAPIView):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+
+class ProductDetailView(CatalogCacheMixin, generics.RetrieveAPIView):
     """Retrieve a single product by slug with related data pre-fetched."""
     queryset = Product.objects.filter(is_active=True).select_related(
         'category'
     ).prefetch_related('images', 'sizes')
     serializer_class = ProductSerializer
     lookup_field = 'slug'
+    catalog_cache_kind = 'detail'
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
 
 
 # =============================================================================
@@ -154,12 +202,7 @@ class CreateOrderView(APIView):
                 if not product:
                     continue
                 quantity = int(cart_item.get('quantity', 1))
-                # Check Stock
-                if product.stock < quantity:
-                    return Response(
-                        {"error": f"Product '{product.name}' only has {product.stock} in stock (requested {quantity})"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+                # Stock is checked once, against held stock, by reserve_stock() below.
                 color = cart_item.get('color')
                 size = cart_item.get('size')
                 price = product.price
@@ -168,6 +211,7 @@ class CreateOrderView(APIView):
 
             # 2. Handle Coupon Code & Create or Reuse Order + Items ATOMICALLY
             coupon_code = data.get('coupon_code', '').strip().upper()
+            payment_method = data.get('payment_method', 'MOMO')
 
             with transaction.atomic():
                 coupon = None
@@ -263,16 +307,25 @@ class CreateOrderView(APIView):
                         for product, quantity, price, color, size in order_items_data
                     ])
 
+                # Hold stock for this order under row locks, so concurrent
+                # checkouts for a limited drop cannot oversell.
+                try:
+                    reserve_stock(
+                        order,
+                        [(product, quantity, size, color) for product, quantity, _, color, size in order_items_data],
+                        payment_method,
+                    )
+                except InsufficientStock as e:
+                    transaction.set_rollback(True)
+                    return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
             # --- MoMo Payment Path ---
-            payment_method = data.get('payment_method', 'MOMO')
             order.payment_method = payment_method
             order.save(update_fields=['payment_method'])
 
             if payment_method == 'MOMO':
-                # Send admin notification in background
-                threading.Thread(
-                    target=send_admin_email, args=(order,), daemon=True
-                ).start()
+                # Queue admin notification (delivered by a Celery worker)
+                queue_order_emails(order, 'ADMIN')
 
                 return Response({
                     'order_id': order.id,
@@ -286,13 +339,7 @@ class CreateOrderView(APIView):
                     'message': 'Order placed! Please send payment via MoMo.'
                 }, status=status.HTTP_201_CREATED)
 
-            # 4. Initialize Paystack Transaction
-            paystack_url = "https://api.paystack.co/transaction/initialize"
-            headers = {
-                "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
-                "Content-Type": "application/json"
-            }
-
+            # 4. Initialize Paystack Transaction (pooled client, shop/paystack.py)
             amount_kobo = int(total_amount * 100)
 
             try:
@@ -348,8 +395,7 @@ class CreateOrderView(APIView):
             # REAL PAYSTACK CALL
             # ---------------------------------------------------------------
             try:
-                response = requests.post(paystack_url, json=payload, headers=headers, timeout=15)
-                res_data = response.json()
+                res_data = paystack.initialize_transaction(payload)
 
                 if res_data.get('status'):
                     authorization_url = res_data['data']['authorization_url']
@@ -372,9 +418,10 @@ class CreateOrderView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
 
-            except requests.exceptions.RequestException as e:
+            except paystack.PaystackUnavailable as e:
                 # FIX: In production, do NOT fall back to mock mode.
                 # Return a proper error so the frontend can show a retry message.
+                # Also raised at once while the circuit breaker is open.
                 logger.error(f"PAYSTACK CONNECTION ERROR: {e}")
                 return Response(
                     {"error": "Payment service temporarily unavailable. Please try again in a moment."},
@@ -405,14 +452,8 @@ class VerifyPaymentView(APIView):
                 return Response({"error": "Order not found for mock reference"}, status=status.HTTP_404_NOT_FOUND)
 
         # REAL PAYSTACK VERIFICATION
-        paystack_url = f"https://api.paystack.co/transaction/verify/{reference}"
-        headers = {
-            "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
-        }
-
         try:
-            response = requests.get(paystack_url, headers=headers, timeout=15)
-            res_data = response.json()
+            res_data = paystack.verify_transaction(reference)
 
             if res_data.get('status') and res_data['data']['status'] == 'success':
                 try:
@@ -438,7 +479,7 @@ class VerifyPaymentView(APIView):
             else:
                 return Response({"error": "Payment verification failed"}, status=status.HTTP_400_BAD_REQUEST)
 
-        except requests.exceptions.RequestException as e:
+        except paystack.PaystackUnavailable as e:
             logger.error(f"PAYSTACK VERIFY ERROR: {e}")
             return Response(
                 {"error": "Could not verify payment. Please try again."},
@@ -461,44 +502,22 @@ class VerifyPaymentView(APIView):
                         "order": serializer.data
                     }, status=status.HTTP_200_OK)
 
-                # Decrement Stock
-                order_items = current_order.items.select_related('product').all()
-
-                for item in order_items:
-                    product = Product.objects.select_for_update().get(id=item.product.id)
-                    if product.stock >= item.quantity:
-                        product.stock -= item.quantity
-                    else:
-                        logger.warning(
-                            f"STOCK UNDERFLOW: Product #{product.id} ({product.name}) "
-                            f"had {product.stock} but order needed {item.quantity}. "
-                            f"Setting stock to 0."
-                        )
-                        product.stock = 0
-                    product.save()
+                # Decrement Stock (one locked read + one bulk UPDATE); the
+                # order's holds are consumed by the decrement.
+                decrement_stock(current_order.items.all())
+                release_holds([current_order.id])
 
                 current_order.status = 'PAID'
                 current_order.verification_code = str(uuid.uuid4())
                 current_order.save()
 
+                # Queue emails in the same transaction; a worker sends them after commit
+                queue_order_emails(current_order, 'CUSTOMER', 'ADMIN')
+
         except Exception as e:
             logger.error(f"VERIFICATION DB ERROR: {e}", exc_info=True)
             return Response({"error": "Payment verification failed. Please contact support."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        # Send Emails (Async / Non-blocking)
-        def run_safe_email(func, order):
-            try:
-                func(order)
-            except Exception as e:
-                logger.error(f"EMAIL THREAD ERROR ({func.__name__}): {e}")
-
-        t_customer = threading.Thread(target=run_safe_email, args=(send_customer_email, current_order))
-        t_admin = threading.Thread(target=run_safe_email, args=(send_admin_email, current_order))
-        t_customer.daemon = True
-        t_admin.daemon = True
-        t_customer.start()
-        t_admin.start()
-
         serializer = OrderSerializer(current_order)
         return Response({
             "message": "Payment verified successfully",
@@ -508,6 +527,7 @@ class VerifyPaymentView(APIView):
 
 # =============================================================================
 # Paystack Webhook (already hardened with WebhookLog)
+# Processing lives in shop/webhooks.py so Celery workers can run it.
 # =============================================================================
 
 class PaystackWebhookView(APIView):
@@ -541,180 +561,84 @@ class PaystackWebhookView(APIView):
             raw_body = b''
 
         # =====================================================================
-        # STEP 1: Log the Raw Request (The "Inbox" Step)
-        # This ALWAYS succeeds first so we have a record of every webhook hit.
+        # STEP 1: Extract event metadata and verify the signature (HMAC-SHA512)
+        # Nothing here touches the database, so the log row below is written
+        # exactly once with everything the admin dashboard shows.
         # =====================================================================
         client_ip = request.META.get('HTTP_X_FORWARDED_FOR', request.META.get('REMOTE_ADDR', ''))
 
-        log_entry = WebhookLog.objects.create(
-            provider='paystack',
-            payload=request.data,
-            headers={k: v for k, v in request.headers.items()
-                     if k.lower() not in ('authorization', 'cookie')},
-            ip_address=client_ip.split(',')[0].strip() if client_ip else None
-        )
-
-        # =====================================================================
-        # STEP 2: Extract event metadata EARLY
-        # Parse event_type and reference BEFORE signature verification so that
-        # ALL log entries (even failed/ignored ones) show what event arrived.
-        # This fixes the empty reference/event_type issue in the admin dashboard.
-        # =====================================================================
         event_type = ''
-        data = {}
         reference = ''
         try:
             event_type = request.data.get('event', '') or ''
             data = request.data.get('data', {}) or {}
             reference = data.get('reference', '') or ''
-            log_entry.event_type = event_type
-            log_entry.reference = reference
-            log_entry.save()
         except Exception as meta_err:
             # If parsing fails, log but continue with empty values.
-            # The log entry already has the raw payload for manual inspection.
+            # The log entry still gets the raw payload for manual inspection.
             logger.warning(f"WEBHOOK: Failed to extract event metadata: {meta_err}")
 
-        # =====================================================================
-        # MASTER SAFETY NET
-        # Everything below is wrapped in a try-except so that ANY unhandled
-        # error (e.g., PAYSTACK_SECRET_KEY is None, database timeout, etc.)
-        # still returns HTTP 200. This prevents Paystack from retrying
-        # endlessly due to our server errors.
-        # =====================================================================
+        log_status, error, result = 'received', None, 'queued'
         try:
-            # =================================================================
-            # STEP 3: Verify Webhook Signature (HMAC-SHA512)
-            # =================================================================
             paystack_signature = request.headers.get('x-paystack-signature', '')
-
             if not paystack_signature:
                 logger.warning(f"WEBHOOK: Missing signature header for {event_type} ref={reference}")
-                log_entry.status = 'ignored'
-                log_entry.processing_error = "Missing signature header"
-                log_entry.save()
-                return Response({"status": "missing_signature"}, status=status.HTTP_200_OK)
-
-            secret = settings.PAYSTACK_SECRET_KEY.encode('utf-8')
-            computed_signature = hmac.new(
-                secret,
-                raw_body,  # Use pre-cached raw bytes — NOT request.body (stream already consumed)
-                hashlib.sha512
-            ).hexdigest()
-
-            if not hmac.compare_digest(paystack_signature, computed_signature):
+                log_status, error, result = 'ignored', "Missing signature header", 'missing_signature'
+            elif not webhooks.signature_is_valid(raw_body, paystack_signature):
                 logger.warning(f"WEBHOOK: Invalid signature for {event_type} ref={reference}")
-                log_entry.status = 'ignored'
-                log_entry.processing_error = "Invalid HMAC signature"
-                log_entry.save()
-                return Response({"status": "invalid_signature"}, status=status.HTTP_200_OK)
-
-            logger.info(f"WEBHOOK: Verified {event_type} for reference {reference}")
-
-            # =================================================================
-            # STEP 4: Handle charge.success Event
-            # =================================================================
-            if event_type == 'charge.success':
-                if not reference:
-                    log_entry.status = 'ignored'
-                    log_entry.processing_error = "charge.success event missing reference"
-                    log_entry.save()
-                    return Response({"status": "missing_reference"}, status=status.HTTP_200_OK)
-
-                # Idempotency check — skip if this reference was already
-                # successfully processed by a previous webhook delivery.
-                if WebhookLog.objects.filter(
-                    reference=reference,
-                    status='processed'
-                ).exclude(id=log_entry.id).exists():
-                    log_entry.status = 'ignored'
-                    log_entry.processing_error = "Already processed (idempotent skip)"
-                    log_entry.save()
-                    logger.info(f"WEBHOOK: Skipping duplicate delivery for {reference}")
-                    return Response({"status": "already_processed"}, status=status.HTTP_200_OK)
-
-                try:
-                    order = Order.objects.get(paystack_reference=reference)
+                log_status, error, result = 'ignored', "Invalid HMAC signature", 'invalid_signature'
+            elif event_type != 'charge.success':
+                # We only process charge.success; log and acknowledge the rest.
+                log_status, error, result = 'ignored', f"Event type '{event_type}' not handled", 'event_ignored'
+            elif not reference:
+                log_status, error, result = 'ignored', "charge.success event missing reference", 'missing_reference'
+            else:
+                logger.info(f"WEBHOOK: Verified {event_type} for reference {reference}")
+        except Exception as e:
+            # e.g. PAYSTACK_SECRET_KEY is None
+            logger.error(f"WEBHOOK: Signature check failed: {e}", exc_info=True)
+            log_status, error, result = 'failed', f"Unhandled server error: {str(e)}", 'server_error'
 
-                    if order.status == 'PAID':
-                        log_entry.status = 'ignored'
-                        log_entry.processing_error = "Order already PAID"
-                        log_entry.save()
-                        return Response({"status": "already_paid"}, status=status.HTTP_200_OK)
-
-                    # Verify amount from webhook payload matches order
-                    webhook_amount_kobo = data.get('amount', 0)
-                    expected_amount_kobo = int(order.total_amount * 100)
-
-                    if webhook_amount_kobo != expected_amount_kobo:
-                        logger.critical(
-                            f"WEBHOOK AMOUNT MISMATCH: Order #{order.id} expected "
-                            f"{expected_amount_kobo}, webhook says {webhook_amount_kobo}. "
-                            f"Reference: {reference}"
-                        )
-                        log_entry.status = 'failed'
-                        log_entry.processing_error = (
-                            f"Amount mismatch: expected {expected_amount_kobo}, "
-                            f"got {webhook_amount_kobo}"
-                        )
-                        log_entry.save()
-                        return Response({"status": "amount_mismatch"}, status=status.HTTP_200_OK)
-
-                    # Process payment via shared verification logic
-                    verify_view = VerifyPaymentView()
-                    result = verify_view._complete_verification(order)
-
-                    if result.status_code == 200:
-                        log_entry.status = 'processed'
-                        log_entry.save()
-                        logger.info(f"WEBHOOK: Order #{order.id} marked as PAID")
-                        return Response({"status": "processed"}, status=status.HTTP_200_OK)
-                    else:
-                        log_entry.status = 'failed'
-                        log_entry.processing_error = f"Verification failed: {result.data}"
-                        log_entry.save()
-                        return Response({"status": "verification_failed"}, status=status.HTTP_200_OK)
+        # =====================================================================
+        # STEP 2: Log the Request (The "Inbox" Step) — one INSERT
+        # =====================================================================
+        try:
+            payload = request.data
+        except Exception:
+            payload = {}
 
-                except Order.DoesNotExist:
-                    logger.warning(f"WEBHOOK: No order found for reference {reference}")
-                    log_entry.status = 'ignored'
-                    log_entry.processing_error = "Order not found"
-                    log_entry.save()
-                    return Response({"status": "order_not_found"}, status=status.HTTP_200_OK)
-
-                except Exception as e:
-                    logger.error(f"WEBHOOK: Error processing charge.success - {e}")
-                    log_entry.status = 'failed'
-                    log_entry.processing_error = str(e)
-                    log_entry.save()
-                    return Response({"status": "error_logged"}, status=status.HTTP_200_OK)
-
-            # =================================================================
-            # STEP 5: Non-charge.success events (e.g., transfer.success, etc.)
-            # Log and acknowledge — we only process charge.success.
-            # =================================================================
-            log_entry.status = 'ignored'
-            log_entry.processing_error = f"Event type '{event_type}' not handled"
-            log_entry.save()
-            return Response({"status": "event_ignored"}, status=status.HTTP_200_OK)
+        log_entry = WebhookLog.objects.create(
+            provider='paystack',
+            event_type=event_type,
+            reference=reference,
+            status=log_status,
+            processing_error=error,
+            payload=payload,
+            headers={k: v for k, v in request.headers.items()
+                     if k.lower() not in ('authorization', 'cookie')},
+            ip_address=client_ip.split(',')[0].strip() if client_ip else None
+        )
+        if log_status != 'received':
+            return Response({"status": result}, status=status.HTTP_200_OK)
 
+        # =====================================================================
+        # STEP 3: Handle charge.success — queued for a worker (shop/webhooks.py),
+        # or inline when PAYSTACK_WEBHOOK_ASYNC is off.
+        # MASTER SAFETY NET: any unhandled error (database timeout, broker
+        # down, etc.) still returns HTTP 200, so Paystack never retries
+        # endlessly due to our server errors. The row stays 'received' and the
+        # periodic sweep picks it up.
+        # =====================================================================
+        try:
+            if settings.PAYSTACK_WEBHOOK_ASYNC:
+                webhooks.enqueue(log_entry)
+                return Response({"status": "queued"}, status=status.HTTP_200_OK)
+            return Response({"status": webhooks.process(log_entry)}, status=status.HTTP_200_OK)
         except Exception as e:
-            # =================================================================
-            # MASTER CATCH-ALL: Handles ANY unhandled exception so that
-            # Paystack ALWAYS gets HTTP 200 and never retries due to our bugs.
-            # Examples: PAYSTACK_SECRET_KEY is None, database timeout,
-            # unexpected data format, etc.
-            # =================================================================
             logger.error(
                 f"WEBHOOK: Unhandled exception in webhook handler: {e}",
                 exc_info=True
             )
-            try:
-                log_entry.status = 'failed'
-                log_entry.processing_error = f"Unhandled server error: {str(e)}"
-                log_entry.save()
-            except Exception:
-                pass  # If even the log save fails, still return 200
             return Response({"status": "server_error"}, status=status.HTTP_200_OK)
 
 
@@ -733,6 +657,7 @@ class HealthCheckView(APIView):
                 "status": "healthy",
                 "product_count": product_count,
                 "order_count": order_count,
+                "paystack": paystack.metrics(),
                 "timestamp": timezone.now().isoformat()
             }, status=status.HTTP_200_OK)
 
@@ -765,6 +690,28 @@ class ShopStatusView(APIView):
         })
 
 
+class ProductAvailabilityView(APIView):
+    """
+    Live available stock (stock minus active checkout holds) for the given
+    products: GET /api/shop/products/availability/?ids=1,2,3
+
+    Not cached — the catalog endpoints show total stock, this is what the
+    cart checks before checkout.
+    """
+    permission_classes = []
+
+    def get(self, request):
+        try:
+            ids = [int(i) for i in request.query_params.get('ids', '').split(',') if i.strip()]
+        except ValueError:
+            return Response({"error": "ids must be a comma-separated list of product IDs"}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids or len(ids) > 100:
+            return Response({"error": "Provide between 1 and 100 product IDs"}, status=status.HTTP_400_BAD_REQUEST)
+
+        available = available_stock(ids)
+        return Response({str(product_id): qty for product_id, qty in available.items()})
+
+
 class ValidateCouponView(APIView):
     """Validate a coupon code and return discount information."""
     def post(self, request):
@@ -0,0 +1,150 @@
+"""
+Paystack webhook processing.
+
+PaystackWebhookView only verifies the HMAC signature and stores one
+WebhookLog row. In async mode (settings.PAYSTACK_WEBHOOK_ASYNC) a charge.success
+row is stored as 'received' and handed to a Celery worker, so Paystack gets
+its 200 in a few milliseconds; otherwise it is processed inline as before.
+
+Workers handle the 'received' rows of a reference one at a time, oldest
+first, under a row lock, so duplicate deliveries of the same charge are
+applied in order and only once. Only the first pending row of a reference
+enqueues a task; later deliveries are picked up by the worker's loop. A
+Beat sweep catches rows whose task was lost.
+"""
+import hashlib
+import hmac
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from payment_logs.models import WebhookLog
+
+from .models import Order
+
+logger = logging.getLogger(__name__)
+
+# A 'received' row older than this has lost its task; the sweep requeues it.
+STALE_RECEIVED_AFTER = timedelta(minutes=2)
+
+
+def signature_is_valid(raw_body, signature):
+    if not signature:
+        return False
+    computed = hmac.new(settings.PAYSTACK_SECRET_KEY.encode('utf-8'), raw_body, hashlib.sha512).hexdigest()
+    return hmac.compare_digest(signature, computed)
+
+
+def enqueue(log_entry):
+    """
+    Queue processing for ``log_entry``'s reference after commit, unless an
+    older row of the same reference is still waiting (its task will reach
+    this one). Falls back to processing inline if the broker is unreachable.
+    """
+    if WebhookLog.objects.filter(
+        reference=log_entry.reference, status='received', id__lt=log_entry.id,
+    ).exists():
+        return
+
+    reference = log_entry.reference
+
+    def _enqueue():
+        from .tasks import process_paystack_webhooks
+        try:
+            process_paystack_webhooks.delay(reference)
+        except Exception as e:
+            logger.error(f"WEBHOOK: Could not enqueue {reference}, processing inline: {e}")
+            process_reference(reference)
+
+    transaction.on_commit(_enqueue)
+
+
+def process_reference(reference):
+    """Process every 'received' row for ``reference``, oldest first."""
+    processed = 0
+    while True:
+        with transaction.atomic():
+            log_entry = (
+                WebhookLog.objects.select_for_update()
+                .filter(reference=reference, status='received')
+                .order_by('id')
+                .first()
+            )
+            if log_entry is None:
+                return processed
+            process(log_entry)
+        processed += 1
+
+
+def process(log_entry):
+    """
+    Apply a verified charge.success ``log_entry`` to its order and record
+    the outcome on the row. Returns a short status for the HTTP response.
+    """
+    reference = log_entry.reference
+    data = (log_entry.payload or {}).get('data') or {}
+
+    def finish(log_status, result, error=None):
+        log_entry.status = log_status
+        log_entry.processing_error = error
+        log_entry.save(update_fields=['status', 'processing_error'])
+        return result
+
+    try:
+        # Idempotency check — skip if this reference was already
+        # successfully processed by a previous webhook delivery.
+        if WebhookLog.objects.filter(
+            reference=reference,
+            status='processed'
+        ).exclude(id=log_entry.id).exists():
+            logger.info(f"WEBHOOK: Skipping duplicate delivery for {reference}")
+            return finish('ignored', 'already_processed', "Already processed (idempotent skip)")
+
+        try:
+            order = Order.objects.get(paystack_reference=reference)
+        except Order.DoesNotExist:
+            logger.warning(f"WEBHOOK: No order found for reference {reference}")
+            return finish('ignored', 'order_not_found', "Order not found")
+
+        if order.status == 'PAID':
+            return finish('ignored', 'already_paid', "Order already PAID")
+
+        # Verify amount from webhook payload matches order
+        webhook_amount_kobo = data.get('amount', 0)
+        expected_amount_kobo = int(order.total_amount * 100)
+
+        if webhook_amount_kobo != expected_amount_kobo:
+            logger.critical(
+                f"WEBHOOK AMOUNT MISMATCH: Order #{order.id} expected "
+                f"{expected_amount_kobo}, webhook says {webhook_amount_kobo}. "
+                f"Reference: {reference}"
+            )
+            return finish(
+                'failed', 'amount_mismatch',
+                f"Amount mismatch: expected {expected_amount_kobo}, got {webhook_amount_kobo}",
+            )
+
+        # Process payment via shared verification logic
+        from .views import VerifyPaymentView
+        result = VerifyPaymentView()._complete_verification(order)
+
+        if result.status_code == 200:
+            logger.info(f"WEBHOOK: Order #{order.id} marked as PAID")
+            return finish('processed', 'processed')
+        return finish('failed', 'verification_failed', f"Verification failed: {result.data}")
+
+    except Exception as e:
+        logger.error(f"WEBHOOK: Error processing charge.success - {e}", exc_info=True)
+        return finish('failed', 'error_logged', str(e))
+
+
+def stale_references():
+    """References with 'received' rows nobody has picked up."""
+    return list(
+        WebhookLog.objects.filter(
+            status='received', created_at__lt=timezone.now() - STALE_RECEIVED_AFTER,
+        ).exclude(reference='').order_by().values_list('reference', flat=True).distinct()
+    )
@@ -9,6 +9,7 @@ class StaffMember(models.Model):
     name = models.CharField(max_length=200)
     position = models.CharField(max_length=200, help_text="e.g., Head of Department, ACES Patron")
     image = models.ImageField(upload_to='staff/', blank=True, null=True)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     display_order = models.PositiveIntegerField(default=0, help_text="Lower numbers appear first")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -1,13 +1,16 @@
 from rest_framework import serializers
+
+from core.renditions import RenditionsField
 from .models import StaffMember
 
 
 class StaffMemberSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_renditions = RenditionsField('image')
 
     class Meta:
         model = StaffMember
-        fields = ['id', 'name', 'position', 'image']
+        fields = ['id', 'name', 'position', 'image', 'image_renditions']
 
     def get_image(self, obj):
         if obj.image:
@@ -1,3 +1,46 @@
-from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import StaffMember
+
+
+class StaffConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.member = StaffMember.objects.create(name="Dr. Mensah", position="Head of Department")
+        self.url = reverse('staff-list')
+
+    def test_full_response_carries_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('max-age=', response['Cache-Control'])
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        etag = self.client.get(self.url)['ETag']
+        # Only the validator aggregate runs — no list query, no serialization.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_invalidate_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        StaffMember.objects.create(name="Prof. Owusu", position="ACES Patron")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_stale_if_modified_since_returns_full_body(self):
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 1)
@@ -1,9 +1,10 @@
 from rest_framework import generics
+from core.conditional import ConditionalGetMixin
 from .models import StaffMember
 from .serializers import StaffMemberSerializer
 
 
-class StaffMemberListView(generics.ListAPIView):
+class StaffMemberListView(ConditionalGetMixin, generics.ListAPIView):
     """
     Returns all active staff members, ordered by display_order.
     """
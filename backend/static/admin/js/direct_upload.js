@@ -0,0 +1,78 @@
+/**
+ * Direct Upload Admin JavaScript
+ * Sends course resource files straight to storage (see courses/uploads.py)
+ * and puts the completion token in the hidden "direct_upload" field.
+ */
+(function () {
+    'use strict';
+
+    function csrfToken() {
+        const input = document.querySelector('input[name="csrfmiddlewaretoken"]');
+        return input ? input.value : '';
+    }
+
+    function postJSON(url, body) {
+        return fetch(url, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken() },
+            body: JSON.stringify(body),
+        }).then(response => response.json().then(data => {
+            if (!response.ok) throw new Error(data.error || `HTTP ${response.status}`);
+            return data;
+        }));
+    }
+
+    // PUT with upload progress; resolves with the response ETag.
+    function put(url, blob, headers, onProgress) {
+        return new Promise((resolve, reject) => {
+            const xhr = new XMLHttpRequest();
+            xhr.open('PUT', url);
+            Object.entries(headers || {}).forEach(([name, value]) => xhr.setRequestHeader(name, value));
+            xhr.upload.onprogress = event => onProgress(event.loaded);
+            xhr.onload = () => (xhr.status < 300 ? resolve(xhr.getResponseHeader('ETag')) : reject(new Error(`Storage returned ${xhr.status}`)));
+            xhr.onerror = () => reject(new Error('Network error while uploading'));
+            xhr.send(blob);
+        });
+    }
+
+    async function upload(input) {
+        const box = input.closest('.direct-upload');
+        const hidden = box.querySelector('input[type="hidden"]');
+        const status = box.querySelector('.direct-upload-status');
+        const file = input.files[0];
+        hidden.value = '';
+        if (!file) return;
+
+        const show = sent => { status.textContent = `Uploading… ${Math.floor((sent / file.size) * 100)}%`; };
+        input.disabled = true;
+        try {
+            const plan = await postJSON(box.dataset.beginUrl, {
+                filename: file.name, size: file.size, content_type: file.type,
+            });
+            const parts = [];
+            if (plan.upload_id) {
+                for (const part of plan.parts) {
+                    const start = (part.number - 1) * plan.part_size;
+                    const etag = await put(part.url, file.slice(start, start + plan.part_size), {}, sent => show(start + sent));
+                    parts.push({ number: part.number, etag: etag });
+                }
+            } else {
+                await put(plan.url, file, plan.headers, show);
+            }
+            const done = await postJSON(box.dataset.completeUrl, { key: plan.key, upload_id: plan.upload_id || '', parts: parts });
+            hidden.value = done.token;
+            status.textContent = `✅ ${file.name} uploaded — save to attach it.`;
+        } catch (error) {
+            status.textContent = `❌ ${error.message}`;
+            input.value = '';
+        } finally {
+            input.disabled = false;
+        }
+    }
+
+    // Delegated so inline rows added with "Add another" work too.
+    document.addEventListener('change', function (event) {
+        if (event.target.matches('input[data-direct-upload]')) upload(event.target);
+    });
+})();
@@ -1,4 +1,7 @@
 from django.contrib import admin
+
+from search import documents
+
 from .models import Business, Product, ProductImage
 
 
@@ -70,11 +73,13 @@ class BusinessAdmin(admin.ModelAdmin):
 
     def approve_businesses(self, request, queryset):
         count = queryset.update(is_approved=True)
+        documents.reindex(Business, queryset)  # .update() sends no post_save
         self.message_user(request, f"{count} business(es) approved.")
     approve_businesses.short_description = "✅ Approve selected businesses"
 
     def unapprove_businesses(self, request, queryset):
         count = queryset.update(is_approved=False)
+        documents.reindex(Business, queryset)
         self.message_user(request, f"{count} business(es) unapproved.")
     unapprove_businesses.short_description = "❌ Unapprove selected businesses"
 
@@ -1,5 +1,9 @@
 from django.apps import AppConfig
 
+
 class StudentBusinessesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'student_businesses'
+
+    def ready(self):
+        from . import signals  # noqa: F401 — keeps product search columns current
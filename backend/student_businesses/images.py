@@ -0,0 +1,133 @@
+"""
+Background optimisation of vendor uploads.
+
+Saving a business, product or gallery image with a new upload stores the
+original as-is and marks the row ``image_status='pending'``. After commit a
+Celery task (``student_businesses.optimize_uploads``) resizes each new file
+with optimize_image(), stores the WebP, swaps the field over and deletes
+the original, then marks the row 'ready' ('failed' if a file could not be
+decoded; the original is kept). With IMAGE_PROCESSING_ASYNC off, or if the
+broker is unreachable, the same work runs inline after commit.
+
+The swap re-reads the row under a lock and only replaces a field that still
+holds the original, so a newer upload is never overwritten by an older
+task. It saves through the model, so signal-driven indexes see the new file.
+"""
+import logging
+import posixpath
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+PENDING, READY, FAILED = 'pending', 'ready', 'failed'
+
+STATUS_CHOICES = [
+    (PENDING, 'Processing'),
+    (READY, 'Ready'),
+    (FAILED, 'Failed'),
+]
+
+# optimize_image() arguments per model and image field
+SPECS = {
+    'student_businesses.business': {
+        'logo': {'max_width': 400, 'max_height': 400, 'quality': 85, 'crop': True},      # exact square
+        'banner': {'max_width': 1400, 'max_height': 600, 'quality': 80, 'crop': True},   # exact 7:3
+    },
+    'student_businesses.product': {
+        'image': {'max_width': 800, 'max_height': 800, 'quality': 85},
+    },
+    'student_businesses.productimage': {
+        'image': {'max_width': 800, 'max_height': 800, 'quality': 85},
+    },
+}
+
+
+def pending_fields(instance):
+    """Image fields of ``instance`` holding a new, not yet stored upload."""
+    return [
+        name for name in SPECS[instance._meta.label_lower]
+        if getattr(instance, name) and not getattr(getattr(instance, name), '_committed', True)
+    ]
+
+
+def schedule(instance, fields):
+    """Optimise ``fields`` of ``instance`` once the current transaction commits."""
+    label, pk = instance._meta.label_lower, instance.pk
+
+    def _enqueue():
+        if settings.IMAGE_PROCESSING_ASYNC:
+            from .tasks import optimize_uploads
+            try:
+                optimize_uploads.delay(label, pk, fields)
+                return
+            except Exception as e:
+                logger.error(f"IMAGES: Could not enqueue {label} {pk}, processing inline: {e}")
+        process(label, pk, fields)
+
+    transaction.on_commit(_enqueue)
+
+
+def process(label, pk, fields):
+    """Optimise ``fields`` of row ``pk`` and swap them in. Returns the final status."""
+    from .models import optimize_image
+
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+
+    replacements, status = {}, READY
+    for name in fields:
+        field_file = getattr(instance, name)
+        if not field_file:
+            continue
+        original = field_file.name
+        try:
+            optimized = optimize_image(field_file, **SPECS[label][name])
+        except Exception as e:
+            logger.error(f"IMAGES: Optimising {label} {pk} {name} failed: {e}", exc_info=True)
+            optimized = None
+        finally:
+            field_file.close()
+        if optimized is None:
+            status = FAILED
+            continue
+        # Store under the field's upload_to, not the original's full path.
+        field_file.save(posixpath.basename(optimized.name), optimized, save=False)
+        replacements[name] = (original, field_file.name)
+
+    _swap(model, pk, replacements, status)
+    logger.info(f"IMAGES: {label} {pk} {status} ({len(replacements)} optimised)")
+    return status
+
+
+def _swap(model, pk, replacements, status):
+    discard = []  # (field name, stored file) pairs no longer referenced
+    with transaction.atomic():
+        instance = model.objects.select_for_update().filter(pk=pk).first()
+        if instance is None:
+            discard = [(name, new) for name, (_, new) in replacements.items()]
+        else:
+            changed, superseded = [], False
+            for name, (original, new) in replacements.items():
+                if getattr(instance, name).name == original:
+                    setattr(instance, name, new)
+                    changed.append(name)
+                    discard.append((name, original))
+                else:  # replaced by a newer upload, whose own task sets the status
+                    discard.append((name, new))
+                    superseded = True
+            if not superseded:
+                instance.image_status = status
+                changed.append('image_status')
+            if changed:
+                instance.save(update_fields=changed)
+
+    for name, path in discard:
+        try:
+            model._meta.get_field(name).storage.delete(path)
+        except Exception as e:
+            logger.warning(f"IMAGES: Could not delete {path}: {e}")
@@ -0,0 +1,111 @@
+"""
+Compares the old icontains marketplace search with the full-text search
+(student_businesses/search.py) over a synthetic catalogue.
+
+Creates N products across a few hundred businesses inside a transaction
+that is rolled back afterwards, so it is safe to run against any database.
+Each query fetches the first page (24 hits) the way GlobalProductList does.
+
+Usage:
+    python manage.py benchmark_marketplace_search                  # 50k products
+    python manage.py benchmark_marketplace_search --products 10000 --iterations 50 --explain
+"""
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from student_businesses import search, shuffle
+from student_businesses.models import Business, BusinessCategory, Product
+
+ADJECTIVES = ['vintage', 'handmade', 'organic', 'wireless', 'premium', 'classic', 'spicy', 'custom', 'mini', 'retro']
+NOUNS = [
+    'hoodie', 'sneakers', 'jollof', 'headphones', 'bracelet', 'notebook', 'charger', 'kebab',
+    'perfume', 'tutoring', 'braids', 'laptop', 'smoothie', 'poster', 'tote', 'cupcakes',
+]
+QUERIES = ['hoodie', 'hood', 'wireless head', 'spicy jollof', 'tutor', 'hoddie', 'zzqx']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark marketplace search: icontains scans against the full-text index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=50000, help='Synthetic products (default: 50000)')
+        parser.add_argument('--iterations', type=int, default=20, help='Runs per query (default: 20)')
+        parser.add_argument('--explain', action='store_true', help='Print the query plan of each search')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Database: {connection.vendor}")
+        try:
+            with transaction.atomic():
+                self._catalogue(options['products'])
+                for query in QUERIES:
+                    self._run(query, options['iterations'], options['explain'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _catalogue(self, total):
+        started = time.perf_counter()
+        rng = random.Random(0)
+        tag = uuid.uuid4().hex[:8]
+        owner = get_user_model().objects.create_user(
+            email=f"benchmark-{tag}@example.com", username=f"benchmark-{tag}", password=uuid.uuid4().hex,
+        )
+        businesses = Business.objects.bulk_create(
+            Business(
+                owner=owner, name=f"{rng.choice(ADJECTIVES).title()} Store {i}", slug=f"benchmark-{tag}-{i}",
+                description="Benchmark", whatsapp_number='233500000000', is_approved=True,
+            )
+            for i in range(max(total // 200, 1))
+        )
+        categories = [value for value, _ in BusinessCategory.choices]
+        for start in range(0, total, 5000):
+            Product.objects.bulk_create(
+                Product(
+                    business=rng.choice(businesses),
+                    name=f"{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS).title()} {i}",
+                    description=' '.join(rng.choice(ADJECTIVES + NOUNS) for _ in range(12)),
+                    category=rng.choice(categories), price=Decimal('25.00'), image='benchmark.jpg',
+                )
+                for i in range(start, min(start + 5000, total))
+            )
+        products = Product.objects.filter(business__in=businesses)
+        search.index_products(products)
+        shuffle.reshuffle()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE student_businesses_product")
+        self.stdout.write(f"Created {total} products in {time.perf_counter() - started:.1f} s")
+
+    def _base(self):
+        return Product.objects.filter(business__is_approved=True, is_available=True)
+
+    def _run(self, query, iterations, explain):
+        legacy = self._base().filter(
+            Q(name__icontains=query) | Q(description__icontains=query) | Q(business__name__icontains=query)
+        )
+        ranked = search.search(self._base(), query)
+        timings = {}
+        for label, qs in (('icontains', legacy), ('search', ranked)):
+            hits = len(list(qs.values_list('id', flat=True)[:24]))
+            started = time.perf_counter()
+            for _ in range(iterations):
+                list(qs.values_list('id', flat=True)[:24])
+            timings[label] = ((time.perf_counter() - started) * 1000 / iterations, hits)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{query!r:>16}: icontains {timings['icontains'][0]:7.2f} ms ({timings['icontains'][1]} hits) | "
+            f"search {timings['search'][0]:7.2f} ms ({timings['search'][1]} hits)"
+        ))
+        if explain:
+            self.stdout.write(ranked.values_list('id', flat=True)[:24].explain())
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-18 16:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_businesses', '0004_business_snapchat_handle_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-created_at', '-id'], name='business_keyset_idx'),
+        ),
+    ]
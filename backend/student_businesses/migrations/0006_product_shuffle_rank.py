@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+def rank_existing(apps, schema_editor):
+    from student_businesses.shuffle import rank_for
+
+    Product = apps.get_model('student_businesses', 'Product')
+    products = list(Product.objects.only('id'))
+    for product in products:
+        product.shuffle_rank = rank_for(product.pk)
+    Product.objects.bulk_update(products, ['shuffle_rank'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_businesses', '0005_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='shuffle_rank',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['shuffle_rank', 'id'], name='product_shuffle_idx'),
+        ),
+        migrations.RunPython(rank_existing, migrations.RunPython.noop),
+    ]
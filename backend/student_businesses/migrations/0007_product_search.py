@@ -0,0 +1,56 @@
+# Generated by Django 5.2 on 2026-10-18 16:21
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX product_search_vector_idx ON student_businesses_product USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX product_search_text_trgm_idx ON student_businesses_product USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS product_search_vector_idx")
+    schema_editor.execute("DROP INDEX IF EXISTS product_search_text_trgm_idx")
+
+
+def index_existing(apps, schema_editor):
+    from student_businesses.search import index_products
+
+    index_products(apps.get_model('student_businesses', 'Product').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_businesses', '0006_product_shuffle_rank'),
+    ]
+
+    operations = [
+        TrigramExtension(),  # no-op outside PostgreSQL
+        migrations.AddField(
+            model_name='product',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'shuffle_rank', 'id'], name='product_category_shuffle_idx'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RunPython(index_existing, migrations.RunPython.noop),
+    ]
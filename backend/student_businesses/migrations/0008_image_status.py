@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_businesses', '0007_product_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='image_status',
+            field=models.CharField(choices=[('pending', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', editable=False, help_text='Background optimisation of the logo and banner (student_businesses/images.py)', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='image_status',
+            field=models.CharField(choices=[('pending', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='image_status',
+            field=models.CharField(choices=[('pending', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', editable=False, max_length=10),
+        ),
+    ]
@@ -1,9 +1,12 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from io import BytesIO
 from PIL import Image as PILImage, ImageOps
 from django.core.files.base import ContentFile
 
+from . import images
+
 
 class BusinessCategory(models.TextChoices):
     FOOD = 'Food & Beverages', 'Food & Beverages'
@@ -64,18 +67,28 @@ class Business(models.Model):
     slug = models.SlugField(unique=True, blank=True)
     description = models.TextField()
     banner = models.ImageField(upload_to='student_businesses/banners/', blank=True, null=True)
+    banner_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     payment_method = models.TextField(blank=True, help_text="e.g., MTN MoMo: 0541234567 (Kwame)")
     logo = models.ImageField(upload_to='student_businesses/logos/', blank=True, null=True)
+    logo_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     whatsapp_number = models.CharField(max_length=20, help_text="Include country code, e.g., 233541234567")
     whatsapp_group_link = models.URLField(max_length=255, blank=True, null=True, help_text="Optional WhatsApp Group invite link")
     instagram_handle = models.CharField(max_length=100, blank=True, null=True, help_text="e.g., aces_knust")
     snapchat_handle = models.CharField(max_length=100, blank=True, null=True, help_text="e.g., aces_knust")
     is_approved = models.BooleanField(default=False, help_text="Executives must approve before it appears publicly")
+    image_status = models.CharField(
+        max_length=10, choices=images.STATUS_CHOICES, default=images.READY, editable=False,
+        help_text="Background optimisation of the logo and banner (student_businesses/images.py)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name_plural = 'Businesses'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the public business list
+            models.Index(fields=['-created_at', '-id'], name='business_keyset_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         from django.utils.text import slugify
@@ -90,20 +103,17 @@ class Business(models.Model):
                 counter += 1
             self.slug = slug
 
-        # Optimize logo (max 400x400 for thumbnails, exact square)
-        if self.logo and not getattr(self.logo, '_committed', True):
-            optimized = optimize_image(self.logo, max_width=400, max_height=400, quality=85, crop=True)
-            if optimized:
-                self.logo = optimized
-
-        # Optimize banner (1400x600 for wide banners, exact 7:3 ratio)
-        if self.banner and not getattr(self.banner, '_committed', True):
-            optimized = optimize_image(self.banner, max_width=1400, max_height=600, quality=80, crop=True)
-            if optimized:
-                self.banner = optimized
+        # New logo/banner uploads are stored as-is and optimised in the
+        # background (logo 400x400 square, banner 1400x600).
+        uploads = images.pending_fields(self)
+        if uploads:
+            self.image_status = images.PENDING
 
         super().save(*args, **kwargs)
 
+        if uploads:
+            images.schedule(self, uploads)
+
     def __str__(self):
         return self.name
 
@@ -115,21 +125,45 @@ class Product(models.Model):
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image = models.ImageField(upload_to='student_businesses/products/')
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
     is_available = models.BooleanField(default=True)
+    image_status = models.CharField(
+        max_length=10, choices=images.STATUS_CHOICES, default=images.READY, editable=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Daily marketplace order (student_businesses/shuffle.py)
+    shuffle_rank = models.BigIntegerField(null=True, blank=True, editable=False)
+    # Search columns, kept current by signals (student_businesses/search.py)
+    search_text = models.TextField(blank=True, default='', editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['shuffle_rank', 'id'], name='product_shuffle_idx'),
+            models.Index(fields=['category', 'shuffle_rank', 'id'], name='product_category_shuffle_idx'),
+            # GIN indexes on search_vector and search_text are created by
+            # migration 0007 on PostgreSQL only.
+        ]
 
     def save(self, *args, **kwargs):
-        # Optimize product image (max 800x800 for product cards)
-        if self.image and not getattr(self.image, '_committed', True):
-            optimized = optimize_image(self.image, max_width=800, max_height=800, quality=85)
-            if optimized:
-                self.image = optimized
+        from .shuffle import rank_for
+
+        # New product images are optimised in the background (max 800x800)
+        uploads = images.pending_fields(self)
+        if uploads:
+            self.image_status = images.PENDING
 
         super().save(*args, **kwargs)
 
+        if uploads:
+            images.schedule(self, uploads)
+
+        # Rank new products into today's shuffle (needs the id).
+        if self.shuffle_rank is None:
+            self.shuffle_rank = rank_for(self.pk)
+            Product.objects.filter(pk=self.pk).update(shuffle_rank=self.shuffle_rank)
+
     def __str__(self):
         return f"{self.name} - {self.business.name}"
 
@@ -137,17 +171,22 @@ class Product(models.Model):
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='additional_images')
     image = models.ImageField(upload_to='student_businesses/products/gallery/')
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)  # core/renditions.py
+    image_status = models.CharField(
+        max_length=10, choices=images.STATUS_CHOICES, default=images.READY, editable=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['created_at']
 
     def save(self, *args, **kwargs):
-        if self.image and not getattr(self.image, '_committed', True):
-            optimized = optimize_image(self.image, max_width=800, max_height=800, quality=85)
-            if optimized:
-                self.image = optimized
+        uploads = images.pending_fields(self)
+        if uploads:
+            self.image_status = images.PENDING
         super().save(*args, **kwargs)
+        if uploads:
+            images.schedule(self, uploads)
 
     def __str__(self):
         return f"Gallery image for {self.product.name}"
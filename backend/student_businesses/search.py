@@ -0,0 +1,50 @@
+"""
+Full-text search for the student marketplace.
+
+Each product keeps two denormalised search columns, refreshed by signals
+(student_businesses/signals.py) whenever the product or its business is
+saved:
+
+- ``search_vector``: a weighted tsvector of product name (A), business name
+  (B) and description (C), behind a GIN index. PostgreSQL only.
+- ``search_text``: the same text lowercased in one column, behind a trigram
+  GIN index on PostgreSQL.
+
+Matching and ranking are shared with the site search (core/fulltext.py):
+every term matches as a prefix, or by trigram similarity for typos, on
+PostgreSQL; elsewhere every term must be a substring of search_text and
+products whose name starts with the first term rank first.
+"""
+from django.db import connection
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Concat, Lower
+
+from core.fulltext import CONFIG, is_postgres, rank, terms
+
+
+def index_products(queryset):
+    """Refresh the search columns of ``queryset`` in one UPDATE. Returns the row count."""
+    from django.contrib.postgres.search import SearchVector
+
+    Business = queryset.model._meta.get_field('business').related_model
+    business_name = Subquery(Business.objects.filter(pk=OuterRef('business_id')).order_by().values('name')[:1])
+    fields = {
+        'search_text': Lower(Concat(
+            'name', Value(' '), business_name, Value(' '), 'description', output_field=TextField(),
+        )),
+    }
+    if is_postgres(connection):
+        fields['search_vector'] = (
+            SearchVector('name', weight='A', config=CONFIG)
+            + SearchVector(business_name, weight='B', config=CONFIG)
+            + SearchVector('description', weight='C', config=CONFIG)
+        )
+    return queryset.update(**fields)
+
+
+def search(queryset, query):
+    """Filter ``queryset`` to products matching ``query``, best matches first."""
+    words = terms(query)
+    if not words:
+        return queryset
+    return rank(queryset, words, 'name', 'search_rank')
@@ -1,11 +1,15 @@
 from rest_framework import serializers
+
+from core.renditions import RenditionsField
 from .models import Business, Product, ProductImage
 
 
 class ProductImageSerializer(serializers.ModelSerializer):
+    image_renditions = RenditionsField('image')
+
     class Meta:
         model = ProductImage
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'image_renditions', 'image_status']
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -23,12 +27,13 @@ class ProductSerializer(serializers.ModelSerializer):
     owner_name = serializers.CharField(source='business.owner.username', read_only=True)
     whatsapp_number = serializers.CharField(source='business.whatsapp_number', read_only=True)
     additional_images = ProductImageSerializer(many=True, read_only=True)
+    image_renditions = RenditionsField('image')
 
     class Meta:
         model = Product
         fields = [
             'id', 'business', 'name', 'category', 'description',
-            'price', 'image', 'is_available', 'created_at',
+            'price', 'image', 'image_renditions', 'image_status', 'is_available', 'created_at',
             'business_name', 'business_slug', 'owner_name',
             'whatsapp_number', 'additional_images',
         ]
@@ -48,6 +53,8 @@ class ProductSerializer(serializers.ModelSerializer):
 class BusinessSerializer(serializers.ModelSerializer):
     products = ProductSerializer(many=True, read_only=True)
     owner_name = serializers.CharField(source='owner.username', read_only=True)
+    logo_renditions = RenditionsField('logo')
+    banner_renditions = RenditionsField('banner')
 
     class Meta:
         model = Business
@@ -70,3 +77,9 @@ class BusinessSerializer(serializers.ModelSerializer):
             data['banner'] = instance.banner.url
 
         return data
+
+
+class BusinessListSerializer(BusinessSerializer):
+    """Business card for the public list: a product count instead of every product."""
+    products = None
+    product_count = serializers.IntegerField(read_only=True)
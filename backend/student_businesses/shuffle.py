@@ -0,0 +1,55 @@
+"""
+Daily fair ordering of the marketplace.
+
+Every product carries a ``shuffle_rank``: the day number in the high 32 bits
+and a hash of (day, product id) in the low 32 bits. Ordering by
+``(shuffle_rank, id)`` is a shuffle that is the same all day and different
+the next, and it is served straight from product_shuffle_idx, so the
+marketplace pages with a cursor instead of loading every product.
+
+New products are ranked for the current day when first saved. The
+``student_businesses.reshuffle_marketplace`` task re-ranks the rest after
+midnight; rows still carrying an older day are found with an index range
+scan (``shuffle_rank < day << 32``), so the task is a single cheap query
+once the day's shuffle is done. Until it has run, yesterday's rows sort
+ahead of today's new ones — the order is still stable.
+"""
+import hashlib
+import logging
+
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DAY_SHIFT = 32
+
+
+def day_number(day=None):
+    return (day or timezone.localdate()).toordinal()
+
+
+def rank_for(pk, day=None):
+    """The shuffle rank of product ``pk`` on ``day`` (default: today)."""
+    number = day_number(day)
+    digest = hashlib.blake2b(f"{number}:{pk}".encode(), digest_size=4).digest()
+    return (number << DAY_SHIFT) | int.from_bytes(digest, 'big')
+
+
+def reshuffle(day=None, batch_size=1000):
+    """Re-rank every product not yet ranked for ``day``. Returns the count."""
+    from .models import Product
+
+    floor = day_number(day) << DAY_SHIFT
+    stale = Product.objects.filter(Q(shuffle_rank__lt=floor) | Q(shuffle_rank__isnull=True))
+    updated = 0
+    while True:
+        batch = list(stale.order_by('id').only('id')[:batch_size])
+        if not batch:
+            if updated:
+                logger.info(f"MARKETPLACE: Re-ranked {updated} product(s) for {day or timezone.localdate()}")
+            return updated
+        for product in batch:
+            product.shuffle_rank = rank_for(product.pk, day)
+        Product.objects.bulk_update(batch, ['shuffle_rank'])
+        updated += len(batch)
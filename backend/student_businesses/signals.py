@@ -0,0 +1,21 @@
+"""
+Keeps the marketplace search columns (student_businesses/search.py) current.
+
+Products are re-indexed when saved, and all of a business's products when
+the business is saved, since its name is part of their search text.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Business, Product
+from .search import index_products
+
+
+@receiver(post_save, sender=Product, dispatch_uid='marketplace-index-product')
+def index_product(sender, instance, **kwargs):
+    index_products(Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Business, dispatch_uid='marketplace-index-business')
+def index_business_products(sender, instance, **kwargs):
+    index_products(Product.objects.filter(business=instance))
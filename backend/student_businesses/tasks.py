@@ -0,0 +1,53 @@
+"""
+Student businesses Celery tasks.
+
+Scheduled tasks that run automatically via Celery Beat.
+"""
+
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    name='student_businesses.reshuffle_marketplace',
+    bind=True,
+    max_retries=0,       # Runs every hour; a missed run is picked up by the next
+    ignore_result=True,
+)
+def reshuffle_marketplace(self):
+    """
+    Re-rank marketplace products for today's shuffle
+    (student_businesses/shuffle.py).
+
+    Idempotent: once every product carries today's rank, a run is one
+    indexed query that updates nothing.
+    """
+    try:
+        from student_businesses.shuffle import reshuffle
+
+        return reshuffle()
+    except Exception as e:
+        logger.error('MARKETPLACE: Reshuffle failed: %s', e, exc_info=True)
+        return 0
+
+
+@shared_task(
+    name='student_businesses.optimize_uploads',
+    bind=True,
+    max_retries=0,
+    ignore_result=True,
+)
+def optimize_uploads(self, label, pk, fields):
+    """
+    Resize new vendor uploads to WebP and swap them in
+    (student_businesses/images.py). Queued after the upload commits.
+    """
+    try:
+        from student_businesses.images import process
+
+        return process(label, pk, fields)
+    except Exception as e:
+        logger.error('IMAGES: Processing %s %s failed: %s', label, pk, e, exc_info=True)
+        return None
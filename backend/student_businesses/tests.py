@@ -0,0 +1,160 @@
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from . import images, shuffle
+from .models import Business, BusinessCategory, Product
+
+
+class MarketplaceShuffleTests(APITestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        owner = get_user_model().objects.create_user(email='vendor@example.com', username='vendor', password='pass12345')
+        business = Business.objects.create(
+            owner=owner, name="Campus Eats", description="Food", whatsapp_number='233541234567', is_approved=True,
+        )
+        self.products = [
+            Product.objects.create(business=business, name=f"Item {i}", price=Decimal('5.00'), image='p.jpg')
+            for i in range(7)
+        ]
+        self.url = reverse('student_businesses:global_product_list')
+
+    def _walk(self, url):
+        seen = []
+        while url:
+            body = self.client.get(url).json()
+            seen += [p['id'] for p in body['results']]
+            url = body['next']
+        return seen
+
+    def test_pages_follow_todays_shuffle(self):
+        seen = self._walk(self.url + '?page_size=3')
+        expected = sorted((p.pk for p in self.products), key=shuffle.rank_for)
+        self.assertEqual(seen, expected)
+
+    def test_reshuffle_reranks_only_stale_products(self):
+        tomorrow = date.fromordinal(shuffle.day_number() + 1)
+        self.assertEqual(shuffle.reshuffle(tomorrow), 7)
+        self.assertEqual(shuffle.reshuffle(tomorrow), 0)
+
+        seen = self._walk(self.url + '?page_size=3')
+        self.assertEqual(seen, sorted(seen, key=lambda pk: shuffle.rank_for(pk, tomorrow)))
+        self.assertEqual(len(seen), 7)
+
+
+class MarketplaceSearchTests(APITestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+        owner = get_user_model().objects.create_user(email='vendor@example.com', username='vendor', password='pass12345')
+        self.business = Business.objects.create(
+            owner=owner, name="Kofi Threads", description="Clothes", whatsapp_number='233541234567', is_approved=True,
+        )
+        self.hoodie = self._product("Black Hoodie", "Warm fleece", BusinessCategory.FASHION)
+        self.tee = self._product("Campus Tee", "Cotton, pairs with a hoodie", BusinessCategory.FASHION)
+        self.tutoring = self._product("Calculus Tutoring", "One hour", BusinessCategory.SERVICES)
+        self.url = reverse('student_businesses:global_product_list')
+
+    def _product(self, name, description, category):
+        return Product.objects.create(
+            business=self.business, name=name, description=description, category=category,
+            price=Decimal('5.00'), image='p.jpg',
+        )
+
+    def _search(self, **params):
+        return [p['id'] for p in self.client.get(self.url, params).json()['results']]
+
+    def test_prefix_terms_rank_name_matches_first(self):
+        self.assertEqual(self._search(search='hood'), [self.hoodie.pk, self.tee.pk])
+        self.assertEqual(self._search(search='HOOD black'), [self.hoodie.pk])
+
+    def test_business_rename_reindexes_its_products(self):
+        self.assertEqual(self._search(search='threads'), [self.hoodie.pk, self.tee.pk, self.tutoring.pk])
+        self.business.name = "Ama Styles"
+        self.business.save()
+        self.assertEqual(self._search(search='threads'), [])
+        self.assertEqual(len(self._search(search='styles')), 3)
+
+    def test_category_filter_accepts_choice_labels(self):
+        self.assertEqual(self._search(category='Services'), [self.tutoring.pk])
+        self.assertEqual(self._search(category='Fashion'), [])
+
+
+def _png(width, height):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(buffer, format='PNG')
+    return SimpleUploadedFile('photo.png', buffer.getvalue(), content_type='image/png')
+
+
+class ImagePipelineTests(APITestCase):
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        self.media = override_settings(MEDIA_ROOT=media)
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+        owner = get_user_model().objects.create_user(email='vendor@example.com', username='vendor', password='pass12345')
+        self.business = Business.objects.create(
+            owner=owner, name="Campus Eats", description="Food", whatsapp_number='233541234567', is_approved=True,
+        )
+
+    @override_settings(IMAGE_PROCESSING_ASYNC=False)
+    def test_upload_is_stored_then_optimised_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            product = Product.objects.create(business=self.business, name="Pie", price=Decimal('5.00'), image=_png(2000, 1000))
+        self.assertEqual(product.image_status, images.PENDING)
+        original = product.image.name
+        self.assertTrue(original.endswith('.png'))
+
+        for callback in callbacks:
+            callback()
+        product.refresh_from_db()
+        self.assertEqual(product.image_status, images.READY)
+        self.assertTrue(product.image.name.endswith('.webp'))
+        self.assertFalse(product.image.storage.exists(original))
+        with Image.open(product.image) as optimised:
+            self.assertEqual(optimised.size, (800, 400))
+
+    @override_settings(IMAGE_PROCESSING_ASYNC=True)
+    def test_async_mode_queues_the_task(self):
+        with mock.patch('student_businesses.tasks.optimize_uploads.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.business.logo = _png(600, 600)
+                self.business.save()
+        delay.assert_called_once_with('student_businesses.business', self.business.pk, ['logo'])
+        self.business.refresh_from_db()
+        self.assertEqual(self.business.image_status, images.PENDING)
+
+    def test_newer_upload_is_not_overwritten(self):
+        from .models import optimize_image
+
+        with self.captureOnCommitCallbacks(execute=False):
+            product = Product.objects.create(business=self.business, name="Pie", price=Decimal('5.00'), image=_png(900, 900))
+        newer = 'student_businesses/products/newer.png'
+
+        def upload_meanwhile(field_file, **kwargs):
+            optimized = optimize_image(field_file, **kwargs)
+            Product.objects.filter(pk=product.pk).update(image=newer)
+            return optimized
+
+        with mock.patch('student_businesses.models.optimize_image', side_effect=upload_meanwhile):
+            images.process('student_businesses.product', product.pk, ['image'])
+        product.refresh_from_db()
+        self.assertEqual(product.image.name, newer)
+        self.assertEqual(product.image_status, images.PENDING)  # left to the newer upload's task
@@ -1,10 +1,16 @@
 from rest_framework import generics, permissions, filters, status
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from .models import Business, Product, ProductImage
-from .serializers import BusinessSerializer, ProductSerializer, ProductImageSerializer
+from django.db.models import Count, Q
+
+from core.pagination import KeysetPagination
+from . import search
+from .models import Business, BusinessCategory, Product, ProductImage
+from .serializers import BusinessListSerializer, BusinessSerializer, ProductSerializer, ProductImageSerializer
+
+CATEGORY_LOOKUP = {label: value for value, label in BusinessCategory.choices}
 
 
 # ---------------------------------------------------------------------------
@@ -30,15 +36,27 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
 # Business Views
 # ---------------------------------------------------------------------------
 
+class BusinessPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')  # business_keyset_idx
+
+
 class BusinessList(generics.ListCreateAPIView):
     """
-    GET  — List all approved businesses (public).
+    GET  — List approved businesses (public), newest first, in keyset pages.
+           Products are summarised as a count; fetch a business for its products.
     POST — Create a new business (authenticated, one per user).
     """
-    serializer_class = BusinessSerializer
+    pagination_class = BusinessPagination
+
+    def get_serializer_class(self):
+        if self.request.method == 'POST':
+            return BusinessSerializer
+        return BusinessListSerializer
 
     def get_queryset(self):
-        return Business.objects.filter(is_approved=True).select_related('owner')
+        return Business.objects.filter(is_approved=True).select_related('owner').annotate(
+            product_count=Count('products')
+        )
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -142,46 +160,44 @@ class ProductImageDelete(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class MarketplacePagination(KeysetPagination):
+    ordering = ('shuffle_rank', 'id')  # product_shuffle_idx
+
+
+class MarketplaceSearchPagination(LimitOffsetPagination):
+    """Search hits are ordered by relevance, which has no stable cursor."""
+    default_limit = 24
+    max_limit = 100
+
+
 class GlobalProductList(generics.ListAPIView):
     """
     Public endpoint: list all available products from approved businesses.
     Supports ?search= and ?category= query parameters.
-    Products are shuffled daily using a date-based seed for fairness.
+    Without a search, products are shuffled daily for fairness: they are
+    paged in shuffle_rank order, re-ranked each day (student_businesses/shuffle.py).
+    Searches are full-text, best matches first (student_businesses/search.py).
     """
     serializer_class = ProductSerializer
     permission_classes = [permissions.AllowAny]
 
+    @property
+    def pagination_class(self):
+        if search.terms(self.request.query_params.get('search')):
+            return MarketplaceSearchPagination
+        return MarketplacePagination
+
     def get_queryset(self):
         qs = Product.objects.filter(
             business__is_approved=True,
             is_available=True,
-        ).select_related('business', 'business__owner').prefetch_related('additional_images')
+        ).select_related('business', 'business__owner').prefetch_related(
+            'additional_images'
+        ).defer('search_text', 'search_vector')
 
         category = self.request.query_params.get('category')
         if category and category != 'All':
-            qs = qs.filter(category__icontains=category)
-
-        search = self.request.query_params.get('search', '').strip()
-        if search:
-            qs = qs.filter(
-                Q(name__icontains=search) |
-                Q(description__icontains=search) |
-                Q(business__name__icontains=search)
-            )
-
-        return qs
-
-    def list(self, request, *args, **kwargs):
-        """Shuffle products with a daily seed so the order is fair and consistent per day."""
-        import random
-        from datetime import date
-
-        queryset = self.filter_queryset(self.get_queryset())
-        products = list(queryset)
-
-        # Use today's date as seed — same order all day, new shuffle tomorrow
-        daily_seed = date.today().toordinal()
-        random.Random(daily_seed).shuffle(products)
+            # The frontend sends choice labels ("Services"); accept values too.
+            qs = qs.filter(category=CATEGORY_LOOKUP.get(category, category))
 
-        serializer = self.get_serializer(products, many=True)
-        return Response(serializer.data)
+        return search.search(qs, self.request.query_params.get('search'))
@@ -1,8 +1,9 @@
 import axiosInstance from "./axios";
+import { getAllPages } from "./pagination";
 
 export async function getEvents() {
     try {
-        const response = await axiosInstance.get('/events/');
+        const response = await getAllPages(axiosInstance, '/events/');
         return response;
     } catch (error) {
         console.error(error);
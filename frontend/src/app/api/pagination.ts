@@ -0,0 +1,40 @@
+import type { AxiosInstance } from "axios";
+
+// List endpoints return {next, previous, results}; follow `next` for more.
+export interface Page<T> {
+    next: string | null;
+    previous: string | null;
+    results: T[];
+}
+
+export function pageResults<T>(data: Page<T> | T[] | null | undefined): T[] {
+    if (Array.isArray(data)) return data;
+    return data?.results ?? [];
+}
+
+// Fetch every page of a list endpoint (admin tables and small lists only).
+export async function fetchAllPages<T>(url: string, init?: RequestInit): Promise<T[]> {
+    const results: T[] = [];
+    let next: string | null = url;
+    while (next) {
+        const res = await fetch(next, init);
+        if (!res.ok) throw new Error(`Failed to fetch: ${res.status}`);
+        const data = await res.json();
+        results.push(...pageResults<T>(data));
+        next = Array.isArray(data) ? null : data.next;
+    }
+    return results;
+}
+
+// Same as fetchAllPages, through an (authenticated) axios instance.
+export async function getAllPages<T>(client: AxiosInstance, path: string) {
+    const response = await client.get(path);
+    const results = pageResults<T>(response.data);
+    let next: string | null = Array.isArray(response.data) ? null : response.data?.next;
+    while (next) {
+        const page = await client.get(next);
+        results.push(...pageResults<T>(page.data));
+        next = page.data?.next ?? null;
+    }
+    return { ...response, data: results };
+}
@@ -1,8 +1,9 @@
 import axiosInstance from "./axios";
+import { getAllPages } from "./pagination";
 
 export async function getScholarships() {
     try {
-        const response = await axiosInstance.get('/scholarships/');
+        const response = await getAllPages(axiosInstance, '/scholarships/');
         return response;
     } catch (error) {
         console.error(error);
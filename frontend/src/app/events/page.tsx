@@ -4,6 +4,7 @@ import React, { useState, useEffect } from 'react';
 import Header from '@/components/header';
 import Footer from '@/components/footer';
 import EventCard, { Event } from '@/components/event/card';
+import { fetchAllPages } from '@/app/api/pagination';
 import { motion } from 'framer-motion';
 import { Calendar, Loader2 } from 'lucide-react';
 
@@ -17,13 +18,8 @@ export default function EventsPage() {
         async function fetchEvents() {
             try {
                 const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
-                const res = await fetch(`${apiUrl}/api/events/`);
-                if (!res.ok) throw new Error('Failed to fetch events');
-
-                const data = await res.json();
-                // Backend returns simple list. We need to sort and parse in frontend or use backend filtering.
-                // Assuming backend returns all events.
-                setEvents(data);
+                // Backend pages newest-first; upcoming/past is split in the frontend.
+                setEvents(await fetchAllPages<Event>(`${apiUrl}/api/events/`));
             } catch (err) {
                 console.error(err);
                 setError('Failed to load events. Please try again later.');
@@ -5,6 +5,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import Link from 'next/link';
 import Header from '@/components/header';
 import Footer from '@/components/footer';
+import { pageResults } from '@/app/api/pagination';
 import {
   Search, Store, ShoppingBag, ChevronRight, ChevronLeft,
   SlidersHorizontal, X, Tag, AlertCircle, ZoomIn, MessageCircle,
@@ -270,6 +271,8 @@ export default function MarketplacePage() {
   const [isLoading, setIsLoading] = useState(true);
   const [modalProduct, setModalProduct] = useState<Product | null>(null);
   const [fetchError, setFetchError] = useState(false);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [activeCategory, setActiveCategory] = useState('All');
   const [searchQuery, setSearchQuery] = useState('');
   const [debouncedSearch, setDebouncedSearch] = useState('');
@@ -295,7 +298,8 @@ export default function MarketplacePage() {
         const response = await fetch(`${apiUrl}/api/student-businesses/products/global/?${params}`);
         if (!response.ok) throw new Error('Failed to fetch');
         const data = await response.json();
-        setProducts(data);
+        setProducts(pageResults<Product>(data));
+        setNextUrl(data.next ?? null);
       } catch {
         setFetchError(true);
       } finally {
@@ -305,6 +309,22 @@ export default function MarketplacePage() {
     fetchProducts();
   }, [activeCategory, debouncedSearch]);
 
+  const loadMore = async () => {
+    if (!nextUrl) return;
+    setIsLoadingMore(true);
+    try {
+      const response = await fetch(nextUrl);
+      if (!response.ok) throw new Error('Failed to fetch');
+      const data = await response.json();
+      setProducts((prev) => [...prev, ...pageResults<Product>(data)]);
+      setNextUrl(data.next ?? null);
+    } catch {
+      setFetchError(true);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const productCount = products.length;
 
   return (
@@ -382,7 +402,7 @@ export default function MarketplacePage() {
           {/* Count + Sort row */}
           <div className="flex items-center justify-between mb-5">
             <p className="text-sm text-gray-500">
-              {isLoading ? 'Loading…' : `${productCount} product${productCount !== 1 ? 's' : ''} found`}
+              {isLoading ? 'Loading…' : `${productCount}${nextUrl ? '+' : ''} product${productCount !== 1 ? 's' : ''} found`}
             </p>
             {activeCategory !== 'All' && (
               <button onClick={() => setActiveCategory('All')}
@@ -412,6 +432,14 @@ export default function MarketplacePage() {
               <AnimatePresence mode="popLayout">
                 {products.map((prod) => <ProductCard key={prod.id} product={prod} onView={setModalProduct} />)}
               </AnimatePresence>
+              {nextUrl && (
+                <div className="col-span-full flex justify-center pt-4">
+                  <button onClick={loadMore} disabled={isLoadingMore}
+                    className="px-6 py-3 bg-white border border-blue-100 text-blue-600 rounded-xl font-bold hover:bg-blue-50 transition-colors disabled:opacity-60">
+                    {isLoadingMore ? 'Loading…' : 'Load more'}
+                  </button>
+                </div>
+              )}
             </div>
           ) : (
             <motion.div initial={{ opacity: 0 }} animate={{ opacity: 1 }}
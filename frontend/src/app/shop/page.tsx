@@ -1,5 +1,6 @@
 import React from 'react';
 import ProductGrid from '@/components/shop/ProductGrid';
+import { pageResults } from '@/app/api/pagination';
 
 // ISR: Revalidate product data every 60 seconds (was: force-dynamic + no-store)
 export const revalidate = 60;
@@ -22,7 +23,8 @@ async function getProducts() {
         throw new Error('Failed to fetch products');
     }
 
-    return res.json();
+    // First page of the catalog (48 products).
+    return pageResults(await res.json());
 }
 
 export default async function ShopPage() {
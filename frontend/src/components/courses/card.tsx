@@ -8,8 +8,11 @@ interface CourseResource {
   title: string;
   resource_type: 'slides' | 'past_exam' | 'tutorial' | 'lab_manual' | 'assignment' | 'textbook' | 'project' | 'other';
   download_url: string;
+  is_external: boolean;
   file_extension: string;
   file_size: number | null;
+  preview_url: string | null;
+  page_count: number | null;
   download_count: number;
   created_at: string;
 }
@@ -65,8 +68,48 @@ function formatSize(bytes: number | null) {
   return `${(bytes / 1024).toFixed(0)} KB`;
 }
 
+// ─── Download every file of a course as one ZIP ───
+// The backend builds the bundle in the background (202) — poll until it is ready.
+function DownloadAllButton({ courseId }: { courseId: number }) {
+  const [state, setState] = useState<'idle' | 'building' | 'error'>('idle');
+
+  const download = useCallback(async () => {
+    const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+    setState('building');
+    try {
+      let res = await fetch(`${apiUrl}/api/courses/bundles/`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ course: courseId }),
+      });
+      let bundle = await res.json();
+      for (let attempt = 0; res.ok && !bundle.download_url && bundle.status !== 'failed' && attempt < 60; attempt++) {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        res = await fetch(`${apiUrl}/api/courses/bundles/${bundle.id}/`);
+        bundle = await res.json();
+      }
+      if (!bundle.download_url) throw new Error('Bundle not ready');
+      window.location.href = bundle.download_url;
+      setState('idle');
+    } catch {
+      setState('error');
+    }
+  }, [courseId]);
+
+  return (
+    <button
+      onClick={download}
+      disabled={state === 'building'}
+      className="flex items-center justify-center gap-2 w-full py-2 mt-1 text-xs font-semibold rounded-xl border border-blue-100 text-blue-700 bg-blue-50 hover:bg-blue-100 disabled:opacity-60 transition-colors"
+    >
+      <FileArchive className="w-3.5 h-3.5" />
+      {state === 'building' ? 'Preparing ZIP…' : state === 'error' ? 'Could not prepare ZIP — retry' : 'Download all (.zip)'}
+    </button>
+  );
+}
+
 // ─── Single Course Card ───
-function CourseCard({ course, yearNum, trackDownload }: { course: Course; yearNum: number; trackDownload: (id: number) => void }) {
+function CourseCard({ course, yearNum }: { course: Course; yearNum: number }) {
   const theme = yearThemes[yearNum] || yearThemes[1];
   const [activeTab, setActiveTab] = useState<'all' | 'slides' | 'past_exam'>('all');
 
@@ -133,21 +176,25 @@ function CourseCard({ course, yearNum, trackDownload }: { course: Course; yearNu
               {/* Resource List */}
               <div className="max-h-[160px] overflow-y-auto pr-1 space-y-2 scrollbar-thin">
                 {filteredResources.length > 0 ? filteredResources.map(res => {
-                  const isExternal = res.download_url?.includes('drive.google') || res.download_url?.includes('firebase');
+                  // download_url counts the download and redirects to the file or link
+                  const isExternal = res.is_external;
                   return (
                     <a
                       key={res.id}
                       href={res.download_url}
                       target="_blank"
                       rel="noopener noreferrer"
-                      onClick={() => trackDownload(res.id)}
                       className="group/link flex items-center justify-between p-2.5 rounded-xl bg-gray-50 border border-gray-100 hover:border-blue-200 hover:bg-blue-50/50 hover:shadow-sm transition-all text-sm"
                     >
                       <div className="flex items-center gap-2.5 overflow-hidden flex-1">
-                        {getFileIcon(res.file_extension)}
+                        {res.preview_url ? (
+                          // eslint-disable-next-line @next/next/no-img-element
+                          <img src={res.preview_url} alt="" loading="lazy" className="w-7 h-9 object-cover object-top rounded border border-gray-200 bg-white flex-shrink-0" />
+                        ) : getFileIcon(res.file_extension)}
                         <span className="text-gray-700 font-medium truncate group-hover/link:text-blue-600 transition-colors text-xs" title={res.title}>{res.title}</span>
                       </div>
                       <div className="flex items-center gap-2 flex-shrink-0 ml-2">
+                        {res.page_count && <span className="text-[10px] text-gray-400 hidden sm:inline-block">{res.page_count} {res.file_extension === 'pptx' ? 'slides' : 'pages'}</span>}
                         {res.file_size && <span className="text-[10px] text-gray-400 hidden sm:inline-block">{formatSize(res.file_size)}</span>}
                         <div className="w-7 h-7 rounded-lg bg-blue-100 flex items-center justify-center group-hover/link:bg-blue-600 transition-colors">
                           {isExternal ? <ExternalLink className="w-3.5 h-3.5 text-blue-600 group-hover/link:text-white transition-colors" /> : <Download className="w-3.5 h-3.5 text-blue-600 group-hover/link:text-white transition-colors" />}
@@ -159,6 +206,7 @@ function CourseCard({ course, yearNum, trackDownload }: { course: Course; yearNu
                   <div className="text-xs text-gray-400 italic text-center py-3 bg-gray-50 rounded-xl">No {activeTab === 'slides' ? 'slides' : 'past questions'} available</div>
                 )}
               </div>
+              {course.resources.filter(r => !r.is_external).length > 1 && <DownloadAllButton courseId={course.id} />}
             </div>
           ) : course.resource_url ? (
             <a
@@ -216,11 +264,6 @@ export default function CoursesCard() {
 
   useEffect(() => { fetchData(); }, [fetchData]);
 
-  const trackDownload = useCallback((id: number) => {
-    const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
-    fetch(`${apiUrl}/api/courses/resources/${id}/track/`, { method: 'POST' }).catch(() => {});
-  }, []);
-
   // Derived data
   const totalCourses = useMemo(() => years.reduce((a, y) => a + y.semesters.reduce((b, s) => b + s.courses.length, 0), 0), [years]);
   const currentYear = years.find(y => y.year === selectedYear);
@@ -332,7 +375,7 @@ export default function CoursesCard() {
               {searchResults.length > 0 ? (
                 <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-4">
                   {searchResults.map(course => (
-                    <CourseCard key={course.id} course={course} yearNum={course._year || 1} trackDownload={trackDownload} />
+                    <CourseCard key={course.id} course={course} yearNum={course._year || 1} />
                   ))}
                 </div>
               ) : (
@@ -401,7 +444,7 @@ export default function CoursesCard() {
                   {currentCourses.length > 0 ? (
                     <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-4">
                       {currentCourses.map(course => (
-                        <CourseCard key={course.id} course={course} yearNum={selectedYear} trackDownload={trackDownload} />
+                        <CourseCard key={course.id} course={course} yearNum={selectedYear} />
                       ))}
                     </div>
                   ) : (
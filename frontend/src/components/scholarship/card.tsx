@@ -1,6 +1,7 @@
 'use client'
 import Link from 'next/link'
 import Image from 'next/image'
+import { fetchAllPages } from '@/app/api/pagination'
 import { motion, AnimatePresence } from 'framer-motion'
 import {
   Calendar,
@@ -156,10 +157,7 @@ export default function ScholarshipCards() {
       setLoading(true);
       setError(null);
       const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
-      const response = await fetch(`${apiUrl}/api/scholarships/`);
-      if (!response.ok) throw new Error(`Failed to fetch: ${response.status}`);
-      const data = await response.json();
-      setScholarships(Array.isArray(data) ? data : []);
+      setScholarships(await fetchAllPages<Scholarship>(`${apiUrl}/api/scholarships/`));
     } catch (err) {
       console.error('Error fetching scholarship data:', err);
       setError('Failed to load scholarships.');